@@ -0,0 +1,50 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import sys
+from importlib import import_module
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+    import django
+    django.setup()
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, round(fraction * len(ordered)) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def get_bench_user():
+    from task_manager.users.models import User
+    user, created = User.objects.get_or_create(
+        username='bench',
+        defaults={'first_name': 'Bench', 'last_name': 'Mark'},
+    )
+    if created:
+        user.set_password('bench')
+        user.save()
+    return user
+
+
+def session_cookie(user):
+    """Returns a Cookie header value for a logged-in session of user."""
+    from django.conf import settings
+    from django.contrib.auth import (
+        BACKEND_SESSION_KEY,
+        HASH_SESSION_KEY,
+        SESSION_KEY,
+    )
+
+    store = import_module(settings.SESSION_ENGINE).SessionStore()
+    store[SESSION_KEY] = str(user.pk)
+    store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    store.save()
+    return f'{settings.SESSION_COOKIE_NAME}={store.session_key}'
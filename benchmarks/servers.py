@@ -0,0 +1,138 @@
+"""Compares the gunicorn (WSGI) and uvicorn (ASGI) deployments.
+
+Each server is started on a local port, loaded with ``--concurrency``
+parallel clients for ``--requests`` requests of ``--path`` as a
+logged-in user, and stopped. uvicorn runs with ASYNC_VIEWS=True.
+
+    uv run --group bench python benchmarks/servers.py --path /tasks/
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from common import (
+    BASE_DIR,
+    get_bench_user,
+    percentile,
+    session_cookie,
+    setup_django,
+)
+
+SERVERS = {
+    'gunicorn-wsgi': (
+        ['gunicorn', 'task_manager.wsgi', '--workers', '{workers}',
+         '--threads', '{threads}', '--bind', '127.0.0.1:{port}'],
+        {},
+    ),
+    'uvicorn-asgi': (
+        ['uvicorn', 'task_manager.asgi:application', '--workers',
+         '{workers}', '--port', '{port}', '--no-access-log'],
+        {'ASYNC_VIEWS': 'True'},
+    ),
+}
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+
+async def fetch(port, request):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(request)
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return int(status_line.split()[1])
+
+
+async def run_load(port, path, cookie, concurrency, total):
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+        f'Cookie: {cookie}\r\nConnection: close\r\n\r\n'
+    ).encode()
+    latencies, errors = [], 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                status = await fetch(port, request)
+            except OSError:
+                status = 0
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': total,
+        'errors': errors,
+        'rps': round(total / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def bench_server(name, args, cookie):
+    command, extra_env = SERVERS[name]
+    command = [part.format(**vars(args)) for part in command]
+    env = {**os.environ, **extra_env}
+    server = subprocess.Popen(
+        command, cwd=BASE_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(args.port)
+        asyncio.run(run_load(args.port, args.path, cookie, 10, 50))
+        return asyncio.run(run_load(
+            args.port, args.path, cookie, args.concurrency, args.requests
+        ))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--path', default='/tasks/')
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--output', help='write results as JSON')
+    args = parser.parse_args()
+
+    setup_django()
+    cookie = session_cookie(get_bench_user())
+
+    results = {}
+    for name in SERVERS:
+        results[name] = bench_server(name, args, cookie)
+        row = results[name]
+        print(f"{name:<15} {row['rps']:>9} req/s  p50 {row['p50_ms']} ms  "
+              f"p99 {row['p99_ms']} ms  errors {row['errors']}")
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Compares session modes with and without the cached session user.
+
+For every SESSION_MODE (see settings.py) the page at ``--path`` is
+requested ``--iterations`` times as a logged-in user, once reading the
+user on every request (USER_CACHE_TIMEOUT=0) and once with the
+per-process user cache. The page cache stays warm, so the numbers show
+the authentication overhead of each request:
+
+    DATABASE_URL=sqlite:///perf.sqlite3 python benchmarks/sessions.py
+"""
+import argparse
+import sys
+
+from common import get_bench_user, percentile, session_cookie, setup_django
+
+USER_CACHE_TIMEOUTS = (0, 60)
+
+
+def run(driver_class, user, path, iterations):
+    from suite import measure
+
+    cookie = session_cookie(user)
+    driver = driver_class(user, cookie)
+    # Untimed, so the session and user caches start out filled
+    driver.request('GET', path)
+    latencies, query_counts = [], []
+    for _ in range(iterations):
+        elapsed, queries = measure(driver, 'GET', path, None, warm=True)
+        latencies.append(elapsed)
+        query_counts.append(queries)
+    return {
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'queries': max(query_counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--path', default='/tasks/')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test.utils import override_settings
+    from suite import DRIVERS
+
+    user = get_bench_user()
+    for mode, engine in settings.SESSION_ENGINES.items():
+        for timeout in USER_CACHE_TIMEOUTS:
+            with override_settings(SESSION_ENGINE=engine,
+                                   USER_CACHE_TIMEOUT=timeout):
+                for driver_class in DRIVERS:
+                    row = run(driver_class, user, args.path, args.iterations)
+                    cached = 'user cache' if timeout else 'no user cache'
+                    key = f'{driver_class.name} {mode} {cached}'
+                    print(f"{key:<40} p50 {row['p50_ms']:>8} ms  "
+                          f"queries {row['queries']:>3}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""Benchmarks the task views in-process and records a JSON baseline.
+
+Every scenario runs ``--iterations`` times through the Django test
+client and through a raw WSGI call of the project application. For each
+run the suite records latency percentiles, SQL queries per request and
+peak Python memory (tracemalloc) of a single request. Seed a database
+first, e.g.:
+
+    DATABASE_URL=sqlite:///perf.sqlite3 python manage.py migrate
+    DATABASE_URL=sqlite:///perf.sqlite3 python manage.py seed_perf
+    DATABASE_URL=sqlite:///perf.sqlite3 python benchmarks/suite.py \\
+        --output baseline.json
+    ... change code ...
+    DATABASE_URL=sqlite:///perf.sqlite3 python benchmarks/suite.py \\
+        --compare baseline.json
+
+The page cache is cleared before each request unless ``--warm`` is given,
+so the numbers reflect database and rendering work.
+"""
+import argparse
+import gc
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import combinations
+from urllib.parse import urlencode, urlsplit
+
+from common import (
+    BASE_DIR,
+    get_bench_user,
+    percentile,
+    session_cookie,
+    setup_django,
+)
+
+FILTER_FIELDS = ('status', 'executor', 'labels', 'user_own_tasks', 'search')
+# Any 32 alphanumeric characters form a valid unmasked CSRF secret
+CSRF_TOKEN = 'benchmarkbenchmarkbenchmarkbench'
+METRICS = ('p50_ms', 'p90_ms', 'p99_ms', 'queries', 'peak_kb')
+
+
+class TestClientDriver:
+    name = 'client'
+
+    def __init__(self, user, cookie):
+        from django.test import Client
+        self.client = Client(SERVER_NAME='localhost')
+        self.client.force_login(user)
+
+    def request(self, method, path, data=None):
+        if method == 'GET':
+            response = self.client.get(path)
+        else:
+            response = self.client.post(path, data or {})
+        return response.status_code
+
+
+class WSGIDriver:
+    """Calls the WSGI application the way gunicorn would."""
+    name = 'wsgi'
+
+    def __init__(self, user, cookie):
+        from django.core.wsgi import get_wsgi_application
+        self.application = get_wsgi_application()
+        self.cookie = f'{cookie}; csrftoken={CSRF_TOKEN}'
+
+    def request(self, method, path, data=None):
+        url = urlsplit(path)
+        body = b''
+        if method == 'POST':
+            body = urlencode(
+                {**(data or {}), 'csrfmiddlewaretoken': CSRF_TOKEN},
+                doseq=True,
+            ).encode()
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': url.path,
+            'QUERY_STRING': url.query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'HTTP_COOKIE': self.cookie,
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+            'wsgi.version': (1, 0),
+            'wsgi.multithread': False,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        status = []
+
+        def start_response(value, headers, exc_info=None):
+            status.append(int(value.split()[0]))
+
+        result = self.application(environ, start_response)
+        try:
+            for _ in result:
+                pass
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return status[0]
+
+
+DRIVERS = (TestClientDriver, WSGIDriver)
+
+
+def sample_filters(user):
+    from task_manager.labels.models import Label
+    from task_manager.statuses.models import Status
+    from task_manager.tasks.models import Task
+
+    task = Task.objects.order_by('id').first()
+    values = {
+        'status': Status.objects.values_list('id', flat=True).first(),
+        'executor': user.id,
+        'labels': Label.objects.values_list('id', flat=True).first(),
+        'user_own_tasks': 'on',
+        'search': task.name.split()[0] if task else 'task',
+    }
+    for size in range(len(FILTER_FIELDS) + 1):
+        for fields in combinations(FILTER_FIELDS, size):
+            yield fields, {field: values[field] for field in fields}
+
+
+def read_scenarios(user):
+    """(name, method, path factory, data factory) for every GET scenario."""
+    from django.urls import reverse
+
+    from task_manager.tasks.models import Task
+
+    index = reverse('tasks:index')
+    for fields, data in sample_filters(user):
+        name = 'list ' + ('+'.join(fields) or '(no filter)')
+        path = f'{index}?{urlencode(data)}' if data else index
+        yield name, 'GET', lambda i, path=path: path, None
+    task = Task.objects.order_by('id').first()
+    if task is not None:
+        detail = reverse('tasks:detail', args=[task.pk])
+        yield 'detail', 'GET', lambda i: detail, None
+
+
+def write_scenarios(user, prefix):
+    """Create tasks, update them and delete them again, in this order."""
+    from django.urls import reverse
+
+    from task_manager.statuses.models import Status
+    from task_manager.tasks.models import Task
+
+    status = Status.objects.values_list('id', flat=True).first()
+    ids = {}
+
+    def task_data(i):
+        return {
+            'name': f'{prefix} {i}',
+            'description': 'Benchmark task',
+            'status': status,
+            'executor': user.id,
+        }
+
+    def task_id(i):
+        if i not in ids:
+            ids[i] = Task.objects.get(name=f'{prefix} {i}').pk
+        return ids[i]
+
+    yield ('create', 'POST', lambda i: reverse('tasks:create'), task_data)
+    yield ('update', 'POST',
+           lambda i: reverse('tasks:update', args=[task_id(i)]),
+           lambda i: {**task_data(i), 'description': 'Updated'})
+    yield ('delete', 'POST',
+           lambda i: reverse('tasks:delete', args=[task_id(i)]),
+           lambda i: {})
+
+
+def measure(driver, method, path, data, warm):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    if not warm:
+        cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        status = driver.request(method, path, data)
+        elapsed = time.perf_counter() - started
+    if status >= 400:
+        raise RuntimeError(f'{method} {path} returned {status}')
+    return elapsed, len(queries)
+
+
+def measure_memory(driver, method, path, data, warm):
+    from django.core.cache import cache
+
+    if not warm:
+        cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        driver.request(method, path, data)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_scenario(driver, scenario, iterations, warm):
+    name, method, make_path, make_data = scenario
+    latencies, query_counts = [], []
+    if method == 'GET':
+        # Untimed, so lazy imports and URL resolver setup are not counted
+        driver.request(method, make_path(0))
+    for i in range(iterations):
+        data = make_data(i) if make_data else None
+        elapsed, queries = measure(driver, method, make_path(i), data, warm)
+        latencies.append(elapsed)
+        query_counts.append(queries)
+    if method == 'GET':
+        peak = measure_memory(driver, method, make_path(0), None, warm)
+    else:
+        peak = None
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p90_ms': round(percentile(latencies, 0.90) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'queries': max(query_counts),
+        'peak_kb': peak and round(peak / 1024, 1),
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BASE_DIR, text=True, stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_meta():
+    from django.db import connection
+
+    from task_manager.tasks.models import Task
+
+    return {
+        'commit': get_commit(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'database': connection.vendor,
+        'tasks': Task.objects.count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Prints metrics that grew by more than threshold; returns count."""
+    regressions = 0
+    for key, row in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric in METRICS:
+            before, after = old.get(metric), row.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions += 1
+                print(f'REGRESSION {key} {metric}: {before} -> {after} '
+                      f'({change:+.0%})')
+    print(f'{regressions} regression(s) above {threshold:.0%}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--only', help='run scenarios containing this text')
+    parser.add_argument('--warm', action='store_true',
+                        help='keep the page cache between requests')
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--compare', help='baseline JSON to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative growth reported as a regression')
+    args = parser.parse_args()
+
+    setup_django()
+    user = get_bench_user()
+    cookie = session_cookie(user)
+
+    results = {}
+    for driver_class in DRIVERS:
+        driver = driver_class(user, cookie)
+        scenarios = [
+            *read_scenarios(user),
+            *write_scenarios(user, f'Bench {driver.name} {time.time_ns()}'),
+        ]
+        for scenario in scenarios:
+            if args.only and args.only not in scenario[0]:
+                continue
+            key = f'{driver.name} {scenario[0]}'
+            row = results[key] = run_scenario(
+                driver, scenario, args.iterations, args.warm
+            )
+            print(f"{key:<55} p50 {row['p50_ms']:>8} ms  "
+                  f"p99 {row['p99_ms']:>8} ms  queries {row['queries']:>3}  "
+                  f"peak {row['peak_kb'] or '-'} KiB")
+
+    report = {'meta': get_meta(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline:
+            old = json.load(baseline)
+        print(f"Compared with {old['meta'].get('commit')} "
+              f"({old['meta'].get('tasks')} tasks)")
+        if compare(results, old['results'], args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Measures the per-row cost of rendering tasks/index.html.
+
+The page context comes from TaskListView for the bench user, then the
+task list is replaced by ``--rows`` unsaved tasks so only template work
+is timed: no queries run for the rows. The page is rendered with no
+rows and with all of them, and the difference divided by the row count
+is the cost of one row. The share of it spent reversing the three URLs
+of a row is timed separately, which tells whether a leaner row path
+(an inclusion tag or rows rendered in Python) would pay off:
+
+    DATABASE_URL=sqlite:///perf.sqlite3 python benchmarks/templates.py
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+
+from common import get_bench_user, percentile, setup_django
+
+
+def make_tasks(count):
+    from task_manager.statuses.models import Status
+    from task_manager.tasks.models import Task
+    from task_manager.users.models import User
+
+    status = Status(pk=1, name='In progress')
+    author = User(pk=1, first_name='Bench', last_name='Author')
+    executor = User(pk=2, first_name='Bench', last_name='Executor')
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        Task(pk=i, name=f'Task {i}', status=status, author=author,
+             executor=executor, created_at=created_at)
+        for i in range(1, count + 1)
+    ]
+
+
+def get_page(user):
+    """(template, context, request) of the task list page."""
+    from django.test import RequestFactory
+
+    from task_manager.tasks.views import TaskListView
+
+    request = RequestFactory().get('/tasks/')
+    request.user = user
+    request.session = {}
+    response = TaskListView.as_view()(request)
+    template = response.resolve_template(response.template_name)
+    return template, response.context_data, request
+
+
+def time_render(template, context, request, tasks, iterations):
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        template.render({**context, 'tasks': tasks}, request)
+        latencies.append(time.perf_counter() - started)
+    return percentile(latencies, 0.50)
+
+
+def time_urls(tasks):
+    from django.urls import reverse
+
+    started = time.perf_counter()
+    for task in tasks:
+        for name in ('tasks:detail', 'tasks:update', 'tasks:delete'):
+            reverse(name, args=[task.id])
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.utils import translation
+
+    translation.activate('en')
+    template, context, request = get_page(get_bench_user())
+    tasks = make_tasks(args.rows)
+    # Untimed, so template loading and the cached fragments are warm
+    template.render({**context, 'tasks': tasks[:1]}, request)
+
+    empty = time_render(template, context, request, [], args.iterations)
+    full = time_render(template, context, request, tasks, args.iterations)
+    per_row = (full - empty) / args.rows
+    urls = time_urls(tasks) / args.rows
+    rows = f'page with {args.rows} rows'
+    print(f"{'page without rows':<26} p50 {empty * 1000:>8.2f} ms")
+    print(f'{rows:<26} p50 {full * 1000:>8.2f} ms')
+    print(f"{'per row':<30} {per_row * 1e6:>8.1f} us")
+    print(f"{'  of which URL reversing':<30} {urls * 1e6:>8.1f} us "
+          f'({urls / per_row:.0%})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
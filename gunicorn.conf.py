@@ -0,0 +1,20 @@
+"""Loaded by gunicorn from the working directory."""
+import os
+import tempfile
+
+from task_manager.snapshots import clear_snapshots
+
+
+def on_starting(server):
+    # Worker snapshots of a previous run would otherwise be summed into
+    # the new run's metrics and profiles
+    tmp = tempfile.gettempdir()
+    clear_snapshots(
+        os.getenv('METRICS_DIR', os.path.join(tmp, 'task_manager_metrics')),
+        'metrics',
+    )
+    clear_snapshots(
+        os.getenv('PROFILING_DIR',
+                  os.path.join(tmp, 'task_manager_profiling')),
+        'profile',
+    )
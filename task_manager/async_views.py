@@ -0,0 +1,105 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404
+from django.utils.translation import gettext as _
+from django.views.generic import View
+from django.views.generic.base import ContextMixin, TemplateResponseMixin
+
+from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.pagination import (
+    KeysetPaginationMixin,
+    KeysetPaginator,
+    estimate_count,
+)
+
+
+class AsyncLoginRequiredMixin(CustomLoginRequiredMixin):
+    """Checks authentication with ``request.auser()``.
+
+    The resolved user replaces the lazy ``request.user``, so templates
+    rendered afterwards do not query the database from the event loop.
+    """
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        # Skip the sync check in LoginRequiredMixin.dispatch
+        return await super(LoginRequiredMixin, self).dispatch(
+            request, *args, **kwargs
+        )
+
+
+class AsyncListView(KeysetPaginationMixin, TemplateResponseMixin,
+                    ContextMixin, View):
+    """Keyset-paginated list fetched with the async ORM.
+
+    Templates are still rendered by Django in a worker thread.
+    """
+    model = None
+    queryset = None
+    ordering = None
+    context_object_name = None
+
+    def get_queryset(self):
+        if self.queryset is not None:
+            return self.queryset.all()
+        return self.model._default_manager.all()
+
+    def get_ordering(self):
+        return self.ordering
+
+    async def filter_queryset(self, queryset):
+        return queryset
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset, page_size, self.get_paginate_keys()
+        )
+        page = await paginator.apage(self.request.GET.get(self.page_kwarg))
+        if self.get_approximate_count():
+            page.count, page.count_is_exact = await sync_to_async(
+                estimate_count
+            )(queryset)
+        return page
+
+    async def get(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        queryset = await self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset, self.paginate_by)
+        context = self.get_context_data(
+            object_list=page.object_list,
+            page_obj=page,
+            is_paginated=page.has_other_pages(),
+            **{self.context_object_name: page.object_list},
+        )
+        return self.render_to_response(context)
+
+
+class AsyncDetailView(TemplateResponseMixin, ContextMixin, View):
+    """Single object fetched with ``aget``."""
+    model = None
+    queryset = None
+    context_object_name = None
+
+    def get_queryset(self):
+        if self.queryset is not None:
+            return self.queryset.all()
+        return self.model._default_manager.all()
+
+    async def aget_object(self):
+        queryset = self.get_queryset()
+        try:
+            return await queryset.aget(pk=self.kwargs['pk'])
+        except ObjectDoesNotExist:
+            raise Http404(
+                _('No %(verbose_name)s found matching the query')
+                % {'verbose_name': queryset.model._meta.verbose_name}
+            )
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = self.get_context_data(
+            object=self.object, **{self.context_object_name: self.object}
+        )
+        return self.render_to_response(context)
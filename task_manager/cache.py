@@ -0,0 +1,57 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+
+
+def version_key(name):
+    return f'version:{name}'
+
+
+def get_versions(*names):
+    """Returns the current version counter of each name.
+
+    A missing counter starts from the current time, so an evicted
+    counter never falls back to a value used by older cache entries.
+    """
+    keys = [version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(name):
+    try:
+        cache.incr(version_key(name))
+    except ValueError:
+        cache.set(version_key(name), time.time_ns(), None)
+
+
+def make_key(prefix, *parts):
+    digest = hashlib.md5(
+        '|'.join(str(part) for part in parts).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f'{prefix}:{digest}'
+
+
+def stats_key(name, outcome):
+    return f'stats:{name}:{outcome}'
+
+
+def record_lookup(name, hit):
+    key = stats_key(name, 'hits' if hit else 'misses')
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_stats(name):
+    hits = cache.get(stats_key(name, 'hits'), 0)
+    misses = cache.get(stats_key(name, 'misses'), 0)
+    return {'hits': hits, 'misses': misses}
@@ -0,0 +1,69 @@
+from django import forms
+from django.conf import settings
+
+from task_manager.cache import get_versions, record_lookup
+from task_manager.replicas import use_primary
+
+CACHE_NAME = 'choices'
+
+# Process-local: {(queryset SQL, value field): (version, choices)}
+_choices = {}
+
+
+def get_choices(field):
+    """Returns (value, label) tuples for every row of the field queryset.
+
+    Entries are rebuilt when the model version counter, bumped by its
+    save/delete signals, no longer matches. They are read from the
+    primary, so a lagging replica cannot fill them with old rows.
+    """
+    meta = field.queryset.model._meta
+    name = meta.label_lower
+    key = (str(field.queryset.query), field.to_field_name or meta.pk.name)
+    (version,) = get_versions(name)
+    cached = _choices.get(key)
+    record_lookup(CACHE_NAME, cached is not None and cached[0] == version)
+    if cached is None or cached[0] != version:
+        with use_primary():
+            choices = tuple(
+                (field.prepare_value(obj), field.label_from_instance(obj))
+                for obj in field.queryset.iterator()
+            )
+        cached = _choices[key] = (version, choices)
+    return cached[1]
+
+
+class CachedModelChoiceIterator(forms.models.ModelChoiceIterator):
+    """Yields cached (pk, label) tuples instead of model instances.
+
+    Without a shared cache the other workers never see the version
+    bumps, so the rows are queried as by ModelChoiceIterator.
+    """
+    def __iter__(self):
+        if not settings.CACHE_SHARED:
+            yield from super().__iter__()
+            return
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from get_choices(self.field)
+
+    def __len__(self):
+        if not settings.CACHE_SHARED:
+            return super().__len__()
+        empty = 1 if self.field.empty_label is not None else 0
+        return len(get_choices(self.field)) + empty
+
+    def __bool__(self):
+        if not settings.CACHE_SHARED:
+            return super().__bool__()
+        return self.field.empty_label is not None or bool(
+            get_choices(self.field)
+        )
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    iterator = CachedModelChoiceIterator
+
+
+class CachedModelMultipleChoiceField(forms.ModelMultipleChoiceField):
+    iterator = CachedModelChoiceIterator
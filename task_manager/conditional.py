@@ -0,0 +1,93 @@
+"""Conditional GET for pages built from version-counted tables.
+
+Every write to a task, status, label or user bumps the version counter
+of its table (see tasks/signals.py). ConditionalGetMixin hashes the
+counters of the tables a page renders together with the URL, the
+language and the user into a weak ETag. A refresh of an unchanged page
+is answered with 304 Not Modified before the queryset is evaluated or
+the template is rendered. No Last-Modified is sent: whole seconds miss
+writes within the same second, and the date ignores the user and the
+language. The counters live in the default cache, so validators are
+only sent when it is shared by all workers (``CACHE_SHARED``).
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.translation import get_language
+
+from task_manager.cache import get_versions, make_key
+from task_manager.replicas import reading_replica
+
+ETAG_PREFIX = 'page'
+
+
+def get_page_etag(request, models):
+    return 'W/"{}"'.format(make_key(
+        ETAG_PREFIX,
+        request.get_full_path(),
+        get_language(),
+        request.user.pk,
+        *get_versions(*models),
+    ))
+
+
+class ConditionalGetMixin:
+    """Adds validators to GET responses and answers 304 when they match.
+
+    ``etag_models`` lists the tables whose rows the page renders. Pages
+    with pending messages are always rendered, so the messages are not
+    lost behind a 304. Pages read from a replica get no validators: the
+    replica may lag behind the counters, and a 304 would then keep the
+    stale page until the next change. Neither do pages of a worker with
+    its own cache, whose counters miss the writes of other workers.
+    """
+    etag_models = ()
+
+    def get_validators(self, request):
+        """Returns the ETag of the page, or None."""
+        if not settings.CACHE_SHARED or reading_replica.get():
+            return None
+        if len(get_messages(request)):
+            return None
+        return get_page_etag(request, self.etag_models)
+
+    def not_modified(self, request, etag):
+        if etag is None:
+            return None
+        return get_conditional_response(request, etag=etag)
+
+    def add_validators(self, response, etag):
+        if etag is not None and response.status_code in (200, 304):
+            response.headers['ETag'] = etag
+            # Revalidate on every visit; a new login or language changes
+            # the cookies, so the browser does not revalidate the old page
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Cookie', 'Accept-Language'))
+        return response
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_validators(request)
+        response = self.not_modified(request, etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.add_validators(response, etag)
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """ConditionalGetMixin for views with an async ``get``."""
+    async def get(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        # Pending messages may have to be read from the session
+        etag = await sync_to_async(self.get_validators)(request)
+        response = self.not_modified(request, etag)
+        if response is None:
+            # Skip the sync get of ConditionalGetMixin
+            response = await super(ConditionalGetMixin, self).get(
+                request, *args, **kwargs
+            )
+        return self.add_validators(response, etag)
@@ -0,0 +1,29 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+def counter_field(verbose_name=None):
+    return models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=verbose_name or _('Tasks')
+    )
+
+
+class CounterFieldsMixin:
+    """Keeps saves of loaded rows from writing ``counter_fields`` back.
+
+    Counters change through ``UPDATE ... SET n = n + delta`` (see
+    task_manager/tasks/counters.py), so the value an instance was loaded
+    with may be stale by the time a form saves it.
+    """
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Deferred fields are left out, as Model.save() does
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname in self.__dict__
+                and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
@@ -0,0 +1,82 @@
+"""Connection settings for DATABASE_URL, read from the environment.
+
+DB_POOL is ``persistent`` (a connection per thread), ``native`` (a
+psycopg 3 pool per worker) or ``pgbouncer`` (transaction pooling).
+"""
+import os
+from importlib.util import find_spec
+
+import dj_database_url
+
+POOL_MODES = ('persistent', 'native', 'pgbouncer')
+POSTGRESQL_ENGINE = 'django.db.backends.postgresql'
+
+
+def get_env(name, default, cast=str):
+    value = os.getenv(name)
+    return default if value in (None, '') else cast(value)
+
+
+def get_bool(name, default):
+    return get_env(name, default, lambda value: value == 'True')
+
+
+def native_pool_available():
+    return find_spec('psycopg') is not None and (
+        find_spec('psycopg_pool') is not None
+    )
+
+
+def get_pool_options():
+    return {
+        'min_size': get_env('DB_POOL_MIN_SIZE', 2, int),
+        'max_size': get_env('DB_POOL_MAX_SIZE', 10, int),
+        'max_idle': get_env('DB_POOL_MAX_IDLE', 300, float),
+        'timeout': get_env('DB_POOL_TIMEOUT', 10, float),
+    }
+
+
+def get_mode():
+    mode = get_env('DB_POOL', 'persistent')
+    if mode not in POOL_MODES:
+        raise ValueError(f'DB_POOL must be one of {", ".join(POOL_MODES)}')
+    return mode
+
+
+def parse(url, mode, **kwargs):
+    database = dj_database_url.parse(
+        url,
+        conn_max_age=get_env('DB_CONN_MAX_AGE', 600, int),
+        conn_health_checks=get_bool('DB_CONN_HEALTH_CHECKS', True),
+        disable_server_side_cursors=mode == 'pgbouncer',
+        **kwargs,
+    )
+    if (mode == 'native' and database.get('ENGINE') == POSTGRESQL_ENGINE
+            and native_pool_available()):
+        # Pooled connections go back to the pool after each request
+        database['CONN_MAX_AGE'] = 0
+        database.setdefault('OPTIONS', {})['pool'] = get_pool_options()
+    return database
+
+
+def config():
+    """Settings for DATABASE_URL; an empty dict when it is not set."""
+    mode = get_mode()
+    url = os.getenv('DATABASE_URL')
+    return parse(url, mode) if url else {}
+
+
+def replicas():
+    """{alias: settings} for the comma-separated DATABASE_REPLICA_URLS.
+
+    Tests read the primary through the replica aliases (TEST MIRROR),
+    so no separate test databases are created for them.
+    """
+    mode = get_mode()
+    urls = os.getenv('DATABASE_REPLICA_URLS', '').split(',')
+    return {
+        f'replica{number}': parse(
+            url.strip(), mode, test_options={'MIRROR': 'default'}
+        )
+        for number, url in enumerate(filter(str.strip, urls), 1)
+    }
@@ -2,8 +2,11 @@ from django.db import models
 from django.db.models.deletion import ProtectedError
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.counters import CounterFieldsMixin, counter_field
+from task_manager.usage import in_use
 
-class Label(models.Model):
+
+class Label(CounterFieldsMixin, models.Model):
     name = models.CharField(
         max_length=255,
         blank=False,
@@ -15,9 +18,12 @@ class Label(models.Model):
         }
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    task_count = counter_field()
+
+    counter_fields = ('task_count',)
 
     def delete(self, *args, **kwargs):
-        if self.task_set.exists():
+        if in_use(self):
             raise ProtectedError(
                 _("Cannot delete this label because they are being used"),
                 self
@@ -2,6 +2,8 @@ from django.urls import reverse_lazy
 
 from task_manager.labels.models import Label
 from task_manager.labels.tests.testcase import LabelTestCase
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
 
 
 class TestLabelListView(LabelTestCase):
@@ -19,6 +21,15 @@ class TestLabelListView(LabelTestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse_lazy('login'))
 
+    def test_labels_list_queries_do_not_grow(self):
+        self.client.force_login(self.user1)
+        self.assertQueriesDoNotGrow(
+            reverse_lazy('labels:index'),
+            lambda: Label.objects.bulk_create(
+                Label(name=f'Label {number}') for number in range(10)
+            ),
+        )
+
 
 class TestLabelCreateView(LabelTestCase):
     def test_label_creation_authorized(self):
@@ -129,4 +140,22 @@ class TestLabelDeleteView(LabelTestCase):
             reverse_lazy('labels:delete', kwargs={'pk': label1.id})
         )
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, reverse_lazy('login'))
\ No newline at end of file
+        self.assertRedirects(response, reverse_lazy('login'))
+
+    def test_label_in_use_is_not_deleted(self):
+        status = Status.objects.create(name='New')
+        task = Task.objects.create(name='Task', status=status,
+                                   author=self.user1)
+        task.labels.add(self.label1)
+        self.client.force_login(self.user1)
+        url = reverse_lazy('labels:delete', kwargs={'pk': self.label1.id})
+
+        response = self.client.get(url)
+        self.assertTrue(response.context['in_use'])
+        self.assertFalse(self.client.get(
+            reverse_lazy('labels:delete', kwargs={'pk': self.label2.id})
+        ).context['in_use'])
+
+        response = self.client.post(url)
+        self.assertRedirects(response, reverse_lazy('labels:index'))
+        self.assertTrue(Label.objects.filter(id=self.label1.id).exists())
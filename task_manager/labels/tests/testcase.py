@@ -1,14 +1,19 @@
-from django.test import Client, TestCase
-
 from task_manager.labels.models import Label
+from task_manager.testing import QueryBudgetTestCase
 from task_manager.users.models import User
 
 
-class LabelTestCase(TestCase):
+class LabelTestCase(QueryBudgetTestCase):
     fixtures = ['test_users.json', 'test_labels.json']
+    query_budgets = {
+        'labels:index': 3,
+        'labels:create': {'GET': 2, 'POST': 5},
+        'labels:update': {'GET': 3, 'POST': 6},
+        'labels:delete': {'GET': 4, 'POST': 8},
+    }
 
     def setUp(self):
-        self.client = Client()
+        super().setUp()
 
         self.label1 = Label.objects.get(id=1)
         self.label2 = Label.objects.get(id=2)
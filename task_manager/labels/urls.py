@@ -1,11 +1,17 @@
+from django.conf import settings
 from django.urls import path
 
 from task_manager.labels import views
 
 app_name = 'labels'
 
+if settings.ASYNC_VIEWS:
+    list_view = views.AsyncLabelListView
+else:
+    list_view = views.LabelListView
+
 urlpatterns = [
-    path('', views.LabelListView.as_view(), name='index'),
+    path('', list_view.as_view(), name='index'),
     path('create/', views.LabelCreateView.as_view(), name='create'),
     path('<int:pk>/update/', views.LabelUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.LabelDeleteView.as_view(), name='delete'),
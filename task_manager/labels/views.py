@@ -8,21 +8,35 @@ from django.views.generic import (
     UpdateView,
 )
 
+from task_manager.async_views import (
+    AsyncListView,
+    AsyncLoginRequiredMixin,
+)
+from task_manager.conditional import (
+    AsyncConditionalGetMixin,
+    ConditionalGetMixin,
+)
 from task_manager.labels.forms import LabelCreationForm
 from task_manager.labels.models import Label
 from task_manager.mixins import (
     CustomLoginRequiredMixin,
     ProtectErrorMixin,
 )
+from task_manager.pagination import KeysetPaginationMixin
 
 URL_INDEX = 'labels:index'
 
 
-class LabelListView(CustomLoginRequiredMixin, ListView):
+class LabelListView(CustomLoginRequiredMixin,
+                    ConditionalGetMixin,
+                    KeysetPaginationMixin,
+                    ListView):
     model = Label
     template_name = 'labels/index.html'
     context_object_name = 'labels'
     ordering = ['id']
+    # Task counts are rendered too
+    etag_models = ('labels.label', 'tasks.task')
 
 
 class LabelCreateView(CustomLoginRequiredMixin,
@@ -68,4 +82,14 @@ class LabelDeleteView(CustomLoginRequiredMixin,
     extra_context = {
         'title': _('Label deletion'),
         'button_name': _('Yes, delete')
-    }
\ No newline at end of file
+    }
+
+
+class AsyncLabelListView(AsyncLoginRequiredMixin,
+                         AsyncConditionalGetMixin,
+                         AsyncListView):
+    model = Label
+    template_name = 'labels/index.html'
+    context_object_name = 'labels'
+    ordering = ['id']
+    etag_models = LabelListView.etag_models
\ No newline at end of file
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.cache import get_stats
+from task_manager.metrics import CACHE_NAMES
+
+
+class Command(BaseCommand):
+    help = (
+        'Prints hit and miss counters of the application caches. '
+        'Counters are shared between processes only when CACHE_LOCATION '
+        'selects the file-based cache.'
+    )
+
+    def handle(self, *args, **options):
+        for name in CACHE_NAMES:
+            stats = get_stats(name)
+            lookups = stats['hits'] + stats['misses']
+            ratio = stats['hits'] / lookups if lookups else 0
+            self.stdout.write(
+                f"{name}: {stats['hits']} hits, {stats['misses']} misses "
+                f'({ratio:.1%} hit rate)'
+            )
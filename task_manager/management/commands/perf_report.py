@@ -0,0 +1,56 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from task_manager import profiling
+
+COLUMNS = (
+    ('count', 'count'),
+    ('wall_ms', 'wall ms'),
+    ('wall_p50_ms', 'p50 <='),
+    ('wall_p95_ms', 'p95 <='),
+    ('sql_ms', 'sql ms'),
+    ('template_ms', 'tmpl ms'),
+    ('queries', 'queries'),
+    ('max_queries', 'max q'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Prints per-view timings sampled by ProfilingMiddleware in all '
+        'worker processes: average wall, SQL and template time, '
+        'bucketed wall percentiles and queries per request.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json', action='store_true', help='Print the report as JSON.'
+        )
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Delete the collected timings after printing them.',
+        )
+
+    def handle(self, *args, **options):
+        report = profiling.report()
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        elif not report:
+            self.stdout.write(
+                f'No samples in {settings.PROFILING_DIR}. Is '
+                'PROFILING_SAMPLE_RATE set for the server?'
+            )
+        else:
+            width = max(len(view_name) for view_name in report)
+            header = ''.join(f'{title:>10}' for _, title in COLUMNS)
+            self.stdout.write(f"{'view':<{width}}{header}")
+            for view_name, summary in report.items():
+                values = ''.join(
+                    f"{'-' if summary[key] is None else summary[key]:>10}"
+                    for key, _ in COLUMNS
+                )
+                self.stdout.write(f'{view_name:<{width}}{values}')
+        if options['reset']:
+            profiling.reset()
@@ -0,0 +1,224 @@
+"""Prometheus metrics shared by all worker processes.
+
+``MetricsMiddleware`` counts every request by resolved URL name and
+observes its duration, database time and template time. Each process
+keeps its values in memory and writes them to ``METRICS_DIR`` at most
+every ``METRICS_FLUSH_INTERVAL`` seconds (see task_manager/snapshots.py);
+``/metrics`` sums the files of all workers into the text exposition
+format, so no Prometheus client library or push gateway is needed.
+"""
+import atexit
+import copy
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from task_manager import choices
+from task_manager.cache import get_stats
+from task_manager.profiling import RequestProfile
+from task_manager.snapshots import read_snapshots, write_snapshot
+from task_manager.tasks import cache as tasks_cache
+from task_manager.users import auth
+
+SNAPSHOT_PREFIX = 'metrics'
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+PREFIX = 'task_manager_'
+# Caches whose hit/miss counters are exported, see task_manager.cache
+CACHE_NAMES = (tasks_cache.CACHE_NAME, choices.CACHE_NAME, auth.CACHE_NAME)
+
+COUNTERS = {
+    'requests_total': 'Requests by URL name, method and status code.',
+    'db_queries_total': 'Database queries by URL name.',
+}
+HISTOGRAMS = {
+    'request_duration_seconds': 'Request wall time by URL name.',
+    'db_duration_seconds': 'Database time per request by URL name.',
+    'template_duration_seconds': (
+        'Template rendering time per request by URL name, without the '
+        'queries run while rendering.'
+    ),
+}
+
+_lock = threading.Lock()
+# Process-local: {'counters': {key: value}, 'histograms': {key: {...}}}
+# where key is "name|label=value|..." so the snapshot stays plain JSON
+_values = {'counters': {}, 'histograms': {}}
+_last_flush = 0.0
+
+
+def make_key(name, **labels):
+    return '|'.join([name, *(f'{k}={v}' for k, v in sorted(labels.items()))])
+
+
+def split_key(key):
+    name, *pairs = key.split('|')
+    return name, dict(pair.split('=', 1) for pair in pairs)
+
+
+def new_histogram():
+    return {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0}
+
+
+def observe(histogram, seconds):
+    for index, bound in enumerate(BUCKETS):
+        if seconds <= bound:
+            histogram['buckets'][index] += 1
+    histogram['sum'] += seconds
+    histogram['count'] += 1
+
+
+def record(view, method, status, wall, sql, template, queries):
+    global _last_flush
+    counters, histograms = _values['counters'], _values['histograms']
+    with _lock:
+        key = make_key('requests_total', view=view, method=method,
+                       status=status)
+        counters[key] = counters.get(key, 0) + 1
+        key = make_key('db_queries_total', view=view)
+        counters[key] = counters.get(key, 0) + queries
+        for name, seconds in (('request_duration_seconds', wall),
+                              ('db_duration_seconds', sql),
+                              ('template_duration_seconds', template)):
+            key = make_key(name, view=view)
+            observe(histograms.setdefault(key, new_histogram()), seconds)
+        now = time.monotonic()
+        if now - _last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return
+        _last_flush = now
+    flush()
+
+
+def flush():
+    with _lock:
+        if not _values['counters']:
+            return
+        data = copy.deepcopy(_values)
+    write_snapshot(settings.METRICS_DIR, SNAPSHOT_PREFIX, data)
+
+
+atexit.register(flush)
+
+
+def collect():
+    """Sums all snapshots; also returns requests per worker PID."""
+    flush()
+    counters, histograms, workers = {}, {}, {}
+    for pid, data in read_snapshots(settings.METRICS_DIR, SNAPSHOT_PREFIX):
+        for key, value in data['counters'].items():
+            counters[key] = counters.get(key, 0) + value
+            if key.startswith('requests_total|'):
+                workers[pid] = workers.get(pid, 0) + value
+        for key, histogram in data['histograms'].items():
+            total = histograms.setdefault(key, new_histogram())
+            for index, count in enumerate(histogram['buckets']):
+                total['buckets'][index] += count
+            total['sum'] += histogram['sum']
+            total['count'] += histogram['count']
+    return counters, histograms, workers
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"')
+         .replace('\n', r'\n'))
+        for name, value in sorted(labels.items())
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format 0.0.4."""
+    counters, histograms, workers = collect()
+    lines = []
+
+    def header(name, kind, description):
+        lines.append(f'# HELP {PREFIX}{name} {description}')
+        lines.append(f'# TYPE {PREFIX}{name} {kind}')
+
+    for metric, description in COUNTERS.items():
+        header(metric, 'counter', description)
+        for key in sorted(counters):
+            name, labels = split_key(key)
+            if name == metric:
+                lines.append(f'{PREFIX}{name}{format_labels(labels)} '
+                             f'{counters[key]}')
+    for metric, description in HISTOGRAMS.items():
+        header(metric, 'histogram', description)
+        for key in sorted(histograms):
+            name, labels = split_key(key)
+            if name != metric:
+                continue
+            histogram = histograms[key]
+            for bound, count in zip(BUCKETS, histogram['buckets']):
+                bucket_labels = format_labels({**labels, 'le': bound})
+                lines.append(f'{PREFIX}{name}_bucket{bucket_labels} {count}')
+            bucket_labels = format_labels({**labels, 'le': '+Inf'})
+            lines.append(
+                f"{PREFIX}{name}_bucket{bucket_labels} {histogram['count']}"
+            )
+            lines.append(f'{PREFIX}{name}_sum{format_labels(labels)} '
+                         f"{format_number(histogram['sum'])}")
+            lines.append(f'{PREFIX}{name}_count{format_labels(labels)} '
+                         f"{histogram['count']}")
+
+    header('worker_requests_total', 'counter',
+           'Requests handled by each worker process.')
+    for pid, count in sorted(workers.items()):
+        lines.append(f'{PREFIX}worker_requests_total'
+                     f'{format_labels({"pid": pid})} {count}')
+    header('cache_lookups_total', 'counter',
+           'Application cache lookups by cache and result.')
+    for cache_name in CACHE_NAMES:
+        stats = get_stats(cache_name)
+        for result, key in (('hit', 'hits'), ('miss', 'misses')):
+            labels = format_labels({'cache': cache_name, 'result': result})
+            lines.append(f'{PREFIX}cache_lookups_total{labels} '
+                         f'{stats[key]}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """Records every request when METRICS_ENABLED is set."""
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = request.metrics_profile = RequestProfile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(profile.queries)
+                )
+            response = self.get_response(request)
+        wall = time.perf_counter() - started
+
+        match = request.resolver_match
+        record(
+            match.view_name if match else '(unresolved)',
+            request.method,
+            response.status_code,
+            wall,
+            profile.queries.time,
+            profile.template_time,
+            profile.queries.count,
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        profile = getattr(request, 'metrics_profile', None)
+        if profile is not None:
+            profile.start_render(response)
+        return response
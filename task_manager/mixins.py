@@ -1,10 +1,13 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.db.models.deletion import ProtectedError
+from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.usage import in_use
+
 
 class FormStyleMixin:
     """Adds Bootstrap styles to form fields."""
@@ -46,6 +49,14 @@ class CustomLoginRequiredMixin(LoginRequiredMixin):
         return super().handle_no_permission()
 
 
+class JsonLoginRequiredMixin(LoginRequiredMixin):
+    """Answers unauthenticated API requests with 401 JSON."""
+    def handle_no_permission(self):
+        return JsonResponse(
+            {'detail': _('Authentication required.')}, status=401
+        )
+
+
 class BasePermissionMixin(UserPassesTestMixin):
     """Base mixin for object permission checks."""
     permission_denied_url = reverse_lazy('users:index')
@@ -59,6 +70,14 @@ class BasePermissionMixin(UserPassesTestMixin):
         return super().handle_no_permission()
 
 
+class StaffRequiredMixin(UserPassesTestMixin):
+    """Allows access only to staff users; others get 403."""
+    raise_exception = True
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+
 class UserPermissionMixin(BasePermissionMixin):
     """Allows access only to the profile owner."""
     msg = _('You do not have permission to change another user.')
@@ -78,12 +97,27 @@ class AuthorPermissionMixin(BasePermissionMixin):
 
 
 class ProtectErrorMixin:
-    """Handles ProtectedError exceptions on object deletion."""
+    """Refuses to delete objects that are still in use.
+
+    The check runs before the object reaches the deletion collector,
+    and the confirmation page gets ``in_use`` to warn upfront.
+    ProtectedError is still handled for rows added in between.
+    """
     protected_object_message = _(
         'Cannot delete object because it is being used.'
     )
     protected_object_url = None
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.setdefault('in_use', in_use(self.object))
+        return context
+
+    def form_valid(self, form):
+        if in_use(self.object):
+            raise ProtectedError(self.protected_object_message, set())
+        return super().form_valid(form)
+
     def post(self, request, *args, **kwargs):
         try:
             return super().post(request, *args, **kwargs)
@@ -0,0 +1,222 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def estimate_count(queryset, limit=10000):
+    """Returns (count, is_exact) without scanning large tables.
+
+    Unfiltered PostgreSQL tables use the planner statistics; anything
+    else is counted up to ``limit`` rows.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0], False
+    count = queryset.order_by()[:limit + 1].count()
+    return min(count, limit), count <= limit
+
+
+class EstimatedCountPaginator(Paginator):
+    """Page-number paginator counting with estimate_count().
+
+    Meant for admin changelists of large tables, with
+    ``show_full_result_count = False``. When the estimate is capped,
+    pages past it are not offered.
+    """
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)[0]
+
+
+class KeysetPage:
+    """A page of a keyset-paginated queryset."""
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None,
+                 count=None, count_is_exact=True):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_is_exact = count_is_exact
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Paginates by seeking past the last seen key instead of OFFSET.
+
+    ``keys`` are field names in ordering syntax, e.g. ``('id',)`` or
+    ``('-created_at', '-id')``; the last key must be unique.
+    """
+    def __init__(self, queryset, per_page, keys=('id',)):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.keys = tuple(keys)
+
+    @property
+    def fields(self):
+        return [key.lstrip('-') for key in self.keys]
+
+    def encode_cursor(self, obj, direction):
+        values = [getattr(obj, field) for field in self.fields]
+        data = json.dumps([direction, values], cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            data = base64.urlsafe_b64decode(cursor.encode())
+            direction, values = json.loads(data)
+            if direction not in (NEXT, PREVIOUS):
+                raise ValueError(direction)
+            if len(values) != len(self.keys):
+                raise ValueError(values)
+            meta = self.queryset.model._meta
+            values = [meta.get_field(field).to_python(value)
+                      for field, value in zip(self.fields, values)]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise Http404(_('Invalid page cursor.'))
+        return direction, values
+
+    def seek(self, values, backwards=False):
+        """Builds the row-value comparison ``(k1, k2) > (v1, v2)``."""
+        condition = Q()
+        equal = {}
+        for key, value in zip(self.keys, values):
+            field = key.lstrip('-')
+            ascending = not key.startswith('-')
+            lookup = 'gt' if ascending != backwards else 'lt'
+            condition |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return condition
+
+    def ordering(self, backwards=False):
+        if not backwards:
+            return self.keys
+        return tuple(key[1:] if key.startswith('-') else f'-{key}'
+                     for key in self.keys)
+
+    def page_queryset(self, cursor=None):
+        """Returns the LIMITed queryset for a cursor and its position."""
+        direction, values = NEXT, None
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+        backwards = direction == PREVIOUS
+
+        queryset = self.queryset.order_by(*self.ordering(backwards))
+        if values is not None:
+            queryset = queryset.filter(self.seek(values, backwards))
+        return queryset[:self.per_page + 1], backwards, values is not None
+
+    def page(self, cursor=None):
+        queryset, backwards, after = self.page_queryset(cursor)
+        return self.make_page(list(queryset), backwards, after)
+
+    async def apage(self, cursor=None):
+        queryset, backwards, after = self.page_queryset(cursor)
+        return self.make_page(
+            [obj async for obj in queryset], backwards, after
+        )
+
+    def make_page(self, rows, backwards, after):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, after
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1], NEXT)
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(rows[0], PREVIOUS)
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+class KeysetPaginationMixin:
+    """Keyset pagination for ListView subclasses.
+
+    The view ``ordering`` is used as the key, with ``id`` appended as a
+    tie-breaker. Other query parameters, e.g. TaskFilter fields, are
+    kept in the page links. ``approximate_count = None`` follows
+    ``settings.PAGINATION_APPROXIMATE_COUNT``.
+    """
+    paginate_by = 50
+    page_kwarg = 'cursor'
+    approximate_count = None
+
+    def get_approximate_count(self):
+        if self.approximate_count is None:
+            return settings.PAGINATION_APPROXIMATE_COUNT
+        return self.approximate_count
+
+    def get_paginate_keys(self):
+        ordering = self.get_ordering() or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        keys = tuple(ordering)
+        if not {'id', '-id'} & set(keys):
+            keys += ('id',)
+        return keys
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset, page_size, self.get_paginate_keys()
+        )
+        page = paginator.page(self.request.GET.get(self.page_kwarg))
+        if self.get_approximate_count():
+            page.count, page.count_is_exact = estimate_count(queryset)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_page_query(self, cursor):
+        query = self.request.GET.copy()
+        query[self.page_kwarg] = cursor
+        return query.urlencode()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None:
+            if page.has_next():
+                context['next_page_query'] = (
+                    self.get_page_query(page.next_cursor)
+                )
+            if page.has_previous():
+                context['previous_page_query'] = (
+                    self.get_page_query(page.previous_cursor)
+                )
+        return context
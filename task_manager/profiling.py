@@ -0,0 +1,226 @@
+"""Sampling request profiler.
+
+``ProfilingMiddleware`` times a ``PROFILING_SAMPLE_RATE`` fraction of
+requests and splits each one into SQL time, template time (without the
+SQL that ran while rendering) and the rest. Timings are aggregated per
+view into fixed-bucket histograms in process memory and written to
+``PROFILING_DIR`` every ``PROFILING_FLUSH_INTERVAL`` seconds, so the
+staff-only ``/perf/`` page and ``manage.py perf_report`` can merge the
+numbers of all workers.
+"""
+import atexit
+import copy
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from task_manager.snapshots import (
+    clear_snapshots,
+    read_snapshots,
+    write_snapshot,
+)
+
+SNAPSHOT_PREFIX = 'profile'
+# Upper bounds in milliseconds; the last bucket counts everything slower
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+TIMINGS = ('wall', 'sql', 'template')
+
+_lock = threading.Lock()
+# Process-local: {view name: stats dict as described by new_view_stats()}
+_stats = {}
+_last_flush = 0.0
+
+
+def new_histogram():
+    return {'buckets': [0] * (len(BUCKETS_MS) + 1), 'sum': 0.0}
+
+
+def new_view_stats():
+    stats = {name: new_histogram() for name in TIMINGS}
+    stats.update(count=0, queries=0, max_queries=0)
+    return stats
+
+
+def observe(histogram, milliseconds):
+    index = next(
+        (i for i, bound in enumerate(BUCKETS_MS) if milliseconds <= bound),
+        len(BUCKETS_MS),
+    )
+    histogram['buckets'][index] += 1
+    histogram['sum'] += milliseconds
+
+
+def record(view_name, wall, sql, template, queries):
+    """Adds one request; durations are in seconds."""
+    global _last_flush
+    with _lock:
+        stats = _stats.setdefault(view_name, new_view_stats())
+        stats['count'] += 1
+        stats['queries'] += queries
+        stats['max_queries'] = max(stats['max_queries'], queries)
+        for name, seconds in zip(TIMINGS, (wall, sql, template)):
+            observe(stats[name], seconds * 1000)
+        now = time.monotonic()
+        if now - _last_flush < settings.PROFILING_FLUSH_INTERVAL:
+            return
+        _last_flush = now
+    flush()
+
+
+def flush():
+    with _lock:
+        if not _stats:
+            return
+        data = copy.deepcopy(_stats)
+    write_snapshot(settings.PROFILING_DIR, SNAPSHOT_PREFIX, data)
+
+
+def merge(target, stats):
+    for name in TIMINGS:
+        for index, count in enumerate(stats[name]['buckets']):
+            target[name]['buckets'][index] += count
+        target[name]['sum'] += stats[name]['sum']
+    target['count'] += stats['count']
+    target['queries'] += stats['queries']
+    target['max_queries'] = max(target['max_queries'], stats['max_queries'])
+
+
+def collect():
+    """Merges the snapshots of every process, this one flushed first."""
+    flush()
+    merged = {}
+    for _, data in read_snapshots(settings.PROFILING_DIR, SNAPSHOT_PREFIX):
+        for view_name, stats in data.items():
+            merge(merged.setdefault(view_name, new_view_stats()), stats)
+    return merged
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+    clear_snapshots(settings.PROFILING_DIR, SNAPSHOT_PREFIX)
+
+
+def percentile(histogram, fraction):
+    """Upper bound of the bucket holding the fraction-th observation.
+
+    None when there are no observations or the observation is slower
+    than the last bound.
+    """
+    total = sum(histogram['buckets'])
+    if not total:
+        return None
+    seen = 0
+    for bound, count in zip(BUCKETS_MS + (None,), histogram['buckets']):
+        seen += count
+        if seen >= fraction * total:
+            return bound
+    return None
+
+
+def summarize(stats):
+    """Per-view averages and bucketed percentiles in milliseconds."""
+    count = stats['count']
+    return {
+        'count': count,
+        'wall_ms': round(stats['wall']['sum'] / count, 2),
+        'wall_p50_ms': percentile(stats['wall'], 0.5),
+        'wall_p95_ms': percentile(stats['wall'], 0.95),
+        'sql_ms': round(stats['sql']['sum'] / count, 2),
+        'template_ms': round(stats['template']['sum'] / count, 2),
+        'queries': round(stats['queries'] / count, 1),
+        'max_queries': stats['max_queries'],
+    }
+
+
+def report():
+    """{view name: summary}, slowest average wall time first."""
+    summaries = {
+        view_name: summarize(stats)
+        for view_name, stats in collect().items() if stats['count']
+    }
+    return dict(sorted(
+        summaries.items(), key=lambda item: -item[1]['wall_ms']
+    ))
+
+
+atexit.register(flush)
+
+
+class QueryTimer:
+    """execute_wrapper adding up the count and duration of queries."""
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = QueryTimer()
+        self.template_time = 0.0
+
+    def start_render(self, response):
+        started = time.perf_counter()
+        sql_before = self.queries.time
+
+        def finish_render(response):
+            sql = self.queries.time - sql_before
+            self.template_time += time.perf_counter() - started - sql
+
+        response.add_post_render_callback(finish_render)
+
+
+class ProfilingMiddleware:
+    """Profiles a random sample of requests; see the module docstring.
+
+    Queries that async views run in other threads are not seen by the
+    execute_wrapper, so only sync views get a complete SQL breakdown.
+    """
+    def __init__(self, get_response):
+        if not settings.PROFILING_SAMPLE_RATE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = request.profile = RequestProfile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(profile.queries)
+                )
+            response = self.get_response(request)
+        wall = time.perf_counter() - started
+
+        match = request.resolver_match
+        record(
+            match.view_name if match else '(unresolved)',
+            wall,
+            profile.queries.time,
+            profile.template_time,
+            profile.queries.count,
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            profile.start_render(response)
+        return response
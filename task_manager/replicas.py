@@ -0,0 +1,74 @@
+"""Routes the reads of safe requests to read replicas.
+
+``ReplicaMiddleware`` marks GET and HEAD requests as replica-safe, and
+``ReplicaRouter`` then reads from a random alias of ``DATABASE_REPLICAS``.
+Everything else (writes, reads of POST requests, management commands)
+uses ``default``. After an unsafe request the client gets a cookie that
+keeps its reads on the primary for ``REPLICA_STICKY_SECONDS``, so users
+see their own changes despite replication lag.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+PRIMARY = 'default'
+SAFE_METHODS = ('GET', 'HEAD')
+
+# A ContextVar, so async views keep the value in their sync_to_async
+# threads and concurrent requests of a thread do not share it
+reading_replica = ContextVar('reading_replica', default=False)
+
+
+@contextmanager
+def use_primary():
+    """Reads from the primary, e.g. to fill caches kept past the lag."""
+    token = reading_replica.set(False)
+    try:
+        yield
+    finally:
+        reading_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reading_replica.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == PRIMARY
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS
+        sticky = settings.REPLICA_STICKY_COOKIE in request.COOKIES
+        token = reading_replica.set(safe and not sticky)
+        try:
+            response = self.get_response(request)
+        finally:
+            reading_replica.reset(token)
+        if not safe:
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
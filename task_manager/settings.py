@@ -11,11 +11,13 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
-import dj_database_url
 from django.utils.translation import gettext_lazy as _
 
+from task_manager import database
+
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -62,6 +64,9 @@ AUTH_USER_MODEL = 'users.User'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'task_manager.metrics.MetricsMiddleware',
+    'task_manager.profiling.ProfilingMiddleware',
+    'task_manager.replicas.ReplicaMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -79,19 +84,29 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Templates are parsed once per process; the development
+            # server resets the cache when a template changes
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'task_manager.wsgi.application'
 
+# Route list and detail pages to their async views (for ASGI servers)
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -103,9 +118,89 @@ DATABASES = {
     }
 }
 
-db_from_env = dj_database_url.config(conn_max_age=600)
+# Pooling, connection age and health checks: see task_manager/database.py
+db_from_env = database.config()
 DATABASES["default"].update(db_from_env)
 
+# Read replicas, comma-separated in DATABASE_REPLICA_URLS
+DATABASES.update(database.replicas())
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = (
+    ['task_manager.replicas.ReplicaRouter'] if DATABASE_REPLICAS else []
+)
+# Seconds the reads of a client stay on the primary after it wrote
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
+REPLICA_STICKY_COOKIE = 'primary_reads'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+if os.getenv('CACHE_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_LOCATION'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# The version counters of task_manager/cache.py reach every worker only
+# when the cache is shared
+CACHE_SHARED = bool(os.getenv('CACHE_LOCATION'))
+
+# Seconds task list pages are cached; 0 disables the page cache. Off by
+# default without a shared cache, where other workers would keep serving
+# pages from before a write
+TASK_LIST_CACHE_TIMEOUT = int(os.getenv(
+    'TASK_LIST_CACHE_TIMEOUT', '300' if CACHE_SHARED else '0'
+))
+
+# Rows fetched per database round trip by streaming API exports
+API_STREAM_CHUNK_SIZE = int(os.getenv('API_STREAM_CHUNK_SIZE', '2000'))
+
+# Days of changes kept by compact_changes; older cursors must resync
+CHANGE_LOG_RETENTION_DAYS = int(os.getenv('CHANGE_LOG_RETENTION_DAYS', '30'))
+
+# Live updates of the task list, see task_manager/tasks/events.py
+TASK_EVENTS_BROKER = os.getenv(
+    'TASK_EVENTS_BROKER', 'task_manager.tasks.events.ChangeLogBroker'
+)
+TASK_EVENTS_POLL_INTERVAL = float(os.getenv('TASK_EVENTS_POLL_INTERVAL', '1'))
+TASK_EVENTS_HEARTBEAT = float(os.getenv('TASK_EVENTS_HEARTBEAT', '25'))
+
+
+# Sessions and authentication
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    # Reads come from the cache, so it must be shared by all workers
+    # (CACHE_LOCATION) or a worker may serve a stale session
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('SESSION_MODE', 'db')]
+
+# Seconds a worker reuses the logged-in user without reading it again;
+# 0 reads it on every request. Needs a shared cache, or a password
+# change or deactivation would not reach the other workers
+USER_CACHE_TIMEOUT = int(os.getenv('USER_CACHE_TIMEOUT', '0'))
+if USER_CACHE_TIMEOUT and not CACHE_SHARED:
+    raise ValueError('USER_CACHE_TIMEOUT requires CACHE_LOCATION')
+
+# ModelBackend stays listed so sessions created before the cached
+# backend was added remain valid
+AUTHENTICATION_BACKENDS = [
+    'task_manager.users.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -152,6 +247,30 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Fraction of requests timed by ProfilingMiddleware; 0 disables it
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+# Shared by all worker processes, see task_manager/snapshots.py
+PROFILING_DIR = os.getenv(
+    'PROFILING_DIR',
+    os.path.join(tempfile.gettempdir(), 'task_manager_profiling'),
+)
+PROFILING_FLUSH_INTERVAL = int(os.getenv('PROFILING_FLUSH_INTERVAL', '10'))
+
+# Prometheus metrics served at /metrics, aggregated over all workers
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False') == 'True'
+METRICS_DIR = os.getenv(
+    'METRICS_DIR',
+    os.path.join(tempfile.gettempdir(), 'task_manager_metrics'),
+)
+METRICS_FLUSH_INTERVAL = int(os.getenv('METRICS_FLUSH_INTERVAL', '5'))
+# Scrapers must send "Authorization: Bearer <token>" when set
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+# Show an estimated total on keyset-paginated list pages
+PAGINATION_APPROXIMATE_COUNT = (
+    os.getenv('PAGINATION_APPROXIMATE_COUNT', 'False') == 'True'
+)
+
 ROLLBAR = {
     'access_token': os.getenv('ROLLBAR_ACCESS_TOKEN'),
     'environment': 'development' if DEBUG else 'production',
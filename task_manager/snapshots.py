@@ -0,0 +1,40 @@
+"""Per-process JSON snapshots that are merged across worker processes.
+
+Every process writes its own ``<prefix>-<pid>.json`` file, so workers
+never contend for a lock. Readers load all files of a prefix and merge
+them; files of exited workers keep counting towards the totals until
+they are removed with ``clear_snapshots``.
+"""
+import json
+import os
+from pathlib import Path
+
+
+def snapshot_path(directory, prefix, pid=None):
+    return Path(directory) / f'{prefix}-{pid or os.getpid()}.json'
+
+
+def write_snapshot(directory, prefix, data):
+    """Atomically replaces this process's snapshot."""
+    path = snapshot_path(directory, prefix)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix('.tmp')
+    with open(temporary, 'w') as file:
+        json.dump(data, file)
+    os.replace(temporary, path)
+
+
+def read_snapshots(directory, prefix):
+    """Yields (pid, data) for every readable snapshot of prefix."""
+    for path in sorted(Path(directory).glob(f'{prefix}-*.json')):
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            continue
+        yield int(path.stem.rsplit('-', 1)[1]), data
+
+
+def clear_snapshots(directory, prefix):
+    for path in Path(directory).glob(f'{prefix}-*.json'):
+        path.unlink(missing_ok=True)
@@ -0,0 +1,14 @@
+'use strict';
+// Opens the changelist filtered by the object chosen in an
+// AutocompleteFilter (see task_manager/tasks/admin.py).
+{
+    const $ = django.jQuery;
+
+    $(document).on('change', '.autocomplete-filter', function() {
+        if (this.value) {
+            window.location.href = this.dataset.url.replace(
+                '__value__', encodeURIComponent(this.value)
+            );
+        }
+    });
+}
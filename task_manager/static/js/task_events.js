@@ -0,0 +1,33 @@
+'use strict';
+// Patches the rows of tasks/index.html with the task events streamed by
+// TaskEventsView (see task_manager/tasks/events.py). Tasks not on the
+// page only show the notice, as they may not match its filter.
+{
+    const table = document.getElementById('tasks-table');
+    const notice = document.getElementById('tasks-changed');
+    const source = new EventSource(table.dataset.eventsUrl);
+    const fields = ['name', 'status', 'author', 'executor'];
+
+    source.addEventListener('task', function(message) {
+        const task = JSON.parse(message.data);
+        const row = table.querySelector(`tr[data-task-id="${task.id}"]`);
+        if (task.action === 'delete') {
+            if (row) {
+                row.remove();
+            }
+        } else if (row) {
+            for (const field of fields) {
+                row.querySelector(`[data-field="${field}"]`).textContent =
+                    task[field];
+            }
+        } else {
+            notice.hidden = false;
+        }
+    });
+
+    // The page fell behind the events; reloading is cheaper
+    source.addEventListener('reload', function() {
+        source.close();
+        notice.hidden = false;
+    });
+}
@@ -1,8 +1,10 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.counters import CounterFieldsMixin, counter_field
 
-class Status(models.Model):
+
+class Status(CounterFieldsMixin, models.Model):
     name = models.CharField(
         max_length=255,
         blank=False,
@@ -14,6 +16,9 @@ class Status(models.Model):
         }
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    task_count = counter_field()
+
+    counter_fields = ('task_count',)
 
     def __str__(self):
         return self.name
@@ -1,7 +1,11 @@
+from unittest.mock import patch
+
+from django.db.models.deletion import Collector
 from django.urls import reverse_lazy
 
 from task_manager.statuses.models import Status
 from task_manager.statuses.tests.testcase import StatusTestCase
+from task_manager.tasks.models import Task
 
 
 class TestStatusListView(StatusTestCase):
@@ -20,6 +24,15 @@ class TestStatusListView(StatusTestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse_lazy('login'))
 
+    def test_statuses_list_queries_do_not_grow(self):
+        self.client.force_login(self.user1)
+        self.assertQueriesDoNotGrow(
+            reverse_lazy('statuses:index'),
+            lambda: Status.objects.bulk_create(
+                Status(name=f'Status {number}') for number in range(10)
+            ),
+        )
+
 
 class TestStatusCreateView(StatusTestCase):
     def test_status_creation_authorized(self):
@@ -134,4 +147,20 @@ class TestStatusDeleteView(StatusTestCase):
             reverse_lazy('statuses:delete', kwargs={'pk': status.id})
         )
         self.assertEqual(response.status_code, 302)
-        self.assertRedirects(response, reverse_lazy('login'))
\ No newline at end of file
+        self.assertRedirects(response, reverse_lazy('login'))
+
+    def test_status_in_use_is_not_collected(self):
+        Task.objects.create(name='Task', status=self.status1,
+                            author=self.user1)
+        self.client.force_login(self.user1)
+        url = reverse_lazy('statuses:delete', kwargs={'pk': self.status1.id})
+
+        response = self.client.get(url)
+        self.assertTrue(response.context['in_use'])
+        self.assertContains(response, 'disabled')
+
+        with patch.object(Collector, 'collect') as collect:
+            response = self.client.post(url)
+        collect.assert_not_called()
+        self.assertRedirects(response, reverse_lazy('statuses:index'))
+        self.assertTrue(Status.objects.filter(id=self.status1.id).exists())
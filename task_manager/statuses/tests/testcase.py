@@ -1,14 +1,19 @@
-from django.test import Client, TestCase
-
 from task_manager.statuses.models import Status
+from task_manager.testing import QueryBudgetTestCase
 from task_manager.users.models import User
 
 
-class StatusTestCase(TestCase):
+class StatusTestCase(QueryBudgetTestCase):
     fixtures = ['test_users.json', 'test_statuses.json']
+    query_budgets = {
+        'statuses:index': 3,
+        'statuses:create': {'GET': 2, 'POST': 5},
+        'statuses:update': {'GET': 3, 'POST': 6},
+        'statuses:delete': {'GET': 4, 'POST': 7},
+    }
 
     def setUp(self):
-        self.client = Client()
+        super().setUp()
 
         self.status1 = Status.objects.get(id=1)
         self.status2 = Status.objects.get(id=2)
@@ -1,11 +1,17 @@
+from django.conf import settings
 from django.urls import path
 
 from task_manager.statuses import views
 
 app_name = 'statuses'
 
+if settings.ASYNC_VIEWS:
+    list_view = views.AsyncStatusListView
+else:
+    list_view = views.StatusListView
+
 urlpatterns = [
-    path('', views.StatusListView.as_view(), name='index'),
+    path('', list_view.as_view(), name='index'),
     path('create/', views.StatusCreateView.as_view(), name='create'),
     path('<int:pk>/update/', views.StatusUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.StatusDeleteView.as_view(), name='delete'),
@@ -8,21 +8,35 @@ from django.views.generic import (
     UpdateView,
 )
 
+from task_manager.async_views import (
+    AsyncListView,
+    AsyncLoginRequiredMixin,
+)
+from task_manager.conditional import (
+    AsyncConditionalGetMixin,
+    ConditionalGetMixin,
+)
 from task_manager.mixins import (
     CustomLoginRequiredMixin,
     ProtectErrorMixin,
 )
+from task_manager.pagination import KeysetPaginationMixin
 from task_manager.statuses.forms import StatusCreationForm
 from task_manager.statuses.models import Status
 
 URL_INDEX = 'statuses:index'
 
 
-class StatusListView(CustomLoginRequiredMixin, ListView):
+class StatusListView(CustomLoginRequiredMixin,
+                     ConditionalGetMixin,
+                     KeysetPaginationMixin,
+                     ListView):
     model = Status
     template_name = 'statuses/index.html'
     context_object_name = 'statuses'
     ordering = ['id']
+    # Task counts are rendered too
+    etag_models = ('statuses.status', 'tasks.task')
 
 
 class StatusCreateView(CustomLoginRequiredMixin,
@@ -68,4 +82,14 @@ class StatusDeleteView(CustomLoginRequiredMixin,
     extra_context = {
         'title': _('Status deletion'),
         'button_name': _('Yes, delete')
-    }
\ No newline at end of file
+    }
+
+
+class AsyncStatusListView(AsyncLoginRequiredMixin,
+                          AsyncConditionalGetMixin,
+                          AsyncListView):
+    model = Status
+    template_name = 'statuses/index.html'
+    context_object_name = 'statuses'
+    ordering = ['id']
+    etag_models = StatusListView.etag_models
\ No newline at end of file
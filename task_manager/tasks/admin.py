@@ -1,15 +1,81 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import ValidationError
+
+from task_manager.pagination import EstimatedCountPaginator
+from task_manager.tasks.search import search
 
 from .models import Task
 
 
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """Related filter that loads only the selected objects.
+
+    Other objects are looked up with the admin's autocomplete view as
+    the user types, so the sidebar no longer lists every user or label.
+    The related model's admin needs search_fields.
+    """
+    template = 'admin/autocomplete_filter.html'
+
+    def has_output(self):
+        return True
+
+    def field_choices(self, field, request, model_admin):
+        if not self.lookup_val:
+            return []
+        target = field.target_field.name
+        try:
+            related = list(field.remote_field.model._default_manager.filter(
+                **{f'{target}__in': self.lookup_val}
+            ))
+        except (ValidationError, ValueError):
+            return []
+        return [(getattr(obj, target), str(obj)) for obj in related]
+
+    def choices(self, changelist):
+        self.source_opts = self.field.model._meta
+        # js/autocomplete_filter.js puts the chosen pk in place of
+        # __value__ and opens the resulting URL
+        self.autocomplete_url = changelist.get_query_string(
+            {self.lookup_kwarg: '__value__'}, [self.lookup_kwarg_isnull]
+        )
+        yield from super().choices(changelist)
+
+
 class TaskAdmin(admin.ModelAdmin):
     list_display = ('name', 'status', 'author',
                     'executor', 'created_at', 'get_labels')
-    search_fields = ['name', 'description', 'author', 'executor']
-    list_filter = ['status', 'author', 'executor', 'labels', 'created_at']
-    filter_horizontal = ('labels',)
+    # Matched through the full-text index, see get_search_results()
+    search_fields = ['name', 'description']
+    list_filter = [
+        'status',
+        ('author', AutocompleteFilter),
+        ('executor', AutocompleteFilter),
+        ('labels', AutocompleteFilter),
+        'created_at',
+    ]
+    autocomplete_fields = ('author', 'executor', 'labels')
     ordering = ('-created_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    @property
+    def media(self):
+        # select2 and the admin's autocomplete.js for the list filters
+        field = Task._meta.get_field('author')
+        return (
+            super().media
+            + AutocompleteSelect(field, self.admin_site).media
+            + forms.Media(js=['js/autocomplete_filter.js'])
+        )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).for_admin()
+
+    def get_search_results(self, request, queryset, search_term):
+        return search(queryset, search_term), False
 
     @admin.display(description='Labels')
     def get_labels(self, obj):
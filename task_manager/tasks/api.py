@@ -0,0 +1,168 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from django.views.generic import View
+
+from task_manager.labels.models import Label
+from task_manager.mixins import JsonLoginRequiredMixin
+from task_manager.pagination import KeysetPaginator
+from task_manager.statuses.models import Status
+from task_manager.tasks import changes
+from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+MAX_PAGE_SIZE = 500
+# Rows of the change log read per /tasks/changes/ response
+MAX_CHANGES = 1000
+
+
+def serialize_user(user):
+    if user is None:
+        return None
+    return {'id': user.id, 'name': str(user)}
+
+
+def serialize_task(task):
+    return {
+        'id': task.id,
+        'name': task.name,
+        'description': task.description,
+        'status': {'id': task.status.id, 'name': task.status.name},
+        'author': serialize_user(task.author),
+        'executor': serialize_user(task.executor),
+        'labels': [
+            {'id': label.id, 'name': label.name}
+            for label in task.labels.all()
+        ],
+        'created_at': task.created_at,
+        'updated_at': task.updated_at,
+        'version': task.version,
+    }
+
+
+def serialize_named(obj):
+    return {'id': obj.id, 'name': obj.name}
+
+
+# Model label: response key, queryset, serializer
+CHANGE_SERIALIZERS = {
+    'tasks.task': ('tasks', Task.objects.for_api(), serialize_task),
+    'statuses.status': (
+        'statuses', Status.objects.only('id', 'name'), serialize_named,
+    ),
+    'labels.label': (
+        'labels', Label.objects.only('id', 'name'), serialize_named,
+    ),
+    'users.user': (
+        'users', User.objects.only('id', 'first_name', 'last_name'),
+        serialize_user,
+    ),
+}
+
+
+class TaskApiListView(JsonLoginRequiredMixin, View):
+    """Read-only task list filtered with TaskFilter parameters.
+
+    Pages are keyset-paginated with ``cursor`` and ``page_size``.
+    ``stream=1`` returns every matching task as newline-delimited JSON,
+    read from the database ``API_STREAM_CHUNK_SIZE`` rows at a time.
+    """
+    page_kwarg = 'cursor'
+
+    def get_page_size(self):
+        try:
+            size = int(self.request.GET.get('page_size', 50))
+        except ValueError:
+            size = 50
+        return max(1, min(size, MAX_PAGE_SIZE))
+
+    def get_page_url(self, cursor):
+        query = self.request.GET.copy()
+        query[self.page_kwarg] = cursor
+        return self.request.build_absolute_uri(f'?{query.urlencode()}')
+
+    def get(self, request, *args, **kwargs):
+        filterset = TaskFilter(
+            request.GET, queryset=Task.objects.for_api(), request=request
+        )
+        if not filterset.is_valid():
+            return JsonResponse({'errors': filterset.errors}, status=400)
+        if request.GET.get('stream') == '1':
+            return self.stream(filterset.qs.order_by('id'))
+
+        paginator = KeysetPaginator(filterset.qs, self.get_page_size())
+        page = paginator.page(request.GET.get(self.page_kwarg))
+        next_url = previous_url = None
+        if page.has_next():
+            next_url = self.get_page_url(page.next_cursor)
+        if page.has_previous():
+            previous_url = self.get_page_url(page.previous_cursor)
+        return JsonResponse({
+            'results': [serialize_task(task) for task in page],
+            'next': next_url,
+            'previous': previous_url,
+        })
+
+    def stream(self, queryset):
+        rows = queryset.iterator(chunk_size=settings.API_STREAM_CHUNK_SIZE)
+        lines = (
+            json.dumps(serialize_task(task), cls=DjangoJSONEncoder) + '\n'
+            for task in rows
+        )
+        return StreamingHttpResponse(
+            lines, content_type='application/x-ndjson'
+        )
+
+
+class TaskChangesView(JsonLoginRequiredMixin, View):
+    """Tasks, statuses, labels and users changed after a cursor.
+
+    Without ``since`` only the current cursor is returned: take it, then
+    download the full lists. ``?since=<cursor>`` returns the objects
+    changed after it as they are now, the ids of the deleted ones and
+    the cursor of the next request; ``more`` is true while further
+    changes are waiting. An expired cursor is answered with 410, and
+    the client downloads the full lists again.
+    """
+    def get(self, request, *args, **kwargs):
+        since = request.GET.get('since')
+        if since is None:
+            return self.respond({
+                'cursor': changes.format_cursor(changes.current_cursor()),
+            })
+        try:
+            since = changes.parse_cursor(since)
+            cursor, changed, more = changes.read(since, MAX_CHANGES)
+        except ValueError:
+            return JsonResponse(
+                {'errors': {'since': [_('Invalid cursor.')]}}, status=400
+            )
+        except changes.CursorExpired:
+            return JsonResponse(
+                {'detail': _('The cursor has expired, sync again.')},
+                status=410,
+            )
+        data = {
+            'cursor': changes.format_cursor(cursor),
+            'more': more,
+            'deleted': {},
+        }
+        for model, (key, queryset, serialize) in CHANGE_SERIALIZERS.items():
+            pks = changed.get(model, {})
+            saved = [pk for pk, deleted in pks.items() if not deleted]
+            data[key] = [
+                serialize(obj) for obj in queryset.filter(pk__in=saved)
+            ] if saved else []
+            # A saved row may have been deleted after the last change read
+            found = {obj['id'] for obj in data[key]}
+            data['deleted'][key] = sorted(set(pks) - found)
+        return self.respond(data)
+
+    def respond(self, data):
+        return JsonResponse(
+            data, json_dumps_params={'separators': (',', ':')}
+        )
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from task_manager.tasks import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path('tasks/', api.TaskApiListView.as_view(), name='tasks'),
+]
@@ -0,0 +1,64 @@
+from functools import partial
+from itertools import islice
+
+from django.db import transaction
+
+from task_manager.labels.models import Label
+from task_manager.tasks import counters, events
+from task_manager.tasks.models import Change, Task
+
+BATCH_SIZE = 1000
+
+
+def batched(items, size):
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def add_label(tasks, label, batch_size=BATCH_SIZE):
+    """Links the label to tasks without it, one INSERT per batch.
+
+    Returns the number of tasks that got the label.
+    """
+    through = Task.labels.through
+    ids = (tasks.exclude(labels=label).values_list('pk', flat=True)
+           .iterator(chunk_size=batch_size))
+    count = 0
+    for batch in batched(ids, batch_size):
+        through.objects.bulk_create([
+            through(task_id=task_id, label_id=label.pk) for task_id in batch
+        ], ignore_conflicts=True)
+        Change.objects.log(Task, batch)
+        count += len(batch)
+    counters.add_counts(Label, {'task_count': {label.pk: count}})
+    return count
+
+
+def remove_label(tasks, label):
+    """Unlinks the label from every task with a single DELETE."""
+    links = Task.labels.through.objects.filter(
+        label_id=label.pk, task__in=tasks
+    )
+    Change.objects.log(Task, links.values_list('task_id', flat=True))
+    count, _ = links.delete()
+    counters.add_counts(Label, {'task_count': {label.pk: -count}})
+    return count
+
+
+def delete(tasks):
+    """Deletes tasks, logging and publishing them once for the batch.
+
+    The per-task signal handlers are paused, so a large delete writes
+    one INSERT into the change log per batch, not one per task. Returns
+    the number of deleted tasks.
+    """
+    ids = list(tasks.values_list('pk', flat=True))
+    counters.forget(tasks)
+    Change.objects.log(Task, ids, deleted=True)
+    with counters.paused():
+        count = tasks.delete()[1].get(Task._meta.label, 0)
+    transaction.on_commit(partial(
+        events.get_broker().publish, dict.fromkeys(ids, True)
+    ))
+    return count
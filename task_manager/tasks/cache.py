@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from task_manager.cache import get_versions, make_key, record_lookup
+from task_manager.replicas import reading_replica
+
+CACHE_NAME = 'tasks_list'
+# Tables whose rows are rendered on tasks/index.html
+LIST_MODELS = ('tasks.task', 'statuses.status', 'labels.label', 'users.user')
+
+
+def normalize_query(request):
+    """Sorted non-empty parameters; "own tasks" becomes the author id."""
+    params = []
+    for name in sorted(request.GET):
+        values = sorted(value for value in request.GET.getlist(name) if value)
+        if not values:
+            continue
+        if name == 'user_own_tasks':
+            values = [f'author={request.user.pk}']
+        params.append((name, values))
+    return params
+
+
+def task_list_key(request, page_size):
+    """Cache key of a task list page, None when pages are not cached."""
+    if not settings.TASK_LIST_CACHE_TIMEOUT:
+        return None
+    return make_key(
+        CACHE_NAME,
+        normalize_query(request),
+        page_size,
+        *get_versions(*LIST_MODELS),
+    )
+
+
+def get_cached_page(key):
+    if key is None:
+        return None
+    page = cache.get(key)
+    record_lookup(CACHE_NAME, page is not None)
+    return page
+
+
+def set_cached_page(key, page):
+    # A page read from a lagging replica may predate the versions in its
+    # key and would be served after the replica caught up
+    if key is not None and not reading_replica.get():
+        cache.set(key, page, settings.TASK_LIST_CACHE_TIMEOUT)
@@ -0,0 +1,114 @@
+"""Change log behind /tasks/changes/, read in commit order after a cursor.
+
+Rows are read in (txid, id) order and only once their transaction has
+ended, so a long transaction delays the rows after it but is never
+skipped; compact() deletes old rows, and older cursors expire.
+"""
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import BigIntegerField, Func, Q
+from django.utils import timezone
+
+from task_manager.tasks.models import Change
+
+# compact() turns the newest row it keeps into this marker
+EXPIRED = ''
+CURSOR_RE = re.compile(r'(\d+)-(\d+)')
+
+
+class CursorExpired(Exception):
+    """Changes after the cursor were deleted by compact()."""
+
+
+class OldestRunningTransaction(Func):
+    """Transactions with smaller ids have ended.
+
+    SQLite runs one writing transaction at a time, so the rows of the
+    others are committed in id order and all of them are read.
+    """
+    template = '9223372036854775807'
+    output_field = BigIntegerField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='txid_snapshot_xmin(txid_current_snapshot())',
+            **extra_context,
+        )
+
+
+def format_cursor(cursor):
+    return '{}-{}'.format(*cursor)
+
+
+def parse_cursor(value):
+    """(txid, id) of a cursor string; ValueError if it is not one."""
+    # Cursors from before transaction ids were logged were row ids
+    if value.isdigit():
+        raise CursorExpired
+    match = CURSOR_RE.fullmatch(value)
+    if match is None:
+        raise ValueError(value)
+    return int(match[1]), int(match[2])
+
+
+def after(cursor):
+    txid, pk = cursor
+    return Q(txid__gt=txid) | Q(txid=txid, id__gt=pk)
+
+
+def committed():
+    return Change.objects.filter(txid__lt=OldestRunningTransaction())
+
+
+def current_cursor():
+    """Cursor to take before downloading the full lists."""
+    last = committed().order_by('-txid', '-id').values_list(
+        'txid', 'id'
+    ).first()
+    return last or (0, 0)
+
+
+def read(since, limit):
+    """Changes after the cursor since, at most limit rows of the log.
+
+    Returns (cursor, {model label: {pk: deleted}}, more): the cursor of
+    the next request, the latest change of every object and whether more
+    rows follow.
+    """
+    rows = list(committed().filter(after(since)).order_by(
+        'txid', 'id'
+    ).values_list('txid', 'id', 'model', 'object_id', 'deleted')[:limit + 1])
+    if rows and rows[0][2] == EXPIRED:
+        raise CursorExpired
+    more = len(rows) > limit
+    rows = rows[:limit]
+    changes = defaultdict(dict)
+    for _, _, model, object_id, deleted in rows:
+        changes[model][object_id] = deleted
+    cursor = rows[-1][:2] if rows else since
+    return cursor, changes, more
+
+
+def compact(days=None):
+    """Deletes rows older than the retention window; returns the count.
+
+    The newest of them is kept as the EXPIRED marker, which read() finds
+    first for every cursor before it.
+    """
+    if days is None:
+        days = settings.CHANGE_LOG_RETENTION_DAYS
+    newest = committed().filter(
+        created_at__lt=timezone.now() - timedelta(days=days)
+    ).order_by('-txid', '-id').values_list('txid', 'id').first()
+    if newest is None:
+        return 0
+    txid, pk = newest
+    deleted = Change.objects.filter(
+        Q(txid__lt=txid) | Q(txid=txid, id__lt=pk)
+    ).delete()[0]
+    Change.objects.filter(pk=pk).update(model=EXPIRED)
+    return deleted
@@ -0,0 +1,258 @@
+"""Denormalized task counts on Status, Label and User.
+
+Signals keep ``Status.task_count``, ``Label.task_count`` and the
+``author_task_count`` and ``executor_task_count`` of User up to date
+with ``UPDATE ... SET n = n + delta`` inside the transaction that
+changes the task. Bulk operations that skip signals adjust the counts
+with move(), forget() and recount(); reconcile() recounts every row and
+is what ``manage.py reconcile_task_counts`` runs to fix drift.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import m2m_changed, pre_delete, pre_save
+
+from task_manager.labels.models import Label
+from task_manager.tasks.models import COUNTED_FIELDS, Task
+
+# Task field, counted model, counter field
+FK_COUNTERS = (
+    ('status', 'statuses.Status', 'task_count'),
+    ('author', 'users.User', 'author_task_count'),
+    ('executor', 'users.User', 'executor_task_count'),
+)
+LABEL_COUNTER = ('labels', 'labels.Label', 'task_count')
+
+_paused = ContextVar('counters_paused', default=False)
+
+
+def is_paused():
+    return _paused.get()
+
+
+@contextmanager
+def paused():
+    """Turns the signal handlers off for changes counted in bulk."""
+    token = _paused.set(True)
+    try:
+        yield
+    finally:
+        _paused.reset(token)
+
+
+def shift(field, delta):
+    # Counts stop at zero, so a drifted counter cannot fail the write
+    # that decrements it; reconcile() corrects it later
+    return Greatest(F(field) + delta, 0)
+
+
+def add_counts(model, counts):
+    """Applies {counter field: {pk: delta}} to model in one UPDATE."""
+    updates, pks = {}, set()
+    for field, deltas in counts.items():
+        deltas = {pk: delta for pk, delta in deltas.items()
+                  if pk is not None and delta}
+        if not deltas:
+            continue
+        pks.update(deltas)
+        updates[field] = shift(field, Case(
+            *(When(pk=pk, then=Value(delta))
+              for pk, delta in deltas.items()),
+            default=Value(0),
+        ))
+    if updates:
+        model.objects.filter(pk__in=pks).update(**updates)
+
+
+def add_fk_counts(rows):
+    """Applies (task field, target pk, delta) rows, one UPDATE per model."""
+    counters = {name: (global_apps.get_model(model_label), counter)
+                for name, model_label, counter in FK_COUNTERS}
+    counts = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+    for name, pk, delta in rows:
+        model, counter = counters[name]
+        counts[model][counter][pk] += delta
+    for model, model_counts in counts.items():
+        add_counts(model, model_counts)
+
+
+def count_saved_task(sender, instance, raw=False, update_fields=None,
+                     **kwargs):
+    """Moves the counts of the foreign keys the save changes.
+
+    Runs before the save, in a transaction with it, so the old values
+    are still in the database for tasks not loaded by from_db() and for
+    fixtures, which may replace existing rows.
+    """
+    if _paused.get():
+        return
+    names = [
+        name for name in COUNTED_FIELDS
+        if update_fields is None or name in update_fields
+        or f'{name}_id' in update_fields
+    ]
+    if not names:
+        return
+    old = {}
+    if raw or not instance._state.adding:
+        old = {} if raw else dict(getattr(instance, 'counted_ids', {}))
+        missing = [name for name in names if name not in old]
+        if missing:
+            row = Task.objects.filter(pk=instance.pk).values(
+                *(f'{name}_id' for name in missing)
+            ).first() or {}
+            old.update((name, row.get(f'{name}_id')) for name in missing)
+    rows = []
+    for name in names:
+        before, after = old.get(name), getattr(instance, f'{name}_id')
+        if before != after:
+            rows += [(name, before, -1), (name, after, 1)]
+    add_fk_counts(rows)
+    instance.counted_ids = {
+        name: getattr(instance, f'{name}_id') for name in COUNTED_FIELDS
+    }
+
+
+def count_deleted_task(sender, instance, **kwargs):
+    if _paused.get():
+        return
+    add_fk_counts(
+        (name, getattr(instance, f'{name}_id'), -1) for name in COUNTED_FIELDS
+    )
+    Label.objects.filter(task=instance).update(
+        task_count=shift('task_count', -1)
+    )
+
+
+def count_labels(sender, instance, action, reverse, pk_set, **kwargs):
+    if _paused.get():
+        return
+    if action in ('post_add', 'post_remove') and pk_set:
+        delta = 1 if action == 'post_add' else -1
+        if reverse:
+            add_counts(Label, {
+                'task_count': {instance.pk: delta * len(pk_set)},
+            })
+        else:
+            Label.objects.filter(pk__in=pk_set).update(
+                task_count=shift('task_count', delta)
+            )
+    elif action == 'pre_clear':
+        if reverse:
+            Label.objects.filter(pk=instance.pk).update(task_count=0)
+        else:
+            Label.objects.filter(task=instance).update(
+                task_count=shift('task_count', -1)
+            )
+
+
+def group_counts(queryset, *fields):
+    """[(*values, number of rows)] of queryset grouped by fields."""
+    return list(
+        queryset.order_by().values_list(*fields).annotate(count=Count('pk'))
+    )
+
+
+def move(tasks, field, value):
+    """Sets the foreign key of tasks, counters included."""
+    with transaction.atomic():
+        moved = group_counts(tasks.exclude(**{field: value}), field)
+        target = getattr(value, 'pk', value)
+        add_fk_counts([
+            *((field, pk, -count) for pk, count in moved),
+            (field, target, sum(count for _, count in moved)),
+        ])
+        return tasks.update(**{field: value})
+
+
+def forget(tasks):
+    """Takes the counts of tasks about to be deleted in bulk.
+
+    Delete them within ``paused()`` so the per-task handlers do not
+    subtract them a second time.
+    """
+    add_fk_counts(
+        (name, pk, -count)
+        for *pks, count in group_counts(tasks, *COUNTED_FIELDS)
+        for name, pk in zip(COUNTED_FIELDS, pks)
+    )
+    through = Task.labels.through.objects.filter(task__in=tasks)
+    add_counts(Label, {'task_count': {
+        pk: -count for pk, count in group_counts(through, 'label')
+    }})
+
+
+def get_counts(tasks):
+    through = Task.labels.through.objects.filter(task__in=tasks)
+    return group_counts(tasks, *COUNTED_FIELDS), group_counts(through, 'label')
+
+
+@contextmanager
+def recount(tasks):
+    """Adds the change of the counts of tasks made within the block.
+
+    tasks is a queryset matching the same rows before and after, e.g.
+    the names of an upsert. Only those rows are counted, twice.
+    """
+    before, labels_before = get_counts(tasks)
+    with paused():
+        yield
+    after, labels_after = get_counts(tasks)
+    add_fk_counts(
+        (name, pk, sign * count)
+        for sign, counts in ((-1, before), (1, after))
+        for *pks, count in counts
+        for name, pk in zip(COUNTED_FIELDS, pks)
+    )
+    labels = defaultdict(int)
+    for sign, counts in ((-1, labels_before), (1, labels_after)):
+        for pk, count in counts:
+            labels[pk] += sign * count
+    add_counts(Label, {'task_count': labels})
+
+
+def reconcile(dry_run=False, apps=global_apps):
+    """Recounts every counter; returns [(counter, rows fixed)].
+
+    ``apps`` lets data migrations pass their historical models.
+    """
+    task_model = apps.get_model('tasks', 'Task')
+    through = task_model._meta.get_field('labels').remote_field.through
+    results = []
+    for name, model_label, counter in (*FK_COUNTERS, LABEL_COUNTER):
+        model = apps.get_model(model_label)
+        if name == 'labels':
+            tasks = through.objects.filter(label=OuterRef('pk'))
+            group = 'label'
+        else:
+            tasks = task_model.objects.filter(**{name: OuterRef('pk')})
+            group = name
+        actual = Coalesce(Subquery(
+            tasks.order_by().values(group).annotate(count=Count('pk'))
+            .values('count')
+        ), 0)
+        drifted = model.objects.annotate(actual=actual).exclude(
+            **{counter: F('actual')}
+        )
+        fixed = drifted.count()
+        if fixed and not dry_run:
+            model.objects.filter(pk__in=drifted.values('pk')).update(
+                **{counter: actual}
+            )
+        results.append((f'{model._meta.label_lower}.{counter}', fixed))
+    return results
+
+
+def connect():
+    pre_save.connect(count_saved_task, sender=Task, dispatch_uid='counters')
+    pre_delete.connect(
+        count_deleted_task, sender=Task, dispatch_uid='counters'
+    )
+    m2m_changed.connect(
+        count_labels, sender=Task.labels.through, dispatch_uid='counters'
+    )
@@ -0,0 +1,201 @@
+"""Task events streamed to tasks/index.html as server-sent events.
+
+Each event is encoded once and queued for every page subscribed to the
+``TASK_EVENTS_BROKER`` of the process; the view needs the ASGI server.
+"""
+import asyncio
+import json
+import logging
+from functools import cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from task_manager.tasks import changes
+from task_manager.tasks.models import Task, TaskQuerySet
+
+# Events a page may fall behind by before it is told to reload
+QUEUE_SIZE = 100
+# Rows of the change log read per poll
+POLL_LIMIT = 1000
+HEARTBEAT = ': ping\n\n'
+RELOAD = 'event: reload\ndata: {}\n\n'
+
+logger = logging.getLogger(__name__)
+
+
+def encode(name, data):
+    data = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f'event: {name}\ndata: {data}\n\n'
+
+
+def load_events(changed):
+    """Encoded events of {task pk: deleted}, with the row data loaded."""
+    tasks = Task.objects.for_list().only(
+        *TaskQuerySet.list_fields, 'version'
+    ).in_bulk([pk for pk, deleted in changed.items() if not deleted])
+    events = []
+    for pk in sorted(changed):
+        task = tasks.get(pk)
+        if task is None:
+            events.append(encode('task', {'id': pk, 'action': 'delete'}))
+            continue
+        # The cells of a row of tasks/index.html, as the template renders
+        events.append(encode('task', {
+            'id': pk,
+            'action': 'create' if task.version == 1 else 'update',
+            'name': task.name,
+            'status': str(task.status),
+            'author': str(task.author),
+            'executor': str(task.executor),
+        }))
+    return events
+
+
+class Broker:
+    """Fans task changes out to the pages connected to this process."""
+    def __init__(self):
+        self.subscribers = set()
+        self.loop = None
+
+    def subscribe(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # A new event loop, e.g. after a test: the queues of the old
+            # one cannot be awaited here
+            self.subscribers.clear()
+            self.loop = loop
+        queue = asyncio.Queue(QUEUE_SIZE)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def publish(self, changed):
+        """Called by the model signals with {task pk: deleted}."""
+
+    def reload(self, queue):
+        """Drops the events queued for a page and tells it to reload."""
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RELOAD)
+
+    async def deliver(self, changed):
+        if not self.subscribers:
+            return
+        events = await sync_to_async(load_events)(changed)
+        for queue in list(self.subscribers):
+            for event in events:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # The page fell behind; it reloads instead
+                    self.reload(queue)
+                    break
+
+
+class LocalBroker(Broker):
+    """Fed by the signals of this process, so it misses other workers."""
+    def publish(self, changed):
+        # Signals run in worker threads, the queues in the event loop
+        if self.subscribers and self.loop and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(
+                self.loop.create_task, self.deliver(changed)
+            )
+
+
+class ChangeLogBroker(Broker):
+    """Polls the change log every worker writes, while it has subscribers."""
+    def __init__(self):
+        super().__init__()
+        self.poller = None
+
+    def subscribe(self):
+        queue = super().subscribe()
+        if self.poller is None or self.poller.done() or (
+            self.poller.get_loop() is not self.loop
+        ):
+            self.poller = self.loop.create_task(self.poll())
+        return queue
+
+    def unsubscribe(self, queue):
+        super().unsubscribe(queue)
+        if not self.subscribers and self.poller is not None:
+            self.poller.cancel()
+            self.poller = None
+
+    async def poll(self):
+        # The first read only takes the cursor, without waiting
+        cursor, more = None, True
+        while True:
+            if not more:
+                await asyncio.sleep(settings.TASK_EVENTS_POLL_INTERVAL)
+            try:
+                cursor, changed, more = await sync_to_async(self.read)(cursor)
+            except Exception:
+                # E.g. a dropped connection: the rows are read again
+                logger.exception('Could not read the change log')
+                more = False
+                continue
+            if not changed:
+                continue
+            try:
+                await self.deliver(changed)
+            except Exception:
+                # The changes are behind the cursor, so the pages reload
+                logger.exception('Could not deliver the task changes')
+                for queue in list(self.subscribers):
+                    self.reload(queue)
+
+    def read(self, cursor):
+        """(cursor, {task pk: deleted}, more) of the changes after cursor.
+
+        A cursor of None is replaced with the current one.
+        """
+        # No request cycle closes the connections of this thread
+        close_old_connections()
+        if cursor is None:
+            return changes.current_cursor(), {}, False
+        try:
+            cursor, changed, more = changes.read(cursor, POLL_LIMIT)
+        except changes.CursorExpired:
+            # Only if polling stalled for the whole retention window
+            return changes.current_cursor(), {}, False
+        return cursor, changed.get(Task._meta.label_lower, {}), more
+
+
+@cache
+def get_broker():
+    return import_string(settings.TASK_EVENTS_BROKER)()
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    if setting == 'TASK_EVENTS_BROKER':
+        get_broker.cache_clear()
+
+
+async def stream(broker):
+    """Encoded events for one page until it disconnects."""
+    queue = broker.subscribe()
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), settings.TASK_EVENTS_HEARTBEAT
+                )
+            except TimeoutError:
+                # A comment keeps proxies from closing the idle connection
+                # and lets the server notice clients that went away
+                yield HEARTBEAT
+                continue
+            yield event
+            if event is RELOAD:
+                return
+    finally:
+        broker.unsubscribe(queue)
@@ -2,18 +2,38 @@ import django_filters
 from django.forms.widgets import CheckboxInput
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.choices import CachedModelChoiceField
 from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import search
 from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+
+class CachedModelChoiceFilter(django_filters.ModelChoiceFilter):
+    field_class = CachedModelChoiceField
 
 
 class TaskFilter(django_filters.FilterSet):
+    search = django_filters.CharFilter(
+        label=_('Search'),
+        method='filter_search')
+
+    status = CachedModelChoiceFilter(
+        queryset=Status.objects.all(),
+        label=_('Status'))
+
+    executor = CachedModelChoiceFilter(
+        queryset=User.objects.all(),
+        label=_('Executor'))
+
     user_own_tasks = django_filters.BooleanFilter(
         label=_("Only my own tasks"),
         widget=CheckboxInput,
         method='filter_user_own_tasks',
     )
 
-    labels = django_filters.ModelChoiceFilter(
+    labels = CachedModelChoiceFilter(
         queryset=Label.objects.all(),
         label=_('Label'))
 
@@ -21,6 +41,14 @@ class TaskFilter(django_filters.FilterSet):
         model = Task
         fields = ['status', 'executor', 'labels']
 
+    def __init__(self, data=None, queryset=None, **kwargs):
+        if queryset is None:
+            queryset = Task.objects.for_list()
+        super().__init__(data, queryset, **kwargs)
+
+    def filter_search(self, queryset, name, value):
+        return search.search(queryset, value)
+
     def filter_user_own_tasks(self, queryset, name, value):
         if (value and hasattr(self, 'request') and
                 self.request.user.is_authenticated):
@@ -1,10 +1,120 @@
-from django.forms import ModelForm
+from django import forms
+from django.forms import ModelForm, ModelMultipleChoiceField
+from django.utils.translation import gettext_lazy as _
 
+from task_manager.choices import (
+    CachedModelChoiceField,
+    CachedModelMultipleChoiceField,
+)
+from task_manager.labels.models import Label
 from task_manager.mixins import FormStyleMixin
+from task_manager.statuses.models import Status
 from task_manager.tasks.models import Task
+from task_manager.users.models import User
 
 
 class TaskCreationForm(FormStyleMixin, ModelForm):
+    """Creates and updates tasks, writing only what the user changed.
+
+    ``version`` holds the version of the task the form was rendered
+    with, so an update is refused when someone saved the task since.
+    """
+    conflict_message = _(
+        'This task was changed by another user. '
+        'Reload the page to see the changes.'
+    )
+
+    version = forms.IntegerField(widget=forms.HiddenInput, required=False)
+
     class Meta:
         model = Task
-        fields = ['name', 'description', 'status', 'executor', 'labels']
\ No newline at end of file
+        fields = ['name', 'description', 'status', 'executor', 'labels']
+        field_classes = {
+            'status': CachedModelChoiceField,
+            'executor': CachedModelChoiceField,
+            'labels': CachedModelMultipleChoiceField,
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['version'].initial = self.instance.version
+
+    def clean(self):
+        cleaned_data = super().clean()
+        version = cleaned_data.get('version')
+        if (self.instance.pk and version is not None
+                and version != self.instance.version):
+            raise forms.ValidationError(
+                self.conflict_message, code='conflict'
+            )
+        return cleaned_data
+
+    def save(self, commit=True):
+        if commit and self.instance.pk and not self.has_changed():
+            return self.instance
+        return super().save(commit)
+
+    def _save_m2m(self):
+        # set() would read the links back only to find nothing to change
+        cleaned_data = self.cleaned_data
+        self.cleaned_data = {
+            name: value for name, value in cleaned_data.items()
+            if name in self.changed_data
+            or not isinstance(self.fields[name], ModelMultipleChoiceField)
+        }
+        try:
+            super()._save_m2m()
+        finally:
+            self.cleaned_data = cleaned_data
+
+
+class TaskIdsField(forms.MultipleChoiceField):
+    """Accepts any list of task ids without loading the tasks."""
+    widget = forms.MultipleHiddenInput
+
+    def valid_value(self, value):
+        return str(value).isdigit()
+
+    def clean(self, value):
+        return [int(pk) for pk in super().clean(value)]
+
+
+class TaskBulkForm(forms.Form):
+    ACTIONS = [
+        ('status', _('Change status')),
+        ('executor', _('Change executor')),
+        ('add_label', _('Add label')),
+        ('remove_label', _('Remove label')),
+        ('delete', _('Delete')),
+    ]
+    # Field each action needs a value for; an empty executor unassigns
+    REQUIRED_FIELDS = {
+        'status': 'status',
+        'add_label': 'label',
+        'remove_label': 'label',
+    }
+
+    action = forms.ChoiceField(choices=ACTIONS, label=_('Action'))
+    status = CachedModelChoiceField(
+        Status.objects.all(), required=False, label=_('Status')
+    )
+    executor = CachedModelChoiceField(
+        User.objects.all(), required=False, label=_('Executor')
+    )
+    label = CachedModelChoiceField(
+        Label.objects.all(), required=False, label=_('Label')
+    )
+    tasks = TaskIdsField(required=False)
+    select_all = forms.BooleanField(
+        required=False, label=_('All tasks matching the filter')
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        field = self.REQUIRED_FIELDS.get(cleaned_data.get('action'))
+        if field and not cleaned_data.get(field):
+            self.add_error(field, _('This field is required.'))
+        if not (cleaned_data.get('tasks') or cleaned_data.get('select_all')):
+            raise forms.ValidationError(_('Select at least one task.'))
+        return cleaned_data
\ No newline at end of file
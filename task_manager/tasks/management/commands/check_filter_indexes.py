@@ -0,0 +1,84 @@
+from itertools import combinations
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+FILTER_FIELDS = ('status', 'executor', 'labels', 'user_own_tasks')
+PAGE_SIZE = 50
+
+
+def classify_plan(plan, vendor, table=Task._meta.db_table):
+    """Returns 'index', 'primary key scan' or 'sequential scan'.
+
+    Only the access path for ``table`` is considered. A SQLite rowid scan
+    already in ``id`` order stops at the LIMIT, so it is not flagged.
+    """
+    lines = [line for line in plan.splitlines() if table in line]
+    if vendor == 'sqlite':
+        if any('SEARCH' in line for line in lines):
+            return 'index'
+        if 'TEMP B-TREE FOR ORDER BY' not in plan:
+            return 'primary key scan'
+        return 'sequential scan'
+    if vendor == 'postgresql':
+        if any('Seq Scan' in line for line in lines):
+            return 'sequential scan'
+        return 'index'
+    raise CommandError(f'Unsupported database vendor: {vendor}')
+
+
+class Command(BaseCommand):
+    help = (
+        'Explains the task list query for every TaskFilter combination '
+        'and reports whether it is served by an index. Run it against a '
+        'database with realistic data: planners prefer sequential scans '
+        'on small tables.'
+    )
+
+    def sample_data(self):
+        user = User.objects.order_by('id').first()
+        values = {
+            'status': Status.objects.values_list('id', flat=True).first(),
+            'executor': user and user.id,
+            'labels': Label.objects.values_list('id', flat=True).first(),
+            'user_own_tasks': 'on',
+        }
+        missing = [name for name, value in values.items() if value is None]
+        if missing:
+            raise CommandError(
+                f'Need at least one row for: {", ".join(missing)}'
+            )
+        return values, SimpleNamespace(user=user)
+
+    def explain(self, data, request):
+        filterset = TaskFilter(data, request=request)
+        queryset = filterset.qs.order_by('id')[:PAGE_SIZE + 1]
+        return queryset.explain()
+
+    def handle(self, *args, **options):
+        values, request = self.sample_data()
+        unindexed = 0
+        for size in range(len(FILTER_FIELDS) + 1):
+            for fields in combinations(FILTER_FIELDS, size):
+                data = {field: values[field] for field in fields}
+                plan = self.explain(data, request)
+                result = classify_plan(plan, connection.vendor)
+                name = ' + '.join(fields) or '(no filter)'
+                line = f'{name:<45} {result}'
+                if result == 'sequential scan':
+                    unindexed += 1
+                    self.stdout.write(self.style.WARNING(line))
+                else:
+                    self.stdout.write(self.style.SUCCESS(line))
+                if options['verbosity'] > 1:
+                    self.stdout.write(plan)
+        self.stdout.write(
+            f'{unindexed} combination(s) fall back to a sequential scan.'
+        )
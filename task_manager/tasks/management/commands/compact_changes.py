@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from task_manager.tasks import changes
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes change log rows older than the retention window. Clients '
+        'with older cursors download the full task list again.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.CHANGE_LOG_RETENTION_DAYS,
+            help='Days of changes to keep (default: '
+                 'CHANGE_LOG_RETENTION_DAYS).',
+        )
+
+    def handle(self, *args, **options):
+        deleted = changes.compact(options['days'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{deleted} change(s) older than {options["days"]} day(s) deleted'
+        ))
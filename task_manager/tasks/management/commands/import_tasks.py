@@ -0,0 +1,186 @@
+import csv
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from task_manager.cache import bump_version
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters
+from task_manager.tasks.bulk import batched
+from task_manager.tasks.models import Change, Task
+from task_manager.users.models import User
+
+FORMATS = ('csv', 'jsonl')
+
+
+def parse_labels(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [name.strip() for name in value if name.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports tasks from CSV or JSON Lines with columns name, '
+        'description, status, executor (username), author (username) and '
+        'labels (comma-separated names or a JSON list). Tasks whose name '
+        'already exists are updated and their labels replaced.'
+    )
+    stealth_options = ('stdin',)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Input file, or "-" to read standard input.'
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Input format; detected from the file extension if omitted.',
+        )
+        parser.add_argument(
+            '--author',
+            help='Username used for rows without an author column.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--create-missing', action='store_true',
+            help='Create statuses and labels that do not exist yet.',
+        )
+
+    def get_format(self, path, fmt):
+        if fmt:
+            return fmt
+        for name in FORMATS:
+            if path.endswith(f'.{name}'):
+                return name
+        raise CommandError('Cannot detect the format, use --format.')
+
+    def read_rows(self, stream, fmt):
+        if fmt == 'csv':
+            return list(csv.DictReader(stream))
+        return [json.loads(line) for line in stream if line.strip()]
+
+    def load_rows(self, options):
+        fmt = self.get_format(options['path'], options['format'])
+        if options['path'] == '-':
+            return self.read_rows(options.get('stdin', sys.stdin), fmt)
+        with open(options['path'], newline='', encoding='utf-8') as stream:
+            return self.read_rows(stream, fmt)
+
+    def resolve(self, model, field, names, create=False):
+        """Maps names to pks with one query, creating missing rows."""
+        names = set(names)
+        found = dict(model.objects.filter(
+            **{f'{field}__in': names}
+        ).values_list(field, 'id'))
+        missing = names - set(found)
+        if missing and create:
+            model.objects.bulk_create(
+                [model(**{field: name}) for name in missing],
+                ignore_conflicts=True,
+            )
+            bump_version(model._meta.label_lower)
+            return self.resolve(model, field, names)
+        if missing:
+            raise CommandError(
+                f'Unknown {model._meta.model_name} {field}: '
+                f'{", ".join(sorted(missing))}'
+            )
+        return found
+
+    def build_tasks(self, rows, default_author, create):
+        statuses = self.resolve(
+            Status, 'name', (row['status'] for row in rows), create
+        )
+        labels = self.resolve(Label, 'name', (
+            name for row in rows for name in parse_labels(row.get('labels'))
+        ), create)
+        users = self.resolve(User, 'username', (
+            username for row in rows
+            for username in (row.get('author') or default_author,
+                             row.get('executor'))
+            if username
+        ))
+
+        # The last row wins when a name repeats within the input
+        tasks = {}
+        for row in rows:
+            task = Task(
+                name=row['name'],
+                description=row.get('description') or '',
+                status_id=statuses[row['status']],
+                author_id=users[row.get('author') or default_author],
+                executor_id=users.get(row.get('executor')),
+            )
+            task.label_ids = [
+                labels[name] for name in parse_labels(row.get('labels'))
+            ]
+            tasks[task.name] = task
+        return list(tasks.values())
+
+    def validate(self, rows, default_author):
+        for number, row in enumerate(rows, start=1):
+            for column in ('name', 'status'):
+                if not row.get(column):
+                    raise CommandError(f'Row {number}: {column} is required')
+            if not (row.get('author') or default_author):
+                raise CommandError(
+                    f'Row {number}: author is required, or pass --author'
+                )
+
+    def save_batch(self, tasks):
+        existing = set(Task.objects.filter(
+            name__in=[task.name for task in tasks]
+        ).values_list('pk', flat=True))
+        Task.objects.bulk_create(
+            tasks,
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['description', 'status', 'executor'],
+        )
+        through = Task.labels.through
+        task_ids = [task.pk for task in tasks]
+        # The upsert cannot increment versions, so the updated tasks get
+        # theirs here; created tasks keep version 1
+        Task.objects.filter(pk__in=existing).update(
+            updated_at=timezone.now(), version=F('version') + 1
+        )
+        Change.objects.log(
+            Task, (pk for pk in task_ids if pk not in existing)
+        )
+        through.objects.filter(task_id__in=task_ids).delete()
+        through.objects.bulk_create([
+            through(task_id=task.pk, label_id=label_id)
+            for task in tasks for label_id in task.label_ids
+        ], ignore_conflicts=True)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = self.load_rows(options)
+        self.validate(rows, options['author'])
+
+        with transaction.atomic():
+            tasks = self.build_tasks(
+                rows, options['author'], options['create_missing']
+            )
+            for batch in batched(tasks, options['batch_size']):
+                # Upserts may move existing tasks, so the counts of the
+                # batch are taken before and after
+                names = [task.name for task in batch]
+                with counters.recount(Task.objects.filter(name__in=names)):
+                    self.save_batch(batch)
+        bump_version(Task._meta.label_lower)
+
+        elapsed = time.perf_counter() - started
+        rate = len(rows) / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {len(tasks)} tasks from {len(rows)} rows '
+            f'in {elapsed:.2f}s ({rate:.0f} rows/s)'
+        ))
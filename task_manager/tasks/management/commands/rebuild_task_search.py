@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from task_manager.tasks import search
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-creates the task full-text search index and its sync triggers '
+        'if they are missing, then re-indexes every task.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        started = time.perf_counter()
+        with transaction.atomic(using=connection.alias):
+            rebuilt = search.rebuild(connection)
+        if not rebuilt:
+            raise CommandError(
+                f'Full-text search is not supported on {connection.vendor}; '
+                'TaskFilter falls back to icontains.'
+            )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the task search index in {elapsed:.2f}s'
+        ))
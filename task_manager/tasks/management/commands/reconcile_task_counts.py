@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.tasks import counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Recounts the task counters of statuses, labels and users and '
+        'fixes rows that drifted, e.g. after writes that skipped signals.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report the rows that would be fixed.',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        with transaction.atomic():
+            results = counters.reconcile(dry_run=dry_run)
+        verb = 'would fix' if dry_run else 'fixed'
+        for counter, fixed in results:
+            self.stdout.write(f'{counter}: {verb} {fixed} row(s)')
+        total = sum(fixed for _, fixed in results)
+        style = self.style.WARNING if total and dry_run else self.style.SUCCESS
+        self.stdout.write(style(f'{total} drifted row(s) {verb}'))
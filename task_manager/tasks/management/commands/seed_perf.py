@@ -0,0 +1,148 @@
+import random
+import time
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from task_manager.cache import bump_version
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters
+from task_manager.tasks.bulk import batched
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+WORDS = [
+    'wall', 'winter', 'dragon', 'throne', 'castle', 'north', 'raven', 'sword',
+    'crown', 'army', 'gold', 'ship', 'harbor', 'siege', 'council', 'night',
+    'watch', 'forest', 'river', 'tower', 'bridge', 'letter', 'feast',
+    'tournament', 'banner', 'horse', 'road', 'map', 'spy', 'oath',
+]
+
+
+def zipf_weights(count, exponent=1.1):
+    """Cumulative weights where rank n is picked ~1/n**exponent often."""
+    return list(accumulate(1 / rank ** exponent
+                           for rank in range(1, count + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates synthetic users, statuses, labels and tasks for '
+        'performance testing. Statuses, executors and labels follow a '
+        'skewed (Zipf) distribution, so a few labels cover most tasks. '
+        'Rows are added next to existing data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--statuses', type=int, default=10)
+        parser.add_argument('--labels', type=int, default=100)
+        parser.add_argument('--tasks', type=int, default=1_000_000)
+        parser.add_argument(
+            '--max-labels', type=int, default=3,
+            help='Upper bound of labels per task.',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed, for reproducible data sets.',
+        )
+
+    def next_number(self, model):
+        return (model.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+
+    def create_users(self, count):
+        start = self.next_number(User)
+        # Hashing once keeps a million-row seed from spending minutes
+        # in the password hasher; every perf user has password "perf".
+        password = make_password('perf')
+        return User.objects.bulk_create([
+            User(
+                username=f'perf_user_{number}',
+                first_name=self.random.choice(WORDS).title(),
+                last_name=f'Perf{number}',
+                password=password,
+            )
+            for number in range(start, start + count)
+        ], batch_size=self.batch_size)
+
+    def create_named(self, model, prefix, count):
+        start = self.next_number(model)
+        return model.objects.bulk_create([
+            model(name=f'{prefix} {number}')
+            for number in range(start, start + count)
+        ], batch_size=self.batch_size)
+
+    def make_task(self, number, statuses, users, author):
+        choices = self.random.choices
+        executor = choices(users, cum_weights=self.user_weights)[0]
+        return Task(
+            name=f'Perf task {number}',
+            description=' '.join(choices(WORDS, k=12)),
+            status=choices(statuses, cum_weights=self.status_weights)[0],
+            author=author,
+            executor=executor if self.random.random() > 0.1 else None,
+        )
+
+    def pick_labels(self, labels):
+        count = self.random.randint(0, self.max_labels)
+        return set(self.random.choices(
+            labels, cum_weights=self.label_weights, k=count
+        ))
+
+    def create_tasks(self, count, statuses, labels, users):
+        through = Task.labels.through
+        start = self.next_number(Task)
+        created = 0
+        for numbers in batched(range(start, start + count), self.batch_size):
+            with transaction.atomic():
+                tasks = Task.objects.bulk_create([
+                    self.make_task(
+                        number, statuses, users, self.random.choice(users)
+                    )
+                    for number in numbers
+                ])
+                through.objects.bulk_create([
+                    through(task_id=task.pk, label_id=label.pk)
+                    for task in tasks for label in self.pick_labels(labels)
+                ])
+            created += len(tasks)
+            self.stdout.write(f'{created}/{count} tasks', ending='\r')
+            self.stdout.flush()
+        self.stdout.write('')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.max_labels = options['max_labels']
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            users = self.create_users(options['users'])
+            statuses = self.create_named(
+                Status, 'Perf status', options['statuses']
+            )
+            labels = self.create_named(
+                Label, 'Perf label', options['labels']
+            )
+        self.user_weights = zipf_weights(len(users))
+        self.status_weights = zipf_weights(len(statuses))
+        self.label_weights = zipf_weights(len(labels))
+        self.create_tasks(options['tasks'], statuses, labels, users)
+        with transaction.atomic():
+            counters.reconcile()
+
+        # bulk_create() skips the signals that invalidate cached pages
+        for model in (User, Status, Label, Task):
+            bump_version(model._meta.label_lower)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(users)} users, {len(statuses)} statuses, '
+            f'{len(labels)} labels and {options["tasks"]} tasks '
+            f'in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,37 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from task_manager.tasks import search
+
+
+class CreateTrigramExtension(TrigramExtension):
+    """Creates pg_trgm unless it exists; keeps it when rolled back.
+
+    Dropping it needs the same rights as creating it, other tables may
+    use it, and SQLite has no pg_extension to look it up in.
+    """
+    def database_backwards(self, *args, **kwargs):
+        pass
+
+
+def install_search(apps, schema_editor):
+    if search.install(schema_editor.connection):
+        search.rebuild(schema_editor.connection)
+
+
+def uninstall_search(apps, schema_editor):
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_indexes'),
+    ]
+
+    operations = [
+        # Creating an extension needs superuser or database owner rights;
+        # without them, create pg_trgm out of band before migrating
+        CreateTrigramExtension(),
+        migrations.RunPython(install_search, uninstall_search),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from task_manager.tasks import counters
+
+
+def count_tasks(apps, schema_editor):
+    counters.reconcile(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labels', '0002_label_task_count'),
+        ('statuses', '0002_status_task_count'),
+        ('tasks', '0004_task_search'),
+        ('users', '0002_user_task_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(count_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:58
+
+from django.db import migrations, models
+from django.db.models import F
+
+from task_manager.tasks import search
+
+
+def set_updated_at(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(updated_at=F('created_at'))
+
+
+def reinstall_search(apps, schema_editor):
+    # SQLite adds the columns by rebuilding the table, which drops the
+    # triggers that keep the full-text index up to date
+    search.install(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(set_updated_at, migrations.RunPython.noop),
+        migrations.RunPython(reinstall_search, migrations.RunPython.noop),
+    ]
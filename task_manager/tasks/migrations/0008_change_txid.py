@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:43
+
+from django.db import migrations, models
+
+import task_manager.tasks.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='change',
+            name='txid',
+            field=models.BigIntegerField(db_default=task_manager.tasks.models.TransactionId()),
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['txid', 'id'], name='change_txid_id_idx'),
+        ),
+    ]
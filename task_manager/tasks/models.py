@@ -1,10 +1,79 @@
-from django.db import models
+from itertools import islice
+
+from django.db import DatabaseError, models, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 from task_manager.users.models import User
 
+USER_NAME_FIELDS = ('first_name', 'last_name')
+# Foreign keys whose targets count their tasks, see tasks/counters.py
+COUNTED_FIELDS = ('status', 'author', 'executor')
+# Written by every update of a task, see Task.save()
+VERSION_FIELDS = ('updated_at', 'version')
+# Rows of the change log written per INSERT
+LOG_BATCH_SIZE = 1000
+
+
+class StaleTaskError(DatabaseError):
+    """The task was changed or deleted after it was loaded."""
+
+
+class TaskQuerySet(models.QuerySet):
+    """Query shapes matching the columns each task template renders."""
+    list_fields = (
+        'id', 'name', 'created_at', 'status__name',
+        *(f'author__{field}' for field in USER_NAME_FIELDS),
+        *(f'executor__{field}' for field in USER_NAME_FIELDS),
+    )
+    list_related = ('status', 'author', 'executor')
+    detail_related = ('status', 'author', 'executor')
+    detail_prefetch = ('labels',)
+    api_related = ('status', 'author', 'executor')
+    api_prefetch = (
+        models.Prefetch('labels', queryset=Label.objects.only('id', 'name')),
+    )
+    admin_related = ('status', 'author', 'executor')
+    admin_prefetch = api_prefetch
+
+    def for_list(self):
+        """Rows of tasks/index.html: FK names in one JOINed query."""
+        return (self.select_related(*self.list_related)
+                .only(*self.list_fields))
+
+    def for_detail(self):
+        """tasks/detail.html: FK names joined, labels in one query."""
+        return (self.select_related(*self.detail_related)
+                .prefetch_related(*self.detail_prefetch))
+
+    def for_api(self):
+        """JSON rows: FK names joined, label names prefetched."""
+        return (self.select_related(*self.api_related)
+                .prefetch_related(*self.api_prefetch))
+
+    def for_admin(self):
+        """TaskAdmin rows: FK names joined, label names prefetched."""
+        return (self.select_related(*self.admin_related)
+                .prefetch_related(*self.admin_prefetch))
+
+    def update(self, **kwargs):
+        """Updates the rows as new versions of the tasks, as save() does.
+
+        update() sends no signals, so the tasks are logged as changed
+        here, before the update can move them out of the queryset.
+        """
+        kwargs.setdefault('updated_at', timezone.now())
+        kwargs.setdefault('version', F('version') + 1)
+        with transaction.atomic(using=self.db, savepoint=False):
+            Change.objects.using(self.db).log(
+                self.model,
+                self.values_list('pk', flat=True).iterator(LOG_BATCH_SIZE),
+            )
+            return super().update(**kwargs)
+
 
 class Task(models.Model):
     name = models.CharField(
@@ -24,12 +93,14 @@ class Task(models.Model):
     author = models.ForeignKey(
         User,
         on_delete=models.PROTECT,
+        db_index=False,
         verbose_name=_('Author'),
         related_name='author',
     )
     status = models.ForeignKey(
         Status,
         on_delete=models.PROTECT,
+        db_index=False,
         verbose_name=_('Status'),
     )
     executor = models.ForeignKey(
@@ -37,6 +108,7 @@ class Task(models.Model):
         blank=True,
         null=True,
         on_delete=models.PROTECT,
+        db_index=False,
         verbose_name=_('Executor'),
         related_name='executor',
     )
@@ -46,10 +118,162 @@ class Task(models.Model):
         verbose_name=_('Labels'),
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = TaskQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        # Loaded foreign keys, so a save can tell which counters changed
+        task.counted_ids = {
+            name: task.__dict__[f'{name}_id'] for name in COUNTED_FIELDS
+            if f'{name}_id' in task.__dict__
+        }
+        task.remember_loaded_values()
+        return task
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using, fields, **kwargs)
+        self.remember_loaded_values(fields)
+
+    def remember_loaded_values(self, fields=None):
+        """Records the values of fields as the row has them."""
+        values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (fields is None or field.name in fields
+                 or field.attname in fields)
+        }
+        if fields is not None:
+            values = {**getattr(self, 'loaded_values', {}), **values}
+        self.loaded_values = values
+
+    def get_changed_fields(self):
+        """Names of the fields changed since the task was loaded."""
+        missing = object()
+        return [
+            field.name for field in self._meta.concrete_fields
+            if not field.primary_key
+            and field.name not in VERSION_FIELDS
+            and field.attname in self.__dict__
+            and self.__dict__[field.attname]
+            != self.loaded_values.get(field.attname, missing)
+        ]
+
+    def save(self, *args, **kwargs):
+        """Saves the task; updates write only the changed fields.
+
+        An update also sets ``updated_at`` and increments ``version``. If
+        the task was loaded with its version, the UPDATE matches that
+        version too, and StaleTaskError is raised when another save got
+        there first, instead of overwriting its changes.
+        """
+        update_fields = kwargs.get('update_fields')
+        self._expected_version = None
+        refresh_version = False
+        if not self._state.adding and update_fields != []:
+            loaded = getattr(self, 'loaded_values', {})
+            if update_fields is None and loaded:
+                update_fields = self.get_changed_fields()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *VERSION_FIELDS}
+            if 'version' in loaded:
+                self._expected_version = loaded['version']
+                self.version = self._expected_version + 1
+            else:
+                self.version = F('version') + 1
+                refresh_version = True
+        # Counters change in a pre_save signal, so they commit or roll
+        # back together with the row
+        try:
+            with transaction.atomic(using=kwargs.get('using'),
+                                    savepoint=False):
+                super().save(*args, **kwargs)
+        except StaleTaskError:
+            self.version = self._expected_version
+            raise
+        self.remember_loaded_values(kwargs.get('update_fields'))
+        if refresh_version:
+            self.refresh_from_db(fields=['version'])
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields,
+                   forced_update):
+        expected_version = getattr(self, '_expected_version', None)
+        if expected_version is None:
+            return super()._do_update(
+                base_qs, using, pk_val, values, update_fields, forced_update
+            )
+        base_qs = base_qs.filter(version=expected_version)
+        if not super()._do_update(
+            base_qs, using, pk_val, values, update_fields, forced_update
+        ):
+            raise StaleTaskError(
+                f'Task {pk_val} changed since version {expected_version}'
+            )
+        return True
 
     def __str__(self):
         return self.name
 
     class Meta:
         verbose_name = _('Task')
-        verbose_name_plural = _('Tasks')
\ No newline at end of file
+        verbose_name_plural = _('Tasks')
+        # FK lookups are served by the leading column of these indexes,
+        # each ending in id for the list ordering and keyset pagination.
+        indexes = [
+            models.Index(fields=['status', 'id'],
+                         name='task_status_id_idx'),
+            models.Index(fields=['executor', 'id'],
+                         name='task_executor_id_idx'),
+            models.Index(fields=['author', 'id'],
+                         name='task_author_id_idx'),
+            models.Index(fields=['status', 'executor', 'id'],
+                         name='task_status_executor_id_idx'),
+            models.Index(fields=['-created_at'],
+                         name='task_created_at_idx'),
+        ]
+
+
+class ChangeQuerySet(models.QuerySet):
+    def log(self, model, pks, deleted=False, batch_size=LOG_BATCH_SIZE):
+        """Records that the rows pks of model were saved or deleted."""
+        label = model._meta.label_lower
+        changes = (
+            Change(model=label, object_id=pk, deleted=deleted) for pk in pks
+        )
+        while batch := list(islice(changes, batch_size)):
+            self.bulk_create(batch)
+
+
+class TransactionId(models.Func):
+    """Id of the writing transaction on PostgreSQL, 0 on SQLite."""
+    template = '0'
+    output_field = models.BigIntegerField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template='txid_current()', **extra_context
+        )
+
+
+class Change(models.Model):
+    """A write to a task, status, label or user, see tasks/changes.py."""
+    model = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    txid = models.BigIntegerField(db_default=TransactionId())
+
+    objects = ChangeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'],
+                         name='change_created_at_idx'),
+            # The order rows are read in, see tasks/changes.py
+            models.Index(fields=['txid', 'id'],
+                         name='change_txid_id_idx'),
+        ]
\ No newline at end of file
@@ -0,0 +1,141 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+TABLE = 'tasks_task'
+FTS_TABLE = 'tasks_task_fts'
+
+# The database keeps these in sync with tasks_task, so bulk_create(),
+# update() and raw SQL writes are indexed as well as Task.save(). The
+# pg_trgm extension is created by migration 0004.
+POSTGRES_INSTALL = [
+    f"""ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector(
+            'simple', coalesce(name, '') || ' ' || coalesce(description, '')
+        )) STORED""",
+    f"""CREATE INDEX IF NOT EXISTS task_search_vector_idx
+        ON {TABLE} USING gin (search_vector)""",
+    f"""CREATE INDEX IF NOT EXISTS task_name_trgm_idx
+        ON {TABLE} USING gin (name gin_trgm_ops)""",
+]
+POSTGRES_UNINSTALL = [
+    'DROP INDEX IF EXISTS task_name_trgm_idx',
+    'DROP INDEX IF EXISTS task_search_vector_idx',
+    f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector',
+]
+POSTGRES_REBUILD = [
+    'REINDEX INDEX task_search_vector_idx',
+    'REINDEX INDEX task_name_trgm_idx',
+    f'ANALYZE {TABLE}',
+]
+
+SQLITE_INSTALL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, content='{TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+        AFTER INSERT ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+        AFTER DELETE ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF name, description ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END""",
+]
+SQLITE_UNINSTALL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+SQLITE_REBUILD = [
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')",
+]
+
+STATEMENTS = {
+    'postgresql': (POSTGRES_INSTALL, POSTGRES_UNINSTALL, POSTGRES_REBUILD),
+    'sqlite': (SQLITE_INSTALL, SQLITE_UNINSTALL, SQLITE_REBUILD),
+}
+
+
+def _execute(connection, index):
+    statements = STATEMENTS.get(connection.vendor)
+    if statements is None:
+        return False
+    with connection.cursor() as cursor:
+        for sql in statements[index]:
+            cursor.execute(sql)
+    return True
+
+
+def install(connection):
+    """Creates the search index and its sync machinery if missing.
+
+    Safe to run again, e.g. after a migration rebuilt tasks_task on
+    SQLite and dropped the triggers along with the old table.
+    """
+    return _execute(connection, 0)
+
+
+def uninstall(connection):
+    return _execute(connection, 1)
+
+
+def rebuild(connection):
+    """Re-creates missing parts and re-reads every task into the index."""
+    if not install(connection):
+        return False
+    return _execute(connection, 2)
+
+
+def get_terms(query):
+    return re.findall(r'\w+', query)
+
+
+def like_pattern(query):
+    escaped = re.sub(r'([\\%_])', r'\\\1', query.strip())
+    return f'%{escaped}%'
+
+
+def search(queryset, query):
+    """Filters tasks whose name or description matches every word.
+
+    Postgres matches whole words against the tsvector column and falls
+    back to a trigram-indexed substring match on the name. SQLite
+    matches word prefixes in the FTS5 table. Other databases scan with
+    icontains.
+    """
+    terms = get_terms(query)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return queryset.filter(RawSQL(
+            f'"{TABLE}"."search_vector" @@ plainto_tsquery(\'simple\', %s) '
+            f'OR "{TABLE}"."name" ILIKE %s',
+            [' '.join(terms), like_pattern(query)],
+            output_field=BooleanField(),
+        ))
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [match],
+        ))
+    condition = Q()
+    for term in terms:
+        condition &= Q(name__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition)
@@ -0,0 +1,97 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from task_manager.cache import bump_version
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, events
+from task_manager.tasks.models import Change, Task
+from task_manager.users.models import User
+
+# Saves that change nothing rendered on task pages
+IGNORED_UPDATES = {User: {'last_login'}}
+
+
+def is_ignored(sender, update_fields):
+    ignored = IGNORED_UPDATES.get(sender, set())
+    return bool(update_fields) and set(update_fields) <= ignored
+
+
+def bump_version_on_commit(name):
+    """Bumps the version now and again once the write commits.
+
+    Another worker may cache the old rows under the first bump before
+    the write is visible to it.
+    """
+    bump_version(name)
+    transaction.on_commit(partial(bump_version, name))
+
+
+def bump_model_version(sender, update_fields=None, **kwargs):
+    if not is_ignored(sender, update_fields):
+        bump_version_on_commit(sender._meta.label_lower)
+
+
+def bump_task_version(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version_on_commit(Task._meta.label_lower)
+
+
+def log_saved(sender, instance, update_fields=None, **kwargs):
+    if not is_ignored(sender, update_fields):
+        Change.objects.log(sender, [instance.pk])
+
+
+def log_deleted(sender, instance, **kwargs):
+    # Bulk deletes log their tasks in batches, see bulk.delete()
+    if not counters.is_paused():
+        Change.objects.log(sender, [instance.pk], deleted=True)
+
+
+def publish_task(sender, instance, signal, **kwargs):
+    if counters.is_paused():
+        return
+    transaction.on_commit(partial(
+        events.get_broker().publish, {instance.pk: signal is post_delete}
+    ))
+
+
+def log_task_labels(sender, instance, action, reverse, pk_set, **kwargs):
+    """Logs the tasks whose labels changed; the labels themselves did not."""
+    if action in ('post_add', 'post_remove') and pk_set:
+        Change.objects.log(Task, pk_set if reverse else [instance.pk])
+    elif action == 'pre_clear' and reverse:
+        Change.objects.log(
+            Task, instance.task_set.values_list('pk', flat=True)
+        )
+    elif action == 'post_clear' and not reverse:
+        Change.objects.log(Task, [instance.pk])
+
+
+def connect():
+    for model in (Task, Status, Label, User):
+        post_save.connect(
+            bump_model_version, sender=model, dispatch_uid='bump_version'
+        )
+        post_delete.connect(
+            bump_model_version, sender=model, dispatch_uid='bump_version'
+        )
+        post_save.connect(log_saved, sender=model, dispatch_uid='log_change')
+        post_delete.connect(
+            log_deleted, sender=model, dispatch_uid='log_change'
+        )
+    m2m_changed.connect(
+        bump_task_version,
+        sender=Task.labels.through,
+        dispatch_uid='bump_version',
+    )
+    post_save.connect(publish_task, sender=Task, dispatch_uid='publish')
+    post_delete.connect(publish_task, sender=Task, dispatch_uid='publish')
+    m2m_changed.connect(
+        log_task_labels,
+        sender=Task.labels.through,
+        dispatch_uid='log_change',
+    )
+    counters.connect()
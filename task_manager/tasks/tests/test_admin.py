@@ -0,0 +1,80 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.tasks.models import Task
+from task_manager.testing import QueryBudgetTestCase
+from task_manager.users.models import User
+
+TASKS = 100_000
+
+
+class TestTaskAdminChangelist(QueryBudgetTestCase):
+    query_budgets = {
+        # Session, user, statuses, the two selected filter objects,
+        # estimated count, page of tasks, labels of the page
+        'admin:tasks_task_changelist': 8,
+    }
+    url = reverse('admin:tasks_task_changelist')
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_perf', tasks=TASKS, users=200, labels=50, batch_size=5000,
+            stdout=StringIO(),
+        )
+        cls.admin = User.objects.create_superuser(
+            'admin', password='admin', first_name='Ad', last_name='Min',
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.admin)
+
+    def test_changelist_does_not_list_every_user_or_label(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), 100)
+        user = User.objects.filter(username__startswith='perf').last()
+        self.assertNotContains(response, f'author__id__exact={user.pk}')
+        self.assertContains(response, 'js/autocomplete_filter.js')
+
+    def test_filters_load_only_the_selected_objects(self):
+        task = Task.objects.order_by('id').first()
+        label = Label.objects.order_by('id').first()
+
+        response = self.client.get(self.url, {
+            'author__id__exact': task.author_id,
+            'labels__id__exact': label.pk,
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'value="{task.author_id}" selected')
+        self.assertContains(response, f'value="{label.pk}" selected')
+
+    def test_filter_choices_come_from_the_autocomplete_view(self):
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'tasks', 'model_name': 'task',
+            'field_name': 'executor', 'term': 'Perf',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['results'])
+
+    def test_search_uses_the_full_text_index(self):
+        old = Task.objects.order_by('id').first()
+        task = Task.objects.create(
+            name='Quarterly zeppelin audit', status=old.status,
+            author=old.author,
+        )
+
+        response = self.client.get(self.url, {'q': 'zeppelin'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['cl'].result_list), [task])
+        self.assertNotIn('LIKE', ' '.join(
+            sql for sql, _ in self.client.queries.queries
+        ))
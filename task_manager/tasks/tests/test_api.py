@@ -0,0 +1,75 @@
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+
+from task_manager.tasks.tests.testcase import TaskTestCase
+
+
+class TestTaskApi(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse_lazy('api:tasks')
+
+    def test_requires_authentication(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_lists_tasks(self):
+        self.client.force_login(self.user1)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['results']), self.task_count)
+        self.assertIsNone(data['next'])
+        task = data['results'][1]
+        self.assertEqual(task['name'], self.task2.name)
+        self.assertEqual(task['status']['name'], self.status1.name)
+        self.assertEqual(task['executor']['id'], self.user2.id)
+        self.assertEqual(
+            [label['id'] for label in task['labels']],
+            [self.label1.id, self.label2.id],
+        )
+
+    def test_filters_and_paginates(self):
+        self.add_tasks(5)
+        self.client.force_login(self.user1)
+        response = self.client.get(
+            self.url, {'executor': self.user2.id, 'page_size': 4}
+        )
+        data = response.json()
+        self.assertEqual(len(data['results']), 4)
+        self.assertIn(f'executor={self.user2.id}', data['next'])
+
+        data = self.client.get(data['next']).json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertTrue(all(
+            task['executor']['id'] == self.user2.id
+            for task in data['results']
+        ))
+
+    def test_invalid_filter(self):
+        self.client.force_login(self.user1)
+        response = self.client.get(self.url, {'status': 9999})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json()['errors'])
+
+    @override_settings(API_STREAM_CHUNK_SIZE=3)
+    def test_stream_reads_in_chunks(self):
+        self.add_tasks(7)
+        self.client.force_login(self.user1)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {'stream': '1'})
+            lines = b''.join(response.streaming_content).splitlines()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['id'] for row in rows],
+                         sorted(row['id'] for row in rows))
+        self.assertEqual(len(rows), self.task_count + 7)
+        label_queries = [query for query in context.captured_queries
+                         if 'labels_label' in query['sql']]
+        self.assertEqual(len(label_queries), 3)
@@ -0,0 +1,153 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from django.utils import timezone
+
+from task_manager.statuses.models import Status
+from task_manager.tasks import bulk, changes
+from task_manager.tasks.models import Change, Task
+from task_manager.tasks.tests.testcase import TaskTestCase
+
+
+class TestTaskChanges(TaskTestCase):
+    query_budgets = {
+        **TaskTestCase.query_budgets,
+        # Session, user, changes, tasks, their labels, statuses, users
+        'tasks:changes': 7,
+    }
+    url = reverse_lazy('tasks:changes')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user1)
+        self.cursor = self.client.get(self.url).json()['cursor']
+
+    def get_changes(self, cursor=None):
+        response = self.client.get(self.url, {'since': cursor or self.cursor})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_requires_authentication(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_returns_each_changed_object_once(self):
+        self.task1.name = 'Renamed'
+        self.task1.save()
+        self.task1.labels.add(self.label2)
+        deleted_pk = self.task2.pk
+        self.task2.delete()
+        status = Status.objects.create(name='Reopened')
+        self.user2.first_name = 'Aegon'
+        self.user2.save()
+
+        data = self.get_changes()
+
+        self.assertEqual([task['name'] for task in data['tasks']], ['Renamed'])
+        self.assertEqual(len(data['tasks'][0]['labels']), 2)
+        self.assertEqual(
+            data['statuses'], [{'id': status.pk, 'name': status.name}]
+        )
+        self.assertEqual(data['users'][0]['id'], self.user2.pk)
+        self.assertEqual(data['deleted']['tasks'], [deleted_pk])
+        self.assertFalse(data['more'])
+        self.assertEqual(self.get_changes(data['cursor'])['tasks'], [])
+
+    def test_bulk_writes_are_logged(self):
+        self.client.post(reverse_lazy('tasks:bulk'), {
+            'action': 'add_label', 'label': self.label2.pk,
+            'tasks': [self.task1.pk, self.task2.pk],
+        })
+        Task.objects.filter(pk=self.task2.pk).update(name='Moved')
+
+        data = self.get_changes()
+
+        self.assertEqual(
+            sorted(task['id'] for task in data['tasks']),
+            [self.task1.pk, self.task2.pk],
+        )
+
+    def test_bulk_delete_is_logged_once(self):
+        self.add_tasks(3)
+        ids = sorted(Task.objects.values_list('pk', flat=True))
+
+        with CaptureQueriesContext(connection) as context:
+            bulk.delete(Task.objects.all())
+
+        inserts = [query for query in context.captured_queries
+                   if query['sql'].startswith('INSERT INTO "tasks_change"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(sorted(self.get_changes()['deleted']['tasks']), ids)
+
+    def test_reads_at_most_max_changes(self):
+        self.add_tasks(3)
+
+        with patch('task_manager.tasks.api.MAX_CHANGES', 4):
+            first = self.get_changes()
+            second = self.get_changes(first['cursor'])
+
+        self.assertTrue(first['more'])
+        self.assertFalse(second['more'])
+        self.assertEqual(len(first['tasks']) + len(second['tasks']), 3)
+
+    def test_response_is_compact(self):
+        self.task1.save()
+
+        response = self.client.get(self.url, {'since': self.cursor})
+
+        self.assertNotIn(b', ', response.content)
+        self.assertNotIn(b'": ', response.content)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'since': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_row_id_cursor_expires(self):
+        response = self.client.get(self.url, {'since': '12'})
+        self.assertEqual(response.status_code, 410)
+
+    def test_compacted_cursor_expires(self):
+        for number in range(3):
+            self.task1.name = f'Task {number}'
+            self.task1.save()
+        *old, _ = Change.objects.order_by('txid', 'id')
+        Change.objects.filter(pk__in=[row.pk for row in old]).update(
+            created_at=timezone.now() - timedelta(days=31)
+        )
+
+        out = StringIO()
+        call_command('compact_changes', '--days', '30', stdout=out)
+
+        self.assertIn('deleted', out.getvalue())
+        response = self.client.get(self.url, {'since': self.cursor})
+        self.assertEqual(response.status_code, 410)
+        marker = Change.objects.get(model=changes.EXPIRED)
+        data = self.get_changes(
+            changes.format_cursor((marker.txid, marker.pk))
+        )
+        self.assertEqual(data['tasks'][0]['name'], 'Task 2')
+
+
+class TestChangeOrder(TaskTestCase):
+    def test_rows_are_read_in_transaction_order(self):
+        cursor = changes.current_cursor()
+        # On PostgreSQL a transaction may take a smaller id than one that
+        # started before it
+        late = Change.objects.create(
+            model='tasks.task', object_id=self.task1.pk, txid=cursor[0] + 2
+        )
+        early = Change.objects.create(
+            model='tasks.task', object_id=self.task2.pk, txid=cursor[0] + 1
+        )
+
+        cursor, changed, more = changes.read(cursor, 1)
+        self.assertEqual(cursor, (early.txid, early.pk))
+        self.assertEqual(changed['tasks.task'], {self.task2.pk: False})
+        self.assertTrue(more)
+        self.assertEqual(changes.read(cursor, 1)[0], (late.txid, late.pk))
@@ -0,0 +1,123 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from task_manager.labels.models import Label
+from task_manager.tasks import search
+from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.models import Change, Task
+from task_manager.tasks.tests.testcase import TaskTestCase
+from task_manager.users.models import User
+
+
+class TestCheckFilterIndexesCommand(TaskTestCase):
+    def test_reports_every_filter_combination(self):
+        out = StringIO()
+        call_command('check_filter_indexes', stdout=out)
+        lines = out.getvalue().splitlines()
+
+        self.assertEqual(len(lines), 17)
+        self.assertTrue(lines[0].startswith('(no filter)'))
+        status_line = next(line for line in lines
+                           if line.startswith('status '))
+        self.assertTrue(status_line.endswith('index'))
+        self.assertIn('0 combination(s)', lines[-1])
+
+
+class TestRebuildTaskSearchCommand(TaskTestCase):
+    def test_restores_dropped_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE {search.FTS_TABLE}')
+        call_command('rebuild_task_search', stdout=StringIO())
+        self.assertEqual(
+            list(TaskFilter({'search': 'throne'}).qs), [self.task2]
+        )
+
+
+class TestSeedPerfCommand(TaskTestCase):
+    def test_seeds_requested_volumes(self):
+        call_command(
+            'seed_perf', users=5, statuses=3, labels=10, tasks=120,
+            batch_size=50, stdout=StringIO(),
+        )
+        self.assertEqual(Task.objects.count(), self.task_count + 120)
+        self.assertEqual(Label.objects.filter(
+            name__startswith='Perf label'
+        ).count(), 10)
+        self.assertEqual(User.objects.filter(
+            username__startswith='perf_user_'
+        ).count(), 5)
+
+        counts = sorted(Label.objects.filter(
+            name__startswith='Perf label'
+        ).annotate(tasks=Count('task')).values_list('tasks', flat=True))
+        self.assertGreater(counts[-1], counts[0])
+
+
+class TestImportTasksCommand(TaskTestCase):
+    def import_csv(self, content, *args):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as file:
+            file.write(content)
+            file.flush()
+            out = StringIO()
+            call_command('import_tasks', file.name, *args, stdout=out)
+        return out.getvalue()
+
+    def test_imports_csv_in_batches(self):
+        feature = Label.objects.create(name='Feature')
+        rows = ''.join(
+            f'Imported {number},Text,{self.status1.name},'
+            f'{self.user2.username},"{self.label1.name}, {feature.name}"\n'
+            for number in range(20)
+        )
+        content = 'name,description,status,executor,labels\n' + rows
+
+        with CaptureQueriesContext(connection) as context:
+            out = self.import_csv(
+                content, '--author', self.user1.username, '--batch-size', '8'
+            )
+
+        self.assertIn('Imported 20 tasks', out)
+        self.assertEqual(set(Task.objects.filter(
+            name__startswith='Imported'
+        ).values_list('version', flat=True)), {1})
+        # A fixed number per batch, counters of the batch included
+        self.assertLess(len(context), 50)
+        task = Task.objects.get(name='Imported 7')
+        self.assertTrue(Change.objects.filter(
+            model='tasks.task', object_id=task.pk
+        ).exists())
+        self.assertEqual(task.author, self.user1)
+        self.assertEqual(task.executor, self.user2)
+        self.assertSetEqual(set(task.labels.all()), {self.label1, feature})
+        feature.refresh_from_db()
+        self.assertEqual(feature.task_count, 20)
+
+    def test_upserts_existing_names_from_stdin(self):
+        rows = [
+            {'name': self.task1.name, 'description': 'Updated',
+             'status': self.status1.name, 'author': self.user1.username,
+             'labels': ['Urgent']},
+        ]
+        stdin = StringIO('\n'.join(json.dumps(row) for row in rows))
+        call_command('import_tasks', '-', '--format', 'jsonl',
+                     '--create-missing', stdin=stdin, stdout=StringIO())
+
+        task = Task.objects.get(pk=self.task1.pk)
+        self.assertEqual(Task.objects.count(), self.task_count)
+        self.assertEqual(task.version, self.task1.version + 1)
+        self.assertGreater(task.updated_at, self.task1.updated_at)
+        self.assertEqual(task.description, 'Updated')
+        self.assertEqual(task.author, self.user2)
+        self.assertEqual(list(task.labels.all()),
+                         [Label.objects.get(name='Urgent')])
+
+    def test_unknown_status(self):
+        with self.assertRaisesMessage(CommandError, 'Unknown'):
+            self.import_csv('name,status\nTask,Missing\n',
+                            '--author', self.user1.username)
\ No newline at end of file
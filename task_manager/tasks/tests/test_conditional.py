@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse_lazy
+
+from task_manager.tasks.tests.testcase import TaskTestCase
+
+
+@override_settings(CACHE_SHARED=True)
+class TestConditionalGet(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user1)
+        self.url = reverse_lazy('tasks:index')
+
+    def assertNotModified(self, response):
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertFalse(response.templates)
+
+    def test_unchanged_page_is_not_rendered_again(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertIn('Cookie', response['Vary'])
+
+        response = self.client.get(
+            self.url, headers={'if-none-match': response['ETag']}
+        )
+
+        self.assertNotModified(response)
+        if not settings.ASYNC_VIEWS:
+            queried = ' '.join(sql for sql, _ in self.client.queries.queries)
+            self.assertNotIn('tasks_task', queried)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_no_validators_without_a_shared_cache(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_if_modified_since_is_ignored(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', response)
+
+        # A date that is not older than the change must not hide it
+        self.task1.name = 'Renamed'
+        self.task1.save()
+        response = self.client.get(self.url, headers={
+            'if-modified-since': 'Fri, 01 Jan 2100 00:00:00 GMT',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Renamed')
+
+    def test_changes_language_and_user_change_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.task1.name = 'Renamed'
+        self.task1.save()
+        changed = self.client.get(self.url, headers={'if-none-match': etag})
+        self.assertEqual(changed.status_code, 200)
+
+        etag = changed['ETag']
+        self.client.cookies[settings.LANGUAGE_COOKIE_NAME] = 'en'
+        english = self.client.get(self.url, headers={'if-none-match': etag})
+        self.assertEqual(english.status_code, 200)
+        self.assertNotEqual(english['ETag'], etag)
+
+        self.client.force_login(self.user2)
+        other = self.client.get(
+            self.url, headers={'if-none-match': english['ETag']}
+        )
+        self.assertEqual(other.status_code, 200)
+
+    def test_detail_and_other_lists(self):
+        for url in (
+            reverse_lazy('tasks:detail', args=[self.task1.pk]),
+            reverse_lazy('statuses:index'),
+            reverse_lazy('labels:index'),
+            reverse_lazy('users:index'),
+        ):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                response = self.client.get(
+                    url, headers={'if-none-match': etag}
+                )
+                self.assertNotModified(response)
+
+    def test_task_counts_change_status_list_etag(self):
+        url = reverse_lazy('statuses:index')
+        etag = self.client.get(url)['ETag']
+
+        self.task1.delete()
+
+        response = self.client.get(url, headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_pending_messages_are_rendered(self):
+        etag = self.client.get(self.url)['ETag']
+        # Denied, so no task changes, but an error message is queued
+        self.client.post(reverse_lazy('tasks:delete', args=[self.task1.pk]))
+
+        response = self.client.get(self.url, headers={'if-none-match': etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'alert')
@@ -0,0 +1,111 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse_lazy
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters
+from task_manager.tasks.models import Task
+from task_manager.tasks.tests.testcase import TaskTestCase
+
+
+class TestTaskCounters(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user1)
+        self.status2 = Status.objects.get(pk=2)
+
+    def assertCountsMatch(self):
+        drift = [row for row in counters.reconcile(dry_run=True) if row[1]]
+        self.assertEqual(drift, [])
+
+    def test_fixtures_are_counted(self):
+        self.status1.refresh_from_db()
+        self.label1.refresh_from_db()
+        self.assertEqual(self.status1.task_count, 2)
+        self.assertEqual(self.label1.task_count, 2)
+        self.assertCountsMatch()
+
+    def test_create_update_and_delete_views(self):
+        self.client.post(reverse_lazy('tasks:create'), self.valid_task_data)
+        self.assertCountsMatch()
+        task = Task.objects.get(name=self.valid_task_data['name'])
+        self.client.post(reverse_lazy('tasks:update', args=[task.pk]), {
+            **self.valid_task_data,
+            'status': self.status2.id,
+            'executor': self.user2.id,
+            'labels': [self.label2.id],
+        })
+        self.assertCountsMatch()
+        self.client.post(reverse_lazy('tasks:delete', args=[task.pk]))
+        self.assertCountsMatch()
+
+    def test_bulk_actions(self):
+        url = reverse_lazy('tasks:bulk')
+        tasks = [self.task1.id, self.task2.id]
+        for data in (
+            {'action': 'status', 'status': self.status2.id},
+            {'action': 'executor', 'executor': self.user1.id},
+            {'action': 'add_label', 'label': self.label2.id},
+            {'action': 'remove_label', 'label': self.label1.id},
+        ):
+            self.client.post(url, {**data, 'tasks': tasks})
+            self.assertCountsMatch()
+        self.client.post(url, {'action': 'delete', 'tasks': [self.task2.id]})
+        self.assertFalse(Task.objects.filter(pk=self.task2.id).exists())
+        self.assertCountsMatch()
+
+    def test_import_counts_only_imported_tasks(self):
+        feature = Label.objects.create(name='Feature')
+        rows = [
+            {'name': self.task1.name, 'status': self.status2.name,
+             'author': self.user2.username, 'labels': [feature.name]},
+            {'name': 'Imported', 'status': self.status1.name,
+             'author': self.user1.username, 'executor': self.user2.username,
+             'labels': [self.label1.name, feature.name]},
+        ]
+        stdin = StringIO('\n'.join(json.dumps(row) for row in rows))
+
+        call_command('import_tasks', '-', '--format', 'jsonl',
+                     stdin=stdin, stdout=StringIO())
+
+        self.assertCountsMatch()
+
+    def test_reverse_label_changes(self):
+        label = Label.objects.create(name='Reverse')
+        label.task_set.add(self.task1, self.task2)
+        label.task_set.remove(self.task1)
+        self.assertCountsMatch()
+        label.task_set.clear()
+        self.assertCountsMatch()
+
+    def test_save_of_loaded_row_keeps_counter(self):
+        status = Status.objects.get(pk=self.status1.pk)
+        self.task1.status = self.status2
+        self.task1.save()
+        status.name = 'Renamed'
+        status.save()
+        status.refresh_from_db()
+        self.assertEqual(status.task_count, 1)
+
+    def test_reconcile_command_fixes_drift(self):
+        Status.objects.update(task_count=9)
+        out = StringIO()
+        call_command('reconcile_task_counts', stdout=out)
+        self.assertIn('statuses.status.task_count: fixed 2 row(s)',
+                      out.getvalue())
+        self.assertCountsMatch()
+
+    def test_list_pages_show_counts(self):
+        response = self.client.get(reverse_lazy('statuses:index'))
+        counts = {status.pk: status.task_count
+                  for status in response.context['statuses']}
+        self.assertEqual(counts[self.status1.pk], 2)
+        response = self.client.get(reverse_lazy('users:index'))
+        user = next(user for user in response.context['users']
+                    if user.pk == self.user1.pk)
+        self.assertEqual(
+            (user.author_task_count, user.executor_task_count), (1, 1)
+        )
@@ -0,0 +1,206 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.db import OperationalError
+from django.test import AsyncRequestFactory, override_settings
+from django.urls import reverse_lazy
+
+from task_manager.tasks import bulk, changes, events
+from task_manager.tasks.models import Task
+from task_manager.tasks.tests.testcase import TaskTestCase
+from task_manager.tasks.views import TaskEventsView
+
+
+def decode(event):
+    name, data = event.strip().split('\n')
+    data = json.loads(data.removeprefix('data: '))
+    return name.removeprefix('event: '), data
+
+
+class TestTaskEvents(TaskTestCase):
+    query_budgets = {
+        **TaskTestCase.query_budgets,
+        'tasks:events': 2,
+    }
+    url = reverse_lazy('tasks:events')
+
+    async def get(self, user):
+        request = AsyncRequestFactory().get(self.url)
+        request.auser = sync_to_async(lambda: user)
+        return await TaskEventsView.as_view()(request)
+
+    def test_not_streamed_under_wsgi(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+        self.client.force_login(self.user1)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 204)
+
+    async def test_anonymous_user_is_refused(self):
+        response = await self.get(AnonymousUser())
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(TASK_EVENTS_HEARTBEAT=0.01)
+    async def test_idle_stream_sends_heartbeats(self):
+        response = await self.get(self.user1)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        content = aiter(response.streaming_content)
+        try:
+            self.assertEqual(await anext(content), events.HEARTBEAT.encode())
+        finally:
+            await content.aclose()
+
+    def test_signals_publish_after_commit(self):
+        deleted_pk = self.task2.pk
+        with (
+            patch.object(events.get_broker(), 'publish') as publish,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.task1.save()
+            self.task2.delete()
+            self.assertFalse(publish.called)
+
+        self.assertEqual(
+            [call.args for call in publish.call_args_list],
+            [({self.task1.pk: False},), ({deleted_pk: True},)],
+        )
+
+    def test_bulk_delete_publishes_once(self):
+        ids = [self.task1.pk, self.task2.pk]
+        with (
+            patch.object(events.get_broker(), 'publish') as publish,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            bulk.delete(Task.objects.filter(pk__in=ids))
+
+        publish.assert_called_once_with(dict.fromkeys(ids, True))
+
+    def test_load_events(self):
+        self.task1.name = 'Renamed'
+        self.task1.save()
+
+        loaded = events.load_events({
+            self.task1.pk: False, self.task2.pk: False, 9999: True,
+        })
+
+        self.assertEqual([decode(event) for event in loaded], [
+            ('task', {
+                'id': self.task1.pk,
+                'action': 'update',
+                'name': 'Renamed',
+                'status': str(self.task1.status),
+                'author': str(self.task1.author),
+                'executor': str(self.task1.executor),
+            }),
+            ('task', {
+                'id': self.task2.pk,
+                'action': 'create',
+                'name': self.task2.name,
+                'status': str(self.task2.status),
+                'author': str(self.task2.author),
+                'executor': str(self.task2.executor),
+            }),
+            ('task', {'id': 9999, 'action': 'delete'}),
+        ])
+
+    async def test_events_are_fanned_out_to_every_page(self):
+        broker = events.LocalBroker()
+        streams = [events.stream(broker), events.stream(broker)]
+        received = [asyncio.ensure_future(anext(s)) for s in streams]
+        await asyncio.sleep(0)
+        self.assertEqual(len(broker.subscribers), 2)
+
+        await broker.deliver({9999: True})
+
+        first, second = await asyncio.gather(*received)
+        self.assertIs(first, second)
+        self.assertEqual(decode(first)[1], {'id': 9999, 'action': 'delete'})
+        for stream in streams:
+            await stream.aclose()
+        self.assertFalse(broker.subscribers)
+
+    async def test_page_that_falls_behind_reloads(self):
+        broker = events.LocalBroker()
+        stream = events.stream(broker)
+        received = asyncio.ensure_future(anext(stream))
+        with patch('task_manager.tasks.events.QUEUE_SIZE', 1):
+            await asyncio.sleep(0)
+
+        # Both are queued before the page reads the first one
+        await broker.deliver({9998: True, 9999: True})
+
+        self.assertEqual(await received, events.RELOAD)
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertFalse(broker.subscribers)
+
+    @override_settings(TASK_EVENTS_POLL_INTERVAL=0.01)
+    async def test_change_log_broker_reads_other_workers_changes(self):
+        broker = events.ChangeLogBroker()
+        stream = events.stream(broker)
+        received = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        self.assertIsNotNone(broker.poller)
+        # Let the poller take its cursor before the change is logged
+        await asyncio.sleep(0.05)
+
+        self.task1.name = 'Renamed'
+        await sync_to_async(self.task1.save)()
+
+        name, data = decode(await asyncio.wait_for(received, 5))
+        self.assertEqual(name, 'task')
+        self.assertEqual(data['name'], 'Renamed')
+        await stream.aclose()
+        self.assertIsNone(broker.poller)
+
+    @override_settings(TASK_EVENTS_POLL_INTERVAL=0.01)
+    async def test_change_log_broker_survives_read_errors(self):
+        read = changes.read
+        errors = [OperationalError('server closed the connection')]
+
+        def read_once_failing(*args):
+            if errors:
+                raise errors.pop()
+            return read(*args)
+
+        broker = events.ChangeLogBroker()
+        with (
+            patch.object(changes, 'read', read_once_failing),
+            self.assertLogs('task_manager.tasks.events', 'ERROR'),
+        ):
+            stream = events.stream(broker)
+            received = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0.05)
+            self.assertEqual(errors, [])
+
+            self.task1.name = 'Renamed'
+            await sync_to_async(self.task1.save)()
+
+            name, data = decode(await asyncio.wait_for(received, 5))
+        self.assertEqual(data['name'], 'Renamed')
+        self.assertFalse(broker.poller.done())
+        await stream.aclose()
+
+    @override_settings(TASK_EVENTS_POLL_INTERVAL=0.01)
+    async def test_pages_reload_when_changes_cannot_be_delivered(self):
+        broker = events.ChangeLogBroker()
+        stream = events.stream(broker)
+        received = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+
+        with (
+            patch.object(events, 'load_events', side_effect=OperationalError),
+            self.assertLogs('task_manager.tasks.events', 'ERROR'),
+        ):
+            self.task1.name = 'Renamed'
+            await sync_to_async(self.task1.save)()
+
+            self.assertEqual(
+                await asyncio.wait_for(received, 5), events.RELOAD
+            )
+        await stream.aclose()
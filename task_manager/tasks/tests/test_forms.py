@@ -1,3 +1,11 @@
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from task_manager.choices import CachedModelChoiceField
+from task_manager.statuses.models import Status
+from task_manager.tasks.filters import TaskFilter
 from task_manager.tasks.forms import TaskCreationForm
 from task_manager.tasks.models import Task
 from task_manager.tasks.tests.testcase import TaskTestCase
@@ -56,4 +64,109 @@ class TestTaskCreationForm(TaskTestCase):
         duplicate_data = self.valid_task_data.copy()
         form2 = TaskCreationForm(data=duplicate_data)
         self.assertFalse(form2.is_valid())
-        self.assertIn('name', form2.errors)
\ No newline at end of file
+        self.assertIn('name', form2.errors)
+
+
+@override_settings(CACHE_SHARED=True)
+class TestCachedChoices(TaskTestCase):
+    def render_queries(self, form):
+        with CaptureQueriesContext(connection) as context:
+            html = form.as_p()
+        return html, len(context)
+
+    def test_form_and_filter_share_choices(self):
+        _, queries = self.render_queries(TaskCreationForm())
+        self.assertGreater(queries, 0)
+
+        html, queries = self.render_queries(TaskFilter().form)
+        self.assertEqual(queries, 0)
+        self.assertIn(str(self.user1), html)
+        self.assertIn(self.label2.name, html)
+
+    def test_save_refreshes_choices(self):
+        self.render_queries(TaskCreationForm())
+        Status.objects.create(name='Reopened')
+
+        html, queries = self.render_queries(TaskCreationForm())
+        self.assertGreater(queries, 0)
+        self.assertIn('Reopened', html)
+
+    def test_selected_value_is_rendered(self):
+        form = TaskCreationForm(instance=self.task2)
+        html = str(form['executor'])
+        self.assertIn(f'value="{self.user2.pk}" selected', html)
+
+    def test_filtered_querysets_are_cached_apart(self):
+        field = CachedModelChoiceField(Status.objects.all(), empty_label=None)
+        filtered = CachedModelChoiceField(
+            Status.objects.filter(pk=self.status1.pk), empty_label=None
+        )
+        self.assertEqual(len(field.choices), Status.objects.count())
+        self.assertEqual(
+            [label for _, label in filtered.choices], [self.status1.name]
+        )
+
+    @override_settings(CACHE_SHARED=False)
+    def test_choices_are_queried_without_a_shared_cache(self):
+        self.render_queries(TaskCreationForm())
+        html, queries = self.render_queries(TaskCreationForm())
+        self.assertGreater(queries, 0)
+        self.assertIn(str(self.user1), html)
+
+
+class TestTaskUpdateForm(TaskTestCase):
+    def get_data(self, task, **changes):
+        return {
+            'name': task.name,
+            'description': task.description,
+            'status': task.status_id,
+            'executor': task.executor_id or '',
+            'labels': [label.pk for label in task.labels.all()],
+            'version': task.version,
+            **changes,
+        }
+
+    def save_queries(self, task, data):
+        form = TaskCreationForm(data=data, instance=task)
+        self.assertTrue(form.is_valid(), form.errors)
+        with CaptureQueriesContext(connection) as context:
+            form.save()
+        return [query['sql'] for query in context]
+
+    def test_unchanged_form_writes_nothing(self):
+        queries = self.save_queries(self.task1, self.get_data(self.task1))
+
+        self.assertEqual(queries, [])
+
+    def test_unchanged_labels_are_not_rewritten(self):
+        queries = self.save_queries(
+            self.task2, self.get_data(self.task2, name='Renamed')
+        )
+
+        self.assertFalse(
+            [sql for sql in queries if 'tasks_task_labels' in sql]
+        )
+        self.assertEqual(Task.objects.get(pk=self.task2.pk).version, 2)
+
+    def test_changed_labels_make_a_new_version(self):
+        queries = self.save_queries(
+            self.task2, self.get_data(self.task2, labels=[self.label1.pk])
+        )
+
+        self.assertFalse([
+            sql for sql in queries
+            if sql.startswith('INSERT INTO "tasks_task_labels"')
+        ])
+        task = Task.objects.get(pk=self.task2.pk)
+        self.assertEqual(task.version, 2)
+        self.assertEqual(list(task.labels.all()), [self.label1])
+
+    def test_stale_version_is_refused(self):
+        data = self.get_data(self.task1, name='Renamed')
+        Task.objects.filter(pk=self.task1.pk).update(description='Changed')
+
+        task = Task.objects.get(pk=self.task1.pk)
+        form = TaskCreationForm(data=data, instance=task)
+
+        self.assertFalse(form.is_valid())
+        self.assertTrue(form.has_error(NON_FIELD_ERRORS, 'conflict'))
\ No newline at end of file
@@ -0,0 +1,82 @@
+import json
+import tempfile
+
+from django.test import override_settings
+from django.urls import reverse_lazy
+
+from task_manager import metrics
+from task_manager.snapshots import snapshot_path
+from task_manager.tasks.tests.testcase import TaskTestCase
+
+
+class TestMetrics(TaskTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings = override_settings(
+            METRICS_ENABLED=True,
+            METRICS_DIR=self.directory,
+            METRICS_FLUSH_INTERVAL=0,
+            METRICS_TOKEN=None,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(self.clear_values)
+        self.clear_values()
+        super().setUp()
+        self.client.force_login(self.user1)
+
+    def clear_values(self):
+        for values in metrics._values.values():
+            values.clear()
+
+    def scrape(self, **headers):
+        response = self.client.get(reverse_lazy('metrics'), headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode().splitlines()
+
+    def test_counts_requests_by_url_name_and_status(self):
+        self.client.get(reverse_lazy('tasks:index'))
+        self.client.get(reverse_lazy('tasks:detail', args=[999]))
+        lines = self.scrape()
+
+        self.assertIn(
+            'task_manager_requests_total'
+            '{method="GET",status="200",view="tasks:index"} 1', lines
+        )
+        self.assertIn(
+            'task_manager_requests_total'
+            '{method="GET",status="404",view="tasks:detail"} 1', lines
+        )
+        self.assertIn(
+            '# TYPE task_manager_db_duration_seconds histogram', lines
+        )
+        self.assertTrue(any(
+            line.startswith('task_manager_template_duration_seconds_count'
+                            '{view="tasks:index"} 1')
+            for line in lines
+        ))
+
+    def test_sums_snapshots_of_other_workers(self):
+        self.client.get(reverse_lazy('tasks:index'))
+        other = {
+            'counters': {
+                'requests_total|method=GET|status=200|view=tasks:index': 4,
+            },
+            'histograms': {},
+        }
+        path = snapshot_path(self.directory, metrics.SNAPSHOT_PREFIX, pid=1)
+        path.write_text(json.dumps(other))
+        lines = self.scrape()
+        self.assertIn(
+            'task_manager_requests_total'
+            '{method="GET",status="200",view="tasks:index"} 5', lines
+        )
+        self.assertIn('task_manager_worker_requests_total{pid="1"} 4', lines)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_is_required_when_configured(self):
+        response = self.client.get(reverse_lazy('metrics'))
+        self.assertEqual(response.status_code, 401)
+        self.scrape(Authorization='Bearer secret')
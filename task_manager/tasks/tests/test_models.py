@@ -1,6 +1,8 @@
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 
-from task_manager.tasks.models import Task
+from task_manager.tasks.models import StaleTaskError, Task
 from task_manager.tasks.tests.testcase import TaskTestCase
 
 
@@ -45,4 +47,50 @@ class TestTaskModel(TaskTestCase):
                 name=self.valid_task_data['name'],
                 status=self.status1,
                 author=self.user2,
-            )
\ No newline at end of file
+            )
+
+
+class TestTaskVersions(TaskTestCase):
+    def test_update_writes_only_changed_fields(self):
+        self.task1.description = 'Hold the gate.'
+
+        with CaptureQueriesContext(connection) as context:
+            self.task1.save()
+
+        updates = [query['sql'] for query in context
+                   if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"description"', updates[0])
+        self.assertNotIn('"name"', updates[0])
+        self.assertEqual(self.task1.version, 2)
+        self.assertGreater(self.task1.updated_at, self.task1.created_at)
+
+    def test_stale_update_is_refused(self):
+        stale = Task.objects.get(pk=self.task1.pk)
+        self.task1.name = 'Renamed'
+        self.task1.save()
+
+        stale.description = 'Lost update'
+        with self.assertRaises(StaleTaskError), transaction.atomic():
+            stale.save()
+
+        self.assertEqual(stale.version, 1)
+        task = Task.objects.get(pk=self.task1.pk)
+        self.assertEqual(task.name, 'Renamed')
+        self.assertEqual(task.description, self.task1.description)
+        self.assertEqual(task.version, 2)
+
+    def test_queryset_update_makes_a_new_version(self):
+        Task.objects.filter(pk=self.task1.pk).update(name='Renamed')
+
+        self.task1.description = 'Lost update'
+        with self.assertRaises(StaleTaskError), transaction.atomic():
+            self.task1.save()
+
+    def test_task_loaded_without_version(self):
+        task = Task.objects.for_list().get(pk=self.task1.pk)
+        task.name = 'Renamed'
+        task.save()
+
+        self.assertEqual(task.version, 2)
+        self.assertEqual(Task.objects.get(pk=task.pk).version, 2)
\ No newline at end of file
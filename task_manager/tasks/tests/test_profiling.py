@@ -0,0 +1,63 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse_lazy
+
+from task_manager import profiling
+from task_manager.tasks.tests.testcase import TaskTestCase
+
+
+class TestProfilingMiddleware(TaskTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            PROFILING_SAMPLE_RATE=1.0,
+            PROFILING_DIR=directory.name,
+            PROFILING_FLUSH_INTERVAL=0,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(profiling.reset)
+        profiling.reset()
+        super().setUp()
+        self.client.force_login(self.user1)
+
+    def test_records_sql_and_template_time_per_view(self):
+        self.client.get(reverse_lazy('tasks:index'))
+        self.client.get(reverse_lazy('tasks:index'))
+
+        stats = profiling.report()['tasks:index']
+        self.assertEqual(stats['count'], 2)
+        self.assertGreater(stats['queries'], 0)
+        self.assertGreater(stats['sql_ms'], 0)
+        self.assertGreater(stats['template_ms'], 0)
+        self.assertGreaterEqual(
+            stats['wall_ms'], stats['sql_ms'] + stats['template_ms']
+        )
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_disabled_by_default(self):
+        self.client.get(reverse_lazy('tasks:index'))
+        self.assertEqual(profiling.report(), {})
+
+    def test_report_endpoint_is_staff_only(self):
+        self.client.get(reverse_lazy('tasks:index'))
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.client.get(reverse_lazy('perf'))
+        self.assertEqual(response.status_code, 403)
+
+        self.user1.is_staff = True
+        self.user1.save()
+        response = self.client.get(reverse_lazy('perf'))
+        self.assertIn('tasks:index', response.json()['views'])
+
+    def test_perf_report_command(self):
+        self.client.get(reverse_lazy('tasks:detail', args=[self.task1.id]))
+        out = StringIO()
+        call_command('perf_report', '--json', '--reset', stdout=out)
+        self.assertIn('tasks:detail', json.loads(out.getvalue()))
+        self.assertEqual(profiling.report(), {})
@@ -0,0 +1,87 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse_lazy
+
+from task_manager.replicas import ReplicaRouter
+from task_manager.statuses.models import Status
+from task_manager.users import auth
+from task_manager.users.models import User
+
+REPLICA = 'replica1'
+
+
+@override_settings(
+    DATABASE_REPLICAS=[REPLICA],
+    DATABASE_ROUTERS=['task_manager.replicas.ReplicaRouter'],
+)
+@skipUnless(connection.vendor == 'sqlite', 'uses the SQLite backup API')
+class TestReplicaRouting(TransactionTestCase):
+    """The test database is the primary, a SQLite file the replica.
+
+    Each test starts with the replica as a copy of the primary, taken
+    after the fixtures were loaded; later writes are not replicated.
+    """
+    fixtures = ['test_users.json', 'test_statuses.json']
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'replica.sqlite3')
+        super().setUpClass()
+        # Added after the test runner set up its databases, which would
+        # otherwise try to create a test database for the alias
+        connections.settings[REPLICA] = {
+            **connections.settings['default'], 'NAME': cls.path,
+        }
+        cls.databases = {*cls.databases, REPLICA}
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        cls.directory.cleanup()
+
+    def setUp(self):
+        auth.clear()
+        self.client.force_login(User.objects.get(pk=1))
+        connections[REPLICA].close()
+        with closing(sqlite3.connect(self.path)) as replica:
+            connection.connection.backup(replica)
+
+    def get_status_names(self):
+        response = self.client.get(reverse_lazy('statuses:index'))
+        self.assertEqual(response.status_code, 200)
+        return {status.name for status in response.context['statuses']}
+
+    def test_safe_requests_read_from_replica(self):
+        Status.objects.create(name='Not replicated yet')
+        names = self.get_status_names()
+        self.assertIn('In progress', names)
+        self.assertNotIn('Not replicated yet', names)
+
+    def test_writes_go_to_primary_and_stick(self):
+        self.client.post(
+            reverse_lazy('statuses:create'), {'name': 'Just created'}
+        )
+        self.assertTrue(Status.objects.filter(name='Just created').exists())
+        self.assertFalse(
+            Status.objects.using(REPLICA).filter(name='Just created').exists()
+        )
+        self.assertIn('Just created', self.get_status_names())
+
+        del self.client.cookies[settings.REPLICA_STICKY_COOKIE]
+        self.assertNotIn('Just created', self.get_status_names())
+
+    def test_only_primary_is_migrated(self):
+        router = ReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'tasks'))
+        self.assertFalse(router.allow_migrate(REPLICA, 'tasks'))
@@ -0,0 +1,54 @@
+from django.template import Context, Template
+from django.test import SimpleTestCase
+from django.urls import reverse_lazy
+from django.utils import translation
+
+from task_manager.tasks.tests.testcase import TaskTestCase
+from task_manager.templatetags import fragments
+
+
+class TestFragmentTag(SimpleTestCase):
+    template = Template(
+        '{% load fragments %}'
+        '{% fragment "test" flag %}{{ value }}{% endfragment %}'
+    )
+
+    def setUp(self):
+        fragments.clear()
+        self.addCleanup(fragments.clear)
+
+    def render(self, **context):
+        return self.template.render(Context(context))
+
+    def test_renders_once_per_language_and_vary_value(self):
+        with translation.override('en'):
+            self.assertEqual(self.render(flag=True, value='a'), 'a')
+            self.assertEqual(self.render(flag=True, value='b'), 'a')
+            self.assertEqual(self.render(flag=False, value='c'), 'c')
+        with translation.override('ru'):
+            self.assertEqual(self.render(flag=True, value='d'), 'd')
+
+
+class TestCachedNavbar(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        fragments.clear()
+        self.addCleanup(fragments.clear)
+
+    def test_navbar_follows_login_state_and_keeps_csrf_per_request(self):
+        url = reverse_lazy('users:index')
+        anonymous = self.client.get(url)
+        self.assertNotContains(anonymous, reverse_lazy('tasks:index'))
+
+        self.client.force_login(self.user1)
+        first = self.client.get(url)
+        self.assertContains(first, reverse_lazy('tasks:index'))
+        self.client.logout()
+        self.client.force_login(self.user2)
+        second = self.client.get(url)
+
+        self.assertContains(second, reverse_lazy('tasks:index'))
+        self.assertNotEqual(
+            first.context['csrf_token'], second.context['csrf_token']
+        )
+        self.assertContains(second, str(second.context['csrf_token']))
@@ -1,7 +1,24 @@
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.db import connection
+from django.http import Http404
+from django.test import AsyncRequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 
-from task_manager.tasks.models import Task
+from task_manager.cache import get_stats, get_versions
+from task_manager.labels.models import Label
+from task_manager.replicas import reading_replica
+from task_manager.statuses.models import Status
+from task_manager.tasks.cache import CACHE_NAME
+from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.models import StaleTaskError, Task
 from task_manager.tasks.tests.testcase import TaskTestCase
+from task_manager.tasks.views import AsyncTaskDetailView, AsyncTaskListView
 
 
 class TestTaskListView(TaskTestCase):
@@ -54,6 +71,26 @@ class TestTaskFilters(TaskTestCase):
         expected_tasks = set(Task.objects.filter(labels=self.label1))
         self.assertEqual(tasks, expected_tasks)
 
+    def test_search_matches_word_prefixes(self):
+        response = self.client.get(
+            reverse_lazy('tasks:index'), {'search': 'wildl castl'}
+        )
+        self.assertEqual(list(response.context['tasks']), [self.task1])
+
+    def test_search_follows_updates_and_bulk_writes(self):
+        Task.objects.filter(pk=self.task1.pk).update(name='Dragonstone')
+        Task.objects.bulk_create([Task(
+            name='Winterfell', description='Dragon eggs',
+            status=self.status1, author=self.user1,
+        )])
+        tasks = TaskFilter({'search': 'dragon'}).qs
+        self.assertEqual(
+            sorted(task.name for task in tasks),
+            ['Dragonstone', 'Winterfell'],
+        )
+        self.task2.delete()
+        self.assertFalse(TaskFilter({'search': 'throne'}).qs.exists())
+
     def test_task_filter_by_user_own_tasks(self):
         response = self.client.get(
             reverse_lazy('tasks:index'),
@@ -65,6 +102,202 @@ class TestTaskFilters(TaskTestCase):
         self.assertEqual(tasks, expected_tasks)
 
 
+class TestTaskQueryCount(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user1)
+
+    def test_list_query_count_is_constant(self):
+        self.assertQueriesDoNotGrow(
+            reverse_lazy('tasks:index'), lambda: self.add_tasks(10)
+        )
+
+    def test_detail_query_count_ignores_labels(self):
+        self.assertQueriesDoNotGrow(
+            reverse_lazy('tasks:detail', kwargs={'pk': self.task2.id}),
+            lambda: self.task2.labels.add(*Label.objects.bulk_create(
+                Label(name=f'Label {number}') for number in range(10)
+            )),
+        )
+
+
+class TestTaskPagination(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user1)
+        self.add_tasks(60)
+        self.url = reverse_lazy('tasks:index')
+
+    def test_pages_follow_cursors(self):
+        response = self.client.get(self.url)
+        first_page = list(response.context['tasks'])
+        self.assertEqual(len(first_page), 50)
+        self.assertTrue(response.context['is_paginated'])
+        self.assertNotIn('previous_page_query', response.context)
+
+        response = self.client.get(
+            f"{self.url}?{response.context['next_page_query']}"
+        )
+        second_page = list(response.context['tasks'])
+        self.assertEqual(len(second_page), self.task_count + 10)
+        self.assertGreater(second_page[0].id, first_page[-1].id)
+        self.assertNotIn('next_page_query', response.context)
+
+        response = self.client.get(
+            f"{self.url}?{response.context['previous_page_query']}"
+        )
+        self.assertEqual(list(response.context['tasks']), first_page)
+
+    def test_cursor_keeps_filter(self):
+        response = self.client.get(self.url, {'executor': self.user2.id})
+        query = response.context['next_page_query']
+        self.assertIn(f'executor={self.user2.id}', query)
+
+        response = self.client.get(f'{self.url}?{query}')
+        self.assertTrue(all(
+            task.executor == self.user2 for task in response.context['tasks']
+        ))
+
+    def test_page_does_not_count_rows(self):
+        response = self.client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(
+                f"{self.url}?{response.context['next_page_query']}"
+            )
+        self.assertFalse(any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ))
+
+    @override_settings(PAGINATION_APPROXIMATE_COUNT=True)
+    def test_approximate_count(self):
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response.context['page_obj'].count, Task.objects.count()
+        )
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(self.url, {'cursor': 'broken'})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(TASK_LIST_CACHE_TIMEOUT=300)
+class TestTaskListCache(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user1)
+        self.url = reverse_lazy('tasks:index')
+
+    def task_queries(self, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params)
+        queries = [query['sql'] for query in context.captured_queries
+                   if 'FROM "tasks_task"' in query['sql']]
+        return response, queries
+
+    def test_repeated_request_is_served_from_cache(self):
+        stats = get_stats(CACHE_NAME)
+        self.task_queries()
+        response, queries = self.task_queries()
+
+        self.assertEqual(queries, [])
+        self.assertEqual(len(response.context['tasks']), self.task_count)
+        self.assertEqual(get_stats(CACHE_NAME), {
+            'hits': stats['hits'] + 1,
+            'misses': stats['misses'] + 1,
+        })
+
+    def test_save_invalidates_cache(self):
+        self.task_queries()
+        self.status1.name = 'Renamed'
+        self.status1.save()
+
+        response, queries = self.task_queries()
+        self.assertNotEqual(queries, [])
+        self.assertContains(response, 'Renamed')
+
+    def test_version_is_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task1.labels.add(self.label2)
+            (version,) = get_versions(Task._meta.label_lower)
+
+        self.assertGreater(get_versions(Task._meta.label_lower)[0], version)
+
+    def test_own_tasks_are_cached_per_user(self):
+        self.task_queries({'user_own_tasks': 'on'})
+        self.client.force_login(self.user2)
+        response, queries = self.task_queries({'user_own_tasks': 'on'})
+
+        self.assertNotEqual(queries, [])
+        self.assertEqual(list(response.context['tasks']), [self.task1])
+
+    def test_pages_read_from_a_replica_are_not_stored(self):
+        token = reading_replica.set(True)
+        try:
+            self.task_queries()
+            response, queries = self.task_queries()
+        finally:
+            reading_replica.reset(token)
+
+        self.assertNotEqual(queries, [])
+        self.assertEqual(len(response.context['tasks']), self.task_count)
+
+    @override_settings(TASK_LIST_CACHE_TIMEOUT=0)
+    def test_disabled_cache_is_not_read(self):
+        stats = get_stats(CACHE_NAME)
+        self.task_queries()
+        response, queries = self.task_queries()
+
+        self.assertNotEqual(queries, [])
+        self.assertEqual(get_stats(CACHE_NAME), stats)
+
+
+class TestAsyncTaskViews(TaskTestCase):
+    async def get(self, view, user, params=None, **kwargs):
+        request = AsyncRequestFactory().get('/tasks/', params)
+        request.auser = sync_to_async(lambda: user)
+        request._messages = CookieStorage(request)
+        response = await view.as_view()(request, **kwargs)
+        if hasattr(response, 'render'):
+            await sync_to_async(response.render)()
+        return response
+
+    async def test_list_filters_tasks(self):
+        response = await self.get(
+            AsyncTaskListView, self.user1, {'executor': self.user2.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data['tasks'], [self.task2])
+        self.assertContains(response, self.task2.name)
+
+    @override_settings(TASK_LIST_CACHE_TIMEOUT=300)
+    async def test_list_pages_are_cached(self):
+        stats = await sync_to_async(get_stats)(CACHE_NAME)
+        await self.get(AsyncTaskListView, self.user1)
+        response = await self.get(AsyncTaskListView, self.user1)
+
+        self.assertEqual(len(response.context_data['tasks']), self.task_count)
+        self.assertEqual(await sync_to_async(get_stats)(CACHE_NAME), {
+            'hits': stats['hits'] + 1,
+            'misses': stats['misses'] + 1,
+        })
+
+    async def test_list_redirects_anonymous_user(self):
+        response = await self.get(AsyncTaskListView, AnonymousUser())
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, reverse_lazy('login'))
+
+    async def test_detail_renders_labels(self):
+        response = await self.get(
+            AsyncTaskDetailView, self.user1, pk=self.task2.id
+        )
+        self.assertEqual(response.context_data['task'], self.task2)
+        self.assertContains(response, self.label2.name)
+
+    async def test_detail_404(self):
+        with self.assertRaises(Http404):
+            await self.get(AsyncTaskDetailView, self.user1, pk=9999)
+
+
 class TestTaskDetailView(TaskTestCase):
     def test_redirects_unauthorized_user(self):
         response = self.client.get(
@@ -176,6 +409,20 @@ class TestTaskUpdateView(TaskTestCase):
         updated_task = Task.objects.get(id=task.id)
         self.assertEqual(updated_task.name, update_data['name'])
 
+    def test_concurrent_update_is_reported(self):
+        self.client.force_login(self.user1)
+        url = reverse_lazy('tasks:update', kwargs={'pk': self.task1.id})
+        data = {**self.update_task_data, 'version': self.task1.version}
+
+        with patch.object(Task, 'save', side_effect=StaleTaskError):
+            response = self.client.post(url, data=data)
+
+        self.assertEqual(response.status_code, 200)
+        form = response.context['form']
+        self.assertTrue(form.has_error(NON_FIELD_ERRORS, 'conflict'))
+        self.assertContains(response, 'alert-danger')
+        self.assertEqual(self.task1.labels.count(), 1)
+
 
 class TestTaskDeleteView(TaskTestCase):
     def test_redirects_unauthenticated_user(self):
@@ -230,4 +477,96 @@ class TestTaskDeleteView(TaskTestCase):
         self.assertRedirects(response, reverse_lazy('tasks:index'))
         self.assertEqual(Task.objects.count(), initial_count)
         unchanged_task = Task.objects.get(id=task.id)
-        self.assertEqual(unchanged_task.name, task.name)
\ No newline at end of file
+        self.assertEqual(unchanged_task.name, task.name)
+
+
+class TestTaskBulkView(TaskTestCase):
+    url = reverse_lazy('tasks:bulk')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user1)
+        self.status2 = Status.objects.get(pk=2)
+
+    def test_redirects_unauthenticated_user(self):
+        self.client.logout()
+        response = self.client.post(self.url, {
+            'action': 'status', 'status': self.status2.id,
+            'tasks': [self.task1.id],
+        })
+        self.assertRedirects(response, reverse_lazy('login'))
+
+    def test_changes_status_with_single_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {
+                'action': 'status', 'status': self.status2.id,
+                'tasks': [self.task1.id, self.task2.id],
+            })
+        updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "tasks_task"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertRedirects(response, reverse_lazy('tasks:index'))
+        self.assertEqual(
+            Task.objects.filter(status=self.status2).count(), 2
+        )
+
+    def test_select_all_uses_filter_from_query_string(self):
+        url = f'{self.url}?user_own_tasks=on'
+        self.client.post(url, {
+            'action': 'executor', 'executor': '', 'select_all': 'on',
+        })
+        self.assertIsNone(Task.objects.get(pk=self.task2.id).executor)
+        self.assertEqual(
+            Task.objects.get(pk=self.task1.id).executor, self.user1
+        )
+
+    def test_add_and_remove_label(self):
+        label = Label.objects.create(name='Feature')
+        self.client.post(self.url, {
+            'action': 'add_label', 'label': label.id,
+            'tasks': [self.task1.id, self.task2.id],
+        })
+        self.assertEqual(label.task_set.count(), 2)
+
+        self.client.post(self.url, {
+            'action': 'remove_label', 'label': label.id,
+            'tasks': [self.task1.id],
+        })
+        self.assertEqual(list(label.task_set.all()), [self.task2])
+
+    @override_settings(TASK_LIST_CACHE_TIMEOUT=300)
+    def test_bulk_update_invalidates_list_cache(self):
+        self.client.get(reverse_lazy('tasks:index'))
+        self.client.post(self.url, {
+            'action': 'status', 'status': self.status2.id,
+            'tasks': [self.task1.id],
+        })
+        response = self.client.get(reverse_lazy('tasks:index'))
+        statuses = {task.id: task.status for task in response.context['tasks']}
+        self.assertEqual(statuses[self.task1.id], self.status2)
+
+    def test_author_can_delete_own_tasks(self):
+        self.client.post(self.url, {
+            'action': 'delete', 'tasks': [self.task2.id],
+        })
+        self.assertFalse(Task.objects.filter(pk=self.task2.id).exists())
+
+    def test_delete_is_denied_if_any_task_has_another_author(self):
+        response = self.client.post(self.url, {
+            'action': 'delete', 'tasks': [self.task1.id, self.task2.id],
+        })
+        self.assertRedirects(response, reverse_lazy('tasks:index'))
+        self.assertEqual(Task.objects.count(), self.task_count)
+
+    def test_requires_selection_and_action_value(self):
+        response = self.client.post(self.url, {
+            'action': 'status', 'status': self.status2.id, 'tasks': [],
+        })
+        self.assertRedirects(response, reverse_lazy('tasks:index'))
+        self.client.post(self.url, {
+            'action': 'add_label', 'tasks': [self.task1.id],
+        })
+        self.assertFalse(Task.objects.filter(status=self.status2).exists())
+        self.assertEqual(self.task1.labels.count(), 1)
@@ -1,19 +1,32 @@
-from django.test import Client, TestCase
+from django.core.cache import cache
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 from task_manager.tasks.models import Task
+from task_manager.testing import QueryBudgetTestCase
 from task_manager.users.models import User
 
 
-class TaskTestCase(TestCase):
+class TaskTestCase(QueryBudgetTestCase):
     fixtures = ['test_users.json',
                 'test_statuses.json',
                 'test_labels.json',
                 'test_tasks.json']
+    query_budgets = {
+        # Three of them load the filter choices, which are not cached
+        # without a shared cache (see task_manager/choices.py)
+        'tasks:index': 10,
+        'tasks:detail': 4,
+        'tasks:create': {'GET': 5, 'POST': 17},
+        'tasks:update': {'GET': 7, 'POST': 20},
+        'tasks:delete': {'GET': 5, 'POST': 11},
+        'tasks:bulk': 15,
+        'api:tasks': 5,
+    }
 
     def setUp(self):
-        self.client = Client()
+        super().setUp()
+        cache.clear()
 
         self.user1 = User.objects.get(pk=1)
         self.user2 = User.objects.get(pk=2)
@@ -45,4 +58,15 @@ class TaskTestCase(TestCase):
             'status': self.status1.id,
             'executor': self.user2.id,
             'labels': [self.label1.id, self.label2.id]
-        }
\ No newline at end of file
+        }
+
+    def add_tasks(self, count):
+        start = Task.objects.count()
+        for number in range(start, start + count):
+            task = Task.objects.create(
+                name=f'Task {number}',
+                status=self.status1,
+                author=self.user1,
+                executor=self.user2,
+            )
+            task.labels.set([self.label1, self.label2])
\ No newline at end of file
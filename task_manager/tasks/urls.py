@@ -1,13 +1,24 @@
+from django.conf import settings
 from django.urls import path
 
-from task_manager.tasks import views
+from task_manager.tasks import api, views
 
 app_name = 'tasks'
 
+if settings.ASYNC_VIEWS:
+    list_view = views.AsyncTaskListView
+    detail_view = views.AsyncTaskDetailView
+else:
+    list_view = views.TaskListView
+    detail_view = views.TaskDetailView
+
 urlpatterns = [
-    path('', views.TaskListView.as_view(), name='index'),
+    path('', list_view.as_view(), name='index'),
     path('create/', views.TaskCreateView.as_view(), name='create'),
+    path('bulk/', views.TaskBulkView.as_view(), name='bulk'),
+    path('changes/', api.TaskChangesView.as_view(), name='changes'),
+    path('events/', views.TaskEventsView.as_view(), name='events'),
     path('<int:pk>/update/', views.TaskUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.TaskDeleteView.as_view(), name='delete'),
-    path('<int:pk>/', views.TaskDetailView.as_view(), name='detail')
+    path('<int:pk>/', detail_view.as_view(), name='detail')
 ]
\ No newline at end of file
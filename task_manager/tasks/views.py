@@ -1,29 +1,83 @@
+from asgiref.sync import sync_to_async
+from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
-from django.urls import reverse_lazy
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.urls import reverse, reverse_lazy
 from django.utils.translation import gettext_lazy as _
-from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
-from django_filters.views import FilterView
+from django.views.generic import (
+    CreateView,
+    DeleteView,
+    DetailView,
+    FormView,
+    UpdateView,
+    View,
+)
+from django_filters.views import FilterMixin, FilterView
 
+from task_manager.async_views import (
+    AsyncDetailView,
+    AsyncListView,
+    AsyncLoginRequiredMixin,
+)
+from task_manager.cache import bump_version
+from task_manager.conditional import (
+    AsyncConditionalGetMixin,
+    ConditionalGetMixin,
+)
 from task_manager.mixins import AuthorPermissionMixin, CustomLoginRequiredMixin
+from task_manager.pagination import KeysetPaginationMixin
+from task_manager.tasks import bulk, counters, events
+from task_manager.tasks.cache import (
+    LIST_MODELS,
+    get_cached_page,
+    set_cached_page,
+    task_list_key,
+)
 from task_manager.tasks.filters import TaskFilter
-from task_manager.tasks.forms import TaskCreationForm
-from task_manager.tasks.models import Task
+from task_manager.tasks.forms import TaskBulkForm, TaskCreationForm
+from task_manager.tasks.models import StaleTaskError, Task
 
 URL_INDEX = 'tasks:index'
 
 
-class TaskListView(CustomLoginRequiredMixin, FilterView):
+class TaskListView(CustomLoginRequiredMixin,
+                   ConditionalGetMixin,
+                   KeysetPaginationMixin,
+                   FilterView):
     model = Task
+    queryset = Task.objects.for_list()
     template_name = 'tasks/index.html'
     filterset_class = TaskFilter
     context_object_name = 'tasks'
     ordering = 'id'
+    etag_models = LIST_MODELS
 
+    def paginate_queryset(self, queryset, page_size):
+        key = task_list_key(self.request, page_size)
+        page = get_cached_page(key)
+        if page is None:
+            page = super().paginate_queryset(queryset, page_size)[1]
+            set_cached_page(key, page)
+        return None, page, page.object_list, page.has_other_pages()
 
-class TaskDetailView(CustomLoginRequiredMixin, DetailView):
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            bulk_form=TaskBulkForm(auto_id='id_bulk_%s'), **kwargs
+        )
+
+
+class TaskDetailView(CustomLoginRequiredMixin,
+                     ConditionalGetMixin,
+                     DetailView):
     model = Task
+    queryset = Task.objects.for_detail()
     template_name = 'tasks/detail.html'
     context_object_name = 'task'
+    etag_models = LIST_MODELS
 
 
 class TaskCreateView(CustomLoginRequiredMixin,
@@ -57,6 +111,17 @@ class TaskUpdateView(CustomLoginRequiredMixin,
         'title': _('Update task')
     }
 
+    def form_valid(self, form):
+        try:
+            # The labels are saved with the row or not at all
+            with transaction.atomic():
+                return super().form_valid(form)
+        except StaleTaskError:
+            form.add_error(None, ValidationError(
+                form.conflict_message, code='conflict'
+            ))
+            return self.form_invalid(form)
+
 
 class TaskDeleteView(CustomLoginRequiredMixin,
                      AuthorPermissionMixin,
@@ -72,3 +137,134 @@ class TaskDeleteView(CustomLoginRequiredMixin,
         'title': _('Task deletion'),
         'button_name': _('Yes, delete')
     }
+
+
+class TaskBulkView(CustomLoginRequiredMixin, FormView):
+    """Applies one change to many tasks inside a single transaction.
+
+    Tasks are the selected ids or, with ``select_all``, every task matched
+    by the TaskFilter parameters in the query string.
+    """
+    form_class = TaskBulkForm
+    http_method_names = ['post']
+    permission_denied_message = _("Only the task's author can delete it")
+    success_messages = {
+        'delete': _('Tasks deleted: %(count)s'),
+    }
+    success_message = _('Tasks updated: %(count)s')
+
+    def get_index_url(self):
+        url = reverse(URL_INDEX)
+        query = self.request.GET.urlencode()
+        return f'{url}?{query}' if query else url
+
+    def get_tasks(self, form):
+        if not form.cleaned_data['select_all']:
+            return Task.objects.filter(pk__in=form.cleaned_data['tasks'])
+        filterset = TaskFilter(self.request.GET, request=self.request)
+        if not filterset.is_valid():
+            return Task.objects.none()
+        return Task.objects.filter(pk__in=filterset.qs.values('pk'))
+
+    def apply(self, action, tasks, data):
+        if action in ('status', 'executor'):
+            return counters.move(tasks, action, data[action])
+        if action == 'add_label':
+            return bulk.add_label(tasks, data['label'])
+        if action == 'remove_label':
+            return bulk.remove_label(tasks, data['label'])
+        return bulk.delete(tasks)
+
+    def form_valid(self, form):
+        action = form.cleaned_data['action']
+        tasks = self.get_tasks(form)
+        with transaction.atomic():
+            # One query instead of AuthorPermissionMixin per task
+            if action == 'delete' and tasks.exclude(
+                author=self.request.user
+            ).exists():
+                messages.error(self.request, self.permission_denied_message)
+                return redirect(self.get_index_url())
+            count = self.apply(action, tasks, form.cleaned_data)
+        # update() and through-table writes skip the model signals
+        bump_version(Task._meta.label_lower)
+        message = self.success_messages.get(action, self.success_message)
+        messages.success(self.request, message % {'count': count})
+        return redirect(self.get_index_url())
+
+    def form_invalid(self, form):
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(self.request, error)
+        return redirect(self.get_index_url())
+
+
+class AsyncTaskListView(AsyncLoginRequiredMixin,
+                        AsyncConditionalGetMixin,
+                        FilterMixin,
+                        AsyncListView):
+    model = Task
+    queryset = Task.objects.for_list()
+    template_name = 'tasks/index.html'
+    filterset_class = TaskFilter
+    context_object_name = 'tasks'
+    ordering = 'id'
+    etag_models = LIST_MODELS
+
+    async def filter_queryset(self, queryset):
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        # Form validation loads the selected objects with the sync ORM
+        is_valid = await sync_to_async(self.filterset.is_valid)()
+        if not self.filterset.is_bound or is_valid or not self.get_strict():
+            return await sync_to_async(lambda: self.filterset.qs)()
+        return self.filterset.queryset.none()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        # The cache backend may read and write files, off the event loop
+        key = await sync_to_async(task_list_key)(self.request, page_size)
+        page = await sync_to_async(get_cached_page)(key)
+        if page is None:
+            page = await super().apaginate_queryset(queryset, page_size)
+            await sync_to_async(set_cached_page)(key, page)
+        return page
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            filter=self.filterset,
+            bulk_form=TaskBulkForm(auto_id='id_bulk_%s'),
+            **kwargs,
+        )
+
+
+class AsyncTaskDetailView(AsyncLoginRequiredMixin,
+                          AsyncConditionalGetMixin,
+                          AsyncDetailView):
+    model = Task
+    queryset = Task.objects.for_detail()
+    template_name = 'tasks/detail.html'
+    context_object_name = 'task'
+    etag_models = LIST_MODELS
+
+
+class TaskEventsView(AsyncLoginRequiredMixin, View):
+    """Streams task events to tasks/index.html, see tasks/events.py.
+
+    The stream is held open by the ASGI server's event loop. Under WSGI
+    it would hold a worker thread per page, so it is answered with 204,
+    which tells EventSource not to reconnect.
+    """
+    def handle_no_permission(self):
+        # EventSource cannot follow the redirect to the login page
+        return HttpResponse(status=401)
+
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+        response = StreamingHttpResponse(
+            events.stream(events.get_broker()),
+            content_type='text/event-stream',
+        )
+        response.headers['Cache-Control'] = 'no-cache'
+        # Sent as they come, not buffered by nginx
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
\ No newline at end of file
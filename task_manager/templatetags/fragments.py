@@ -0,0 +1,66 @@
+"""Template fragments rendered once per process and language.
+
+``{% fragment name [vary ...] %}...{% endfragment %}`` keeps the output
+of its block in process memory, keyed by the name, the active language
+and the values of the vary expressions. It is meant for markup that is
+the same on every page, like the links of the navbar: anything rendered
+per request, such as csrf tokens or messages, must stay outside the
+block, and the vary values should have only a few distinct values.
+The fragments are dropped when the development server sees a template
+change, and a restart clears them after a deploy.
+"""
+from django import template
+from django.utils.autoreload import file_changed
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+register = template.Library()
+
+# Process-local: {(name, language, *vary values): rendered markup}
+_fragments = {}
+
+
+def clear():
+    _fragments.clear()
+
+
+def template_changed(sender, file_path, **kwargs):
+    if file_path.suffix == '.html':
+        clear()
+
+
+file_changed.connect(template_changed, dispatch_uid='template_fragments')
+
+
+class FragmentNode(template.Node):
+    def __init__(self, name, vary_on, nodelist):
+        self.name = name
+        self.vary_on = vary_on
+        self.nodelist = nodelist
+
+    def render(self, context):
+        key = (
+            self.name,
+            get_language(),
+            *(value.resolve(context) for value in self.vary_on),
+        )
+        try:
+            return _fragments[key]
+        except KeyError:
+            pass
+        output = _fragments[key] = mark_safe(self.nodelist.render(context))
+        return output
+
+
+@register.tag
+def fragment(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f'{bits[0]!r} tag requires a fragment name.'
+        )
+    name = bits[1].strip('\'"')
+    vary_on = [parser.compile_filter(bit) for bit in bits[2:]]
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(name, vary_on, nodelist)
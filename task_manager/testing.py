@@ -0,0 +1,151 @@
+"""Query budgets for view tests.
+
+Every request made through ``QueryBudgetTestCase.client`` records its SQL
+with the project line that issued it. A request fails the test when the
+view issues more queries than ``query_budgets`` allows for it, and the
+failure lists the statements that ran more than once, which is how N+1
+patterns show up.
+"""
+import sys
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.db import connections
+from django.test import Client, TestCase
+
+from task_manager.users import auth
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+
+def get_template_line(frame):
+    node = frame.f_locals.get('self')
+    token = getattr(node, 'token', None)
+    origin = getattr(node, 'origin', None)
+    if token is None or origin is None:
+        return None
+    return f'{origin.template_name}:{token.lineno}'
+
+
+def get_origin():
+    """Innermost project frame outside the tests, plus the template line.
+
+    Queries run from templates have no project frame of their own, so
+    the innermost template node being rendered is reported as well.
+    """
+    template = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if template is None and code.co_name == 'render_annotated':
+            template = get_template_line(frame)
+        path = Path(code.co_filename)
+        if (PROJECT_DIR in path.parents and 'tests' not in path.parts and
+                path.name != 'testing.py'):
+            relative = path.relative_to(PROJECT_DIR.parent)
+            origin = f'{relative}:{frame.f_lineno} in {code.co_name}'
+            return f'{origin} ({template})' if template else origin
+        frame = frame.f_back
+    return template or '(outside the project)'
+
+
+class QueryRecorder:
+    """execute_wrapper that keeps (sql, origin) for every query."""
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, get_origin()))
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def duplicates(self):
+        """{sql: [origins]} for statements run more than once.
+
+        SQL is compared before parameters are bound, so the same lookup
+        repeated for different rows counts as a duplicate.
+        """
+        counts = Counter(sql for sql, _ in self.queries)
+        duplicates = {}
+        for sql, origin in self.queries:
+            if counts[sql] > 1:
+                duplicates.setdefault(sql, []).append(origin)
+        return duplicates
+
+    def report(self):
+        lines = []
+        for sql, origins in self.duplicates().items():
+            lines.append(f'{len(origins)}x {sql}')
+            lines.extend(
+                f'    {count}x from {origin}'
+                for origin, count in Counter(origins).items()
+            )
+        return '\n'.join(lines) or 'No duplicated queries.'
+
+
+class QueryBudgetClient(Client):
+    """Test client that checks each response against query budgets.
+
+    ``query_budgets`` maps a URL name such as ``'tasks:index'`` to the
+    maximum number of queries, either one number for every method or a
+    dict like ``{'GET': 5, 'POST': 9}``. URLs without a budget are only
+    recorded. The recorder of the last request is kept in ``queries``.
+    """
+    def __init__(self, query_budgets=None, **defaults):
+        super().__init__(**defaults)
+        self.query_budgets = query_budgets or {}
+        self.queries = QueryRecorder()
+
+    def request(self, **request):
+        recorder = self.queries = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = super().request(**request)
+        self.check_budget(request['REQUEST_METHOD'], response, recorder)
+        return response
+
+    def get_budget(self, method, view_name):
+        budget = self.query_budgets.get(view_name)
+        if isinstance(budget, dict):
+            return budget.get(method)
+        return budget
+
+    def check_budget(self, method, response, recorder):
+        match = response.resolver_match
+        view_name = match.view_name if match else None
+        budget = self.get_budget(method, view_name)
+        if budget is not None and len(recorder) > budget:
+            raise AssertionError(
+                f'{method} {view_name} ran {len(recorder)} queries, '
+                f'budget is {budget}.\n{recorder.report()}'
+            )
+
+
+class QueryBudgetTestCase(TestCase):
+    """TestCase whose ``self.client`` enforces ``query_budgets``."""
+    client_class = QueryBudgetClient
+    query_budgets = {}
+
+    def setUp(self):
+        super().setUp()
+        # Process caches outlive the transaction rolled back after a test
+        auth.clear()
+        self.client = self.client_class(query_budgets=self.query_budgets)
+
+    def assertQueriesDoNotGrow(self, path, grow, method='get', data=None):
+        """Requests path before and after grow() adds rows."""
+        request = getattr(self.client, method)
+        request(path, data)
+        before = self.client.queries
+        grow()
+        request(path, data)
+        after = self.client.queries
+        if len(after) > len(before):
+            self.fail(
+                f'{method.upper()} {path} went from {len(before)} to '
+                f'{len(after)} queries as rows were added.\n{after.report()}'
+            )
@@ -18,7 +18,12 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
-from task_manager.views import CustomLoginView, CustomLogoutView
+from task_manager.views import (
+    CustomLoginView,
+    CustomLogoutView,
+    MetricsView,
+    PerfReportView,
+)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -26,8 +31,11 @@ urlpatterns = [
     path('', TemplateView.as_view(template_name='index.html'), name='index'),
     path('login/', CustomLoginView.as_view(), name='login'),
     path('logout/', CustomLogoutView.as_view(), name='logout'),
+    path('perf/', PerfReportView.as_view(), name='perf'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
     path('users/', include('task_manager.users.urls')),
     path('statuses/', include('task_manager.statuses.urls')),
     path('labels/', include('task_manager.labels.urls')),
     path('tasks/', include('task_manager.tasks.urls')),
+    path('api/', include('task_manager.tasks.api_urls')),
 ]
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""Checks whether an object is still referenced before deleting it.
+
+Deleting a status or user with ``on_delete=PROTECT`` makes Django's
+collector load every related task before it raises ProtectedError,
+which is slow and memory hungry for objects used by many tasks.
+get_usages() instead filters each protecting relation on its indexed
+foreign key column, so in_use() costs one ``EXISTS`` query per
+related model.
+"""
+from django.db.models import PROTECT, Q
+
+
+def get_usages(obj):
+    """Querysets of the rows that keep obj from being deleted.
+
+    These are the reverse foreign keys declared with on_delete=PROTECT
+    and the many-to-many relations pointing at obj, such as the labels
+    of a task. Relations from the same model share one queryset, so a
+    user is checked as author and executor in a single query.
+    """
+    lookups = {}
+    for relation in obj._meta.related_objects:
+        if relation.many_to_many:
+            model = relation.through
+            field = relation.field.m2m_reverse_field_name()
+        elif getattr(relation, 'on_delete', None) is PROTECT:
+            model = relation.related_model
+            field = relation.field.name
+        else:
+            continue
+        lookups[model] = lookups.get(model, Q()) | Q(**{field: obj.pk})
+    for model, lookup in lookups.items():
+        yield model._base_manager.db_manager(obj._state.db).filter(lookup)
+
+
+def in_use(obj):
+    return any(usages.exists() for usages in get_usages(obj))
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'task_manager.users'
\ No newline at end of file
+    name = 'task_manager.users'
+
+    def ready(self):
+        from task_manager.users import signals
+        signals.connect()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.db import transaction
+
+from task_manager.cache import bump_version, get_versions, record_lookup
+from task_manager.replicas import use_primary
+
+CACHE_NAME = 'users'
+
+_lock = threading.Lock()
+# Process-local: {user id from the session: (version, expires at, user)}
+_users = {}
+
+
+def user_version_name(user_id):
+    return f'users.user:{user_id}'
+
+
+def clear():
+    with _lock:
+        _users.clear()
+
+
+def _forget(user_id):
+    with _lock:
+        _users.pop(str(user_id), None)
+    bump_version(user_version_name(user_id))
+
+
+def forget_user(user_id):
+    """Invalidates the cached user in this and, via the cache, all workers.
+
+    The version is bumped again on commit, because another worker may
+    read the old row under the new version before the change commits.
+    """
+    _forget(user_id)
+    transaction.on_commit(lambda: _forget(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend that keeps session users in process memory.
+
+    The user row is read once per USER_CACHE_TIMEOUT instead of on every
+    request. Each request gets a copy, so views cannot change the cached
+    instance.
+    """
+    def get_cached(self, user_id):
+        """Returns the version and a copy of the cached user, or None."""
+        (version,) = get_versions(user_version_name(user_id))
+        with _lock:
+            cached = _users.get(str(user_id))
+        hit = (cached is not None and cached[0] == version and
+               cached[1] > time.monotonic())
+        record_lookup(CACHE_NAME, hit)
+        return version, copy.copy(cached[2]) if hit else None
+
+    def remember(self, user_id, version, user):
+        if user is None:
+            return None
+        expires = time.monotonic() + settings.USER_CACHE_TIMEOUT
+        with _lock:
+            _users[str(user_id)] = (version, expires, user)
+        return copy.copy(user)
+
+    def get_user(self, user_id):
+        if not settings.USER_CACHE_TIMEOUT:
+            return super().get_user(user_id)
+        version, user = self.get_cached(user_id)
+        if user is None:
+            with use_primary():
+                user = super().get_user(user_id)
+            user = self.remember(user_id, version, user)
+        return user
+
+    async def aget_user(self, user_id):
+        if not settings.USER_CACHE_TIMEOUT:
+            return await super().aget_user(user_id)
+        version, user = self.get_cached(user_id)
+        if user is None:
+            with use_primary():
+                user = await super().aget_user(user_id)
+            user = self.remember(user_id, version, user)
+        return user
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='author_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Created tasks'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='executor_task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Assigned tasks'),
+        ),
+    ]
@@ -2,8 +2,10 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.counters import CounterFieldsMixin, counter_field
 
-class User(AbstractUser):
+
+class User(CounterFieldsMixin, AbstractUser):
     first_name = models.CharField(
         max_length=150,
         blank=False,
@@ -14,7 +16,11 @@ class User(AbstractUser):
         blank=False,
         verbose_name=_('Last Name')
     )
+    author_task_count = counter_field(_('Created tasks'))
+    executor_task_count = counter_field(_('Assigned tasks'))
     USERNAME_FIELD = 'username'
 
+    counter_fields = ('author_task_count', 'executor_task_count')
+
     def __str__(self):
         return f'{self.first_name} {self.last_name}'
\ No newline at end of file
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+
+from task_manager.users.auth import forget_user
+from task_manager.users.models import User
+
+# Fields whose change leaves the cached session user valid
+IGNORED_UPDATES = {'last_login'}
+
+
+def forget_saved_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= IGNORED_UPDATES:
+        return
+    forget_user(instance.pk)
+
+
+def forget_deleted_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+def connect():
+    post_save.connect(
+        forget_saved_user, sender=User, dispatch_uid='forget_user'
+    )
+    post_delete.connect(
+        forget_deleted_user, sender=User, dispatch_uid='forget_user'
+    )
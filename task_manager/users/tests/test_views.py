@@ -1,5 +1,11 @@
+from unittest.mock import patch
+
+from django.db.models.deletion import Collector
+from django.test import override_settings
 from django.urls import reverse_lazy
 
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
 from task_manager.users.models import User
 from task_manager.users.tests.testcase import UserTestCase
 
@@ -11,6 +17,15 @@ class TestUserListView(UserTestCase):
         self.assertTemplateUsed(response, 'users/index.html')
         self.assertEqual(User.objects.count(), self.user_count)
 
+    def test_user_list_queries_do_not_grow(self):
+        self.assertQueriesDoNotGrow(
+            reverse_lazy('users:index'),
+            lambda: User.objects.bulk_create(
+                User(username=f'user{number}', first_name='A', last_name='B')
+                for number in range(10)
+            ),
+        )
+
 
 class TestUserCreateView(UserTestCase):
     def setUp(self):
@@ -85,6 +100,23 @@ class TestUserDeleteView(UserTestCase):
         unchanged_user = User.objects.get(id=user1.id)
         self.assertEqual(unchanged_user.username, user1.username)
 
+    def test_executor_in_use_is_not_collected(self):
+        status = Status.objects.create(name='New')
+        Task.objects.create(name='Task', status=status, author=self.user2,
+                            executor=self.user1)
+        self.client.force_login(self.user1)
+        url = reverse_lazy('users:delete', kwargs={'pk': self.user1.id})
+
+        response = self.client.get(url)
+        self.assertTrue(response.context['in_use'])
+        self.assertContains(response, 'disabled')
+
+        with patch.object(Collector, 'collect') as collect:
+            response = self.client.post(url)
+        collect.assert_not_called()
+        self.assertRedirects(response, reverse_lazy('users:index'))
+        self.assertTrue(User.objects.filter(id=self.user1.id).exists())
+
 
 class TestUserUpdateView(UserTestCase):
     def test_user_update_unauthorized(self):
@@ -162,4 +194,58 @@ class TestUserUpdateView(UserTestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, reverse_lazy('users:index'))
         unchanged_user = User.objects.get(id=user1.id)
-        self.assertEqual(unchanged_user.username, 'john_snow')
\ No newline at end of file
+        self.assertEqual(unchanged_user.username, 'john_snow')
+
+
+@override_settings(CACHE_SHARED=True, USER_CACHE_TIMEOUT=60)
+class TestCachedSessionUser(UserTestCase):
+    def get_page_queries(self):
+        # A sync view, so the session and user queries run in this thread
+        self.client.get(
+            reverse_lazy('users:update', kwargs={'pk': self.user1.id})
+        )
+        return len(self.client.queries)
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies',
+    )
+    def test_signed_cookies_and_user_cache_skip_auth_queries(self):
+        self.client.force_login(self.user1)
+        with self.settings(USER_CACHE_TIMEOUT=0):
+            uncached = self.get_page_queries()
+        self.get_page_queries()
+        self.assertEqual(self.get_page_queries(), uncached - 1)
+
+    def test_user_cache_skips_user_query(self):
+        self.client.force_login(self.user1)
+        with self.settings(USER_CACHE_TIMEOUT=0):
+            uncached = self.get_page_queries()
+        self.get_page_queries()
+        self.assertEqual(self.get_page_queries(), uncached - 1)
+
+    def test_update_invalidates_cached_user(self):
+        self.client.force_login(self.user1)
+        self.client.get(reverse_lazy('users:index'))
+        self.user1.first_name = 'Aegon'
+        self.user1.save()
+        response = self.client.get(reverse_lazy('users:index'))
+        self.assertEqual(response.context['user'].first_name, 'Aegon')
+
+    def test_password_change_ends_cached_session(self):
+        self.client.force_login(self.user1)
+        self.client.get(reverse_lazy('users:index'))
+        self.client.post(
+            reverse_lazy('users:update', kwargs={'pk': self.user1.id}),
+            self.update_user_data,
+        )
+        response = self.client.get(reverse_lazy('users:index'))
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_delete_invalidates_cached_user(self):
+        self.client.force_login(self.user1)
+        self.client.get(reverse_lazy('users:index'))
+        self.client.post(
+            reverse_lazy('users:delete', kwargs={'pk': self.user1.id})
+        )
+        response = self.client.get(reverse_lazy('users:index'))
+        self.assertFalse(response.context['user'].is_authenticated)
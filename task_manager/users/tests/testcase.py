@@ -1,13 +1,18 @@
-from django.test import Client, TestCase
-
+from task_manager.testing import QueryBudgetTestCase
 from task_manager.users.models import User
 
 
-class UserTestCase(TestCase):
+class UserTestCase(QueryBudgetTestCase):
     fixtures = ['test_users.json']
+    query_budgets = {
+        'users:index': 5,
+        'users:create': 4,
+        'users:update': {'GET': 4, 'POST': 7},
+        'users:delete': {'GET': 5, 'POST': 12},
+    }
 
     def setUp(self):
-        self.client = Client()
+        super().setUp()
 
         self.user1 = User.objects.get(id=1)
         self.user2 = User.objects.get(id=2)
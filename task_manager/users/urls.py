@@ -1,11 +1,17 @@
+from django.conf import settings
 from django.urls import path
 
 from task_manager.users import views
 
 app_name = 'users'
 
+if settings.ASYNC_VIEWS:
+    list_view = views.AsyncUserListView
+else:
+    list_view = views.UserListView
+
 urlpatterns = [
-    path('', views.UserListView.as_view(), name='index'),
+    path('', list_view.as_view(), name='index'),
     path('create/', views.UserCreateView.as_view(), name='create'),
     path('<int:pk>/update/', views.UserUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.UserDeleteView.as_view(), name='delete'),
@@ -8,11 +8,17 @@ from django.views.generic import (
     UpdateView,
 )
 
+from task_manager.async_views import AsyncListView
+from task_manager.conditional import (
+    AsyncConditionalGetMixin,
+    ConditionalGetMixin,
+)
 from task_manager.mixins import (
     CustomLoginRequiredMixin,
     ProtectErrorMixin,
     UserPermissionMixin,
 )
+from task_manager.pagination import KeysetPaginationMixin
 from task_manager.users.forms import (
     CustomUserChangeForm,
     CustomUserCreationForm,
@@ -23,11 +29,13 @@ URL_INDEX = 'users:index'
 ERROR_MESSAGE_NO_RIGHTS = _("You don't have rights to change another user.")
 
 
-class UserListView(ListView):
+class UserListView(ConditionalGetMixin, KeysetPaginationMixin, ListView):
     model = User
     template_name = 'users/index.html'
     context_object_name = 'users'
     ordering = ['id']
+    # Task counts are rendered too
+    etag_models = ('users.user', 'tasks.task')
 
 
 class BaseUserView(SuccessMessageMixin):
@@ -73,4 +81,12 @@ class UserDeleteView(CustomLoginRequiredMixin, UserPermissionMixin,
     extra_context = {
         'title': _('User deletion'),
         'button_name': _('Yes, delete')
-    }
\ No newline at end of file
+    }
+
+
+class AsyncUserListView(AsyncConditionalGetMixin, AsyncListView):
+    model = User
+    template_name = 'users/index.html'
+    context_object_name = 'users'
+    ordering = ['id']
+    etag_models = UserListView.etag_models
\ No newline at end of file
@@ -1,10 +1,16 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.messages.views import SuccessMessageMixin
+from django.http import HttpResponse, JsonResponse
 from django.urls import reverse_lazy
+from django.utils.crypto import constant_time_compare
 from django.utils.translation import gettext_lazy as _
+from django.views.generic import View
 
+from task_manager import metrics, profiling
 from task_manager.forms import CustomLoginForm
+from task_manager.mixins import StaffRequiredMixin
 
 
 class CustomLoginView(SuccessMessageMixin, LoginView):
@@ -20,3 +26,24 @@ class CustomLogoutView(SuccessMessageMixin, LogoutView):
     def dispatch(self, request, *args, **kwargs):
         messages.info(request, _('You were logged out'))
         return super().dispatch(request, *args, **kwargs)
+
+
+class PerfReportView(StaffRequiredMixin, View):
+    """Per-view timings sampled by ProfilingMiddleware, as JSON."""
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({
+            'sample_rate': settings.PROFILING_SAMPLE_RATE,
+            'views': profiling.report(),
+        })
+
+
+class MetricsView(View):
+    """Prometheus scrape target; METRICS_TOKEN turns on bearer auth."""
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def get(self, request, *args, **kwargs):
+        token = settings.METRICS_TOKEN
+        provided = request.headers.get('Authorization', '')
+        if token and not constant_time_compare(provided, f'Bearer {token}'):
+            return HttpResponse(status=401)
+        return HttpResponse(metrics.render(), content_type=self.content_type)